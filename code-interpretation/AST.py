@@ -1,10 +1,23 @@
 
+class ClassTable(dict):
+    """Dict keyed by node classes; a class missing from it takes the entry of its nearest base, or None."""
+
+    def __missing__(self, cls):
+        value = next((dict.__getitem__(self, base) for base in cls.__mro__[1:] if base in self), None)
+        self[cls] = value
+        return value
+
+
 class Node(object):
+    __slots__ = ()
+
     def accept(self, visitor):
         return visitor.visit(self)
 
 
 class NodeList(Node):
+    __slots__ = ('children',)
+
     def __init__(self):
         super(NodeList, self).__init__()
 
@@ -21,51 +34,70 @@ class NodeList(Node):
 
 
 class Const(Node):
+    __slots__ = ('line', 'value')
+
     def __init__(self, line, value):
         self.line = line
         self.value = value
 
 
 class Integer(Const):
-    pass
+    __slots__ = ()
 
 
 class Float(Const):
-    pass
+    __slots__ = ()
 
 
 class String(Const):
-    pass
+    __slots__ = ()
 
 
 class Variable(Node):
+    __slots__ = ('line', 'name', 'is_global', 'slot')
+
     def __init__(self, line, name):
         self.line = line
         self.name = name
 
+        # filled in by Resolver
+        self.is_global = False
+        self.slot = None
+
 
 class BinExpr(Node):
+    __slots__ = ('line', 'left', 'op', 'right', 'operator')
+
     def __init__(self, line, left, op, right):
         self.line = line
         self.left = left
         self.op = op
         self.right = right
 
-        # if you want to use somewhere generic_visit method instead of visit_XXX in visitor
-        # definition of children field is required in each class from AST
-        self.children = (left, right)
+        # the function applying op, set by Cparser when it builds the node
+        self.operator = None
+
+    # if you want to use somewhere generic_visit method instead of visit_XXX in visitor
+    # definition of children field is required in each class from AST
+    @property
+    def children(self):
+        return self.left, self.right
 
 
 class ExpressionList(NodeList):
-    pass
+    __slots__ = ()
 
 
 class GroupedExpression(Node):
+    __slots__ = ('interior',)
+
     def __init__(self, interior):
         self.interior = interior
 
 
 class FunctionExpression(Node):
+    __slots__ = ('line', 'retType', 'name', 'args', 'body', 'slot', 'frame_size')
+
     def __init__(self, line, retType, name, args, body):
         self.line = line
         self.retType = retType
@@ -73,25 +105,38 @@ class FunctionExpression(Node):
         self.args = args if args else ArgumentList()
         self.body = body
 
+        # filled in by Resolver
+        self.slot = None
+        self.frame_size = 0
+
 
 class DeclarationList(NodeList):
-    pass
+    __slots__ = ()
 
 
 class Declaration(Node):
+    __slots__ = ('type', 'inits')
+
     def __init__(self, type, inits):
         self.type = type
         self.inits = inits
 
 
 class InvocationExpression(Node):
+    __slots__ = ('line', 'name', 'args', 'slot')
+
     def __init__(self, line, name, args):
         self.line = line
         self.name = name
         self.args = args if args else ArgumentList()
 
+        # filled in by Resolver
+        self.slot = None
+
 
 class Argument(Node):
+    __slots__ = ('line', 'type', 'name')
+
     def __init__(self, line, type, name):
         self.line = line
         self.type = type
@@ -99,49 +144,69 @@ class Argument(Node):
 
 
 class ArgumentList(NodeList):
-    pass
+    __slots__ = ()
 
 
 class InitList(NodeList):
-    pass
+    __slots__ = ()
 
 
 class Init(Node):
+    __slots__ = ('name', 'expr', 'is_global', 'slot')
+
     def __init__(self, name, expr):
         self.name = name
         self.expr = expr
 
+        # filled in by Resolver
+        self.is_global = False
+        self.slot = None
+
 
 class InstructionList(NodeList):
-    pass
+    __slots__ = ()
 
 
 class PrintInstruction(Node):
+    __slots__ = ('line', 'expr')
+
     def __init__(self, line, expr):
         self.line = line
         self.expr = expr
 
 
 class LabeledInstruction(Node):
+    __slots__ = ('id', 'instr')
+
     def __init__(self, id, instr):
         self.id = id
         self.instr = instr
 
 
 class AssignmentInstruction(Node):
+    __slots__ = ('line', 'id', 'expr', 'is_global', 'slot')
+
     def __init__(self, line, id, expr):
         self.line = line
         self.id = id
         self.expr = expr
 
+        # filled in by Resolver
+        self.is_global = False
+        self.slot = None
+
 
 class CompoundInstruction(Node):
+    __slots__ = ('declarations', 'instructions')
+
     def __init__(self, declarations, instructions):
         self.declarations = declarations
         self.instructions = instructions
 
 
 class ChoiceInstruction(Node):
+    __slots__ = ('condition', 'action', 'alternateAction')
+
     def __init__(self, condition, action, alternateAction=None):
         self.condition = condition
         self.action = action
@@ -149,42 +214,61 @@ class ChoiceInstruction(Node):
 
 
 class RepeatInstruction(Node):
+    __slots__ = ('instructions', 'condition')
+
     def __init__(self, instructions, condition):
         self.instructions = instructions
         self.condition = condition
 
 
 class WhileInstruction(Node):
+    __slots__ = ('condition', 'instruction')
+
     def __init__(self, condition, instruction):
         self.condition = condition
         self.instruction = instruction
 
 
 class ReturnInstruction(Node):
+    __slots__ = ('line', 'expression')
+
     def __init__(self, line, expression):
         self.line = line
         self.expression = expression
 
 
 class BreakInstruction(Node):
+    __slots__ = ('line',)
+
     def __init__(self, line):
         self.line = line
 
 
 class ContinueInstruction(Node):
+    __slots__ = ('line',)
+
     def __init__(self, line):
         self.line = line
 
 
 class Program(Node):
+    __slots__ = ('program_blocks', 'global_size', 'global_names', 'frame_size')
+
     def __init__(self, program_blocks):
         self.program_blocks = program_blocks
 
+        # filled in by Resolver
+        self.global_size = 0
+        self.global_names = []
+        self.frame_size = 0
+
 
 class ProgramBlockList(NodeList):
-    pass
+    __slots__ = ()
 
 
 class ProgramBlock(Node):
+    __slots__ = ('block',)
+
     def __init__(self, block):
         self.block = block
@@ -0,0 +1,46 @@
+from collections import OrderedDict
+
+# Argument classes a memoized call may be keyed on: values of other classes
+# compare equal while printing differently (1, 1.0, True; 0.0 and -0.0)
+KEY_CLASSES = (int, long, str)
+
+# Returned by LRUCache.get for a missing key, as None is a valid result
+MISSING = object()
+
+
+def argument_key(values):
+    """Returns a hashable key for a call with the given arguments, or None if it must not be cached."""
+    for value in values:
+        if value.__class__ not in KEY_CLASSES:
+            return None
+    return tuple((value.__class__, value) for value in values)
+
+
+class LRUCache(object):
+    """Mapping of at most capacity entries that evicts the least recently used one."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        try:
+            value = self.entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        # reinserting moves the entry to the most recently used end
+        self.entries[key] = value
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.entries.pop(key, None)
+        self.entries[key] = value
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
@@ -0,0 +1,272 @@
+import AST
+from Memory import *
+from Completion import *
+from Output import stdout_output
+from Operators import logical_and, logical_or
+from Resolver import Resolver
+from visit import *
+
+BINARY_CLOSURES = {
+    '+': lambda left, right: lambda: left() + right(),
+    '-': lambda left, right: lambda: left() - right(),
+    '/': lambda left, right: lambda: left() / right(),
+    '*': lambda left, right: lambda: left() * right(),
+    '>': lambda left, right: lambda: left() > right(),
+    '>=': lambda left, right: lambda: left() >= right(),
+    '<': lambda left, right: lambda: left() < right(),
+    '<=': lambda left, right: lambda: left() <= right(),
+    '==': lambda left, right: lambda: left() == right(),
+    '%': lambda left, right: lambda: left() % right(),
+    '!=': lambda left, right: lambda: left() != right(),
+    '&&': lambda left, right: lambda: logical_and(left(), right()),
+    '||': lambda left, right: lambda: logical_or(left(), right()),
+    '<<': lambda left, right: lambda: left() << right(),
+    '>>': lambda left, right: lambda: left() >> right(),
+    '|': lambda left, right: lambda: left() | right(),
+    '&': lambda left, right: lambda: left() & right(),
+    '^': lambda left, right: lambda: left() ^ right(),
+}
+
+
+class Function(object):
+
+    def __init__(self, name, nargs, frame_size, body):
+        self.name = name
+        self.nargs = nargs
+        self.frame_size = frame_size
+        self.body = body
+
+
+class ClosureCompiler(object):
+    """Lowers a checked AST.Program into a tree of pre-bound Python closures.
+
+    The AST is walked once; running the program then only calls closures, with
+    operators and Resolver slots fixed when the closures were built. Memory
+    follows Interpreter: a stack of function memories and a global memory.
+    """
+
+    def __init__(self, output=None):
+        self.output = output if output is not None else stdout_output()
+        self.function_memory = MemoryStack()
+        self.global_memory = MemoryStack()
+        self.return_value = None
+
+    def compile(self, program):
+        Resolver().resolve(program)
+        self.global_memory = MemoryStack(Memory("global", program.global_size))
+        self.function_memory = MemoryStack(Memory("default", program.frame_size))
+        return program.accept(self)
+
+    def store(self, node, expression):
+        slot = node.slot
+
+        if node.is_global:
+            slots = self.global_memory.slots
+
+            def store():
+                slots[slot] = expression()
+            return store
+
+        memory = self.function_memory
+
+        def store():
+            memory.slots[slot] = expression()
+        return store
+
+    def sequence(self, nodes):
+        statements = tuple(node.accept(self) for node in nodes)
+
+        def run():
+            for statement in statements:
+                completion = statement()
+                # expression statements hand back plain values
+                if completion is not None and completion.__class__ is Completion:
+                    return completion
+        return run
+
+    @on('node')
+    def visit(self, node):
+        pass
+
+    @when(AST.Program)
+    def visit(self, program):
+        return program.program_blocks.accept(self)
+
+    @when(AST.ProgramBlockList)
+    def visit(self, node):
+        return self.sequence(node.children)
+
+    @when(AST.ProgramBlock)
+    def visit(self, program_block):
+        return program_block.block.accept(self)
+
+    @when(AST.DeclarationList)
+    def visit(self, node):
+        return self.sequence(node.children)
+
+    @when(AST.Declaration)
+    def visit(self, node):
+        return node.inits.accept(self)
+
+    @when(AST.InitList)
+    def visit(self, node):
+        return self.sequence(node.children)
+
+    @when(AST.InstructionList)
+    def visit(self, node):
+        return self.sequence(node.children)
+
+    @when(AST.Init)
+    def visit(self, node):
+        return self.store(node, node.expr.accept(self))
+
+    @when(AST.AssignmentInstruction)
+    def visit(self, node):
+        return self.store(node, node.expr.accept(self))
+
+    @when(AST.FunctionExpression)
+    def visit(self, node):
+        function = Function(node.name, len(node.args), node.frame_size, node.body.accept(self))
+        slots = self.global_memory.slots
+        slot = node.slot
+
+        def define():
+            slots[slot] = function
+        return define
+
+    @when(AST.CompoundInstruction)
+    def visit(self, node):
+        declarations = node.declarations.accept(self)
+        instructions = node.instructions.accept(self)
+
+        def compound():
+            declarations()
+            return instructions()
+        return compound
+
+    @when(AST.InvocationExpression)
+    def visit(self, node):
+        arguments = tuple(enumerate(expression.accept(self) for expression in node.args.children))
+        slots = self.global_memory.slots
+        slot = node.slot
+        push = self.function_memory.push
+        pop = self.function_memory.pop
+        state = self
+
+        def invoke():
+            function = slots[slot]
+            memory = Memory(function.name, function.frame_size)
+            for argument, expression in arguments:
+                memory.slots[argument] = expression()
+
+            push(memory)
+            completion = function.body()
+            pop()
+
+            if completion is RETURN:
+                return state.return_value
+        return invoke
+
+    @when(AST.PrintInstruction)
+    def visit(self, node):
+        expression = node.expr.accept(self)
+        print_value = self.output.print_value
+
+        def print_instruction():
+            print_value(expression())
+        return print_instruction
+
+    @when(AST.LabeledInstruction)
+    def visit(self, node):
+        return node.instr.accept(self)
+
+    @when(AST.ChoiceInstruction)
+    def visit(self, node):
+        condition = node.condition.accept(self)
+        action = node.action.accept(self)
+
+        if not node.alternateAction:
+            def choice():
+                if condition():
+                    return action()
+            return choice
+
+        alternate_action = node.alternateAction.accept(self)
+
+        def choice():
+            if condition():
+                return action()
+            return alternate_action()
+        return choice
+
+    @when(AST.WhileInstruction)
+    def visit(self, node):
+        condition = node.condition.accept(self)
+        instruction = node.instruction.accept(self)
+
+        def while_instruction():
+            while condition():
+                completion = instruction()
+                if completion is BREAK:
+                    break
+                if completion is RETURN:
+                    return RETURN
+        return while_instruction
+
+    @when(AST.RepeatInstruction)
+    def visit(self, node):
+        instructions = node.instructions.accept(self)
+        condition = node.condition.accept(self)
+
+        def repeat_instruction():
+            while True:
+                completion = instructions()
+                if completion is BREAK:
+                    break
+                if completion is RETURN:
+                    return RETURN
+                if condition():  # PASCAL STYLE
+                    break
+        return repeat_instruction
+
+    @when(AST.BreakInstruction)
+    def visit(self, node):
+        return lambda: BREAK
+
+    @when(AST.ContinueInstruction)
+    def visit(self, node):
+        return lambda: CONTINUE
+
+    @when(AST.ReturnInstruction)
+    def visit(self, node):
+        expression = node.expression.accept(self)
+        state = self
+
+        def return_instruction():
+            state.return_value = expression()
+            return RETURN
+        return return_instruction
+
+    @when(AST.BinExpr)
+    def visit(self, node):
+        return BINARY_CLOSURES[node.op](node.left.accept(self), node.right.accept(self))
+
+    @when(AST.GroupedExpression)
+    def visit(self, node):
+        return node.interior.accept(self)
+
+    @when(AST.Variable)
+    def visit(self, node):
+        slot = node.slot
+
+        if node.is_global:
+            slots = self.global_memory.slots
+            return lambda: slots[slot]
+
+        memory = self.function_memory
+        return lambda: memory.slots[slot]
+
+    @when(AST.Const)
+    def visit(self, node):
+        value = node.value
+        return lambda: value
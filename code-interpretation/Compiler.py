@@ -0,0 +1,287 @@
+import AST
+from Operators import OPERATOR_INDEX, OPERATOR_NAMES
+from Resolver import Resolver
+from visit import *
+
+# Every instruction occupies two consecutive slots of CodeObject.code: the
+# opcode and its argument (0 when the opcode takes none).
+(LOAD_CONST, LOAD_LOCAL, STORE_LOCAL, LOAD_GLOBAL, STORE_GLOBAL, BINARY_OP, POP_TOP,
+ PRINT, JUMP, POP_JUMP_IF_FALSE, CALL, RETURN_VALUE) = range(12)
+
+OPCODE_NAMES = ('LOAD_CONST', 'LOAD_LOCAL', 'STORE_LOCAL', 'LOAD_GLOBAL', 'STORE_GLOBAL', 'BINARY_OP',
+                'POP_TOP', 'PRINT', 'JUMP', 'POP_JUMP_IF_FALSE', 'CALL', 'RETURN_VALUE')
+
+EXPRESSIONS = (AST.Const, AST.Variable, AST.BinExpr, AST.GroupedExpression, AST.InvocationExpression)
+
+
+class CodeObject(object):
+
+    def __init__(self, name, code, constants, names, nlocals, nargs):
+        self.name = name
+        self.code = code
+        self.constants = constants
+        self.names = names
+        self.nlocals = nlocals
+        self.nargs = nargs
+
+    def disassemble(self):
+        lines = []
+        for pc in range(0, len(self.code), 2):
+            opcode, arg = self.code[pc], self.code[pc + 1]
+            if opcode == LOAD_CONST:
+                detail = repr(self.constants[arg])
+            elif opcode in (LOAD_GLOBAL, STORE_GLOBAL, CALL):
+                detail = self.names[arg]
+            elif opcode == BINARY_OP:
+                detail = OPERATOR_NAMES[arg]
+            else:
+                detail = ''
+            lines.append("{0:>5} {1:<18} {2:<4} {3}".format(pc, OPCODE_NAMES[opcode], arg, detail).rstrip())
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return "<code {0}>".format(self.name)
+
+
+class Loop(object):
+
+    def __init__(self):
+        self.break_jumps = []
+        self.continue_jumps = []
+
+
+class CodeBuilder(object):
+
+    def __init__(self, name, names, nlocals, nargs=0):
+        self.name = name
+        self.names = names
+        self.code = []
+        self.constants = []
+        self.constant_indices = {}
+        self.nargs = nargs
+        self.nlocals = nlocals
+        self.loops = []
+
+    def emit(self, opcode, arg=0):
+        self.code.append(opcode)
+        self.code.append(arg)
+        return len(self.code) - 2
+
+    def position(self):
+        return len(self.code)
+
+    def patch(self, instruction, target):
+        self.code[instruction + 1] = target
+
+    def constant(self, value):
+        # 1, 1.0 and True compare equal but print differently
+        key = (value.__class__, value)
+        if key not in self.constant_indices:
+            self.constant_indices[key] = len(self.constants)
+            self.constants.append(value)
+        return self.constant_indices[key]
+
+    def finish(self):
+        self.emit(LOAD_CONST, self.constant(None))
+        self.emit(RETURN_VALUE)
+        return CodeObject(self.name, self.code, self.constants, self.names, self.nlocals, self.nargs)
+
+
+class Compiler(object):
+    """Translates a checked AST.Program into CodeObjects run by VirtualMachine.
+
+    Names are bound by Resolver: globals index the program-wide name pool and
+    locals the flat frame of their function (or of the top level).
+    """
+
+    def __init__(self):
+        self.names = []
+        self.builder = None
+
+    def compile(self, program):
+        Resolver().resolve(program)
+        self.names = program.global_names
+        self.builder = CodeBuilder("<program>", self.names, program.frame_size)
+        program.accept(self)
+        return self.builder.finish()
+
+    def load(self, node):
+        self.builder.emit(LOAD_GLOBAL if node.is_global else LOAD_LOCAL, node.slot)
+
+    def store(self, node):
+        self.builder.emit(STORE_GLOBAL if node.is_global else STORE_LOCAL, node.slot)
+
+    def statement(self, node):
+        node.accept(self)
+        if isinstance(node, EXPRESSIONS):
+            self.builder.emit(POP_TOP)
+
+    @on('node')
+    def visit(self, node):
+        pass
+
+    @when(AST.Program)
+    def visit(self, program):
+        program.program_blocks.accept(self)
+
+    @when(AST.ProgramBlockList)
+    def visit(self, node):
+        for child in node.children:
+            child.accept(self)
+
+    @when(AST.ProgramBlock)
+    def visit(self, program_block):
+        self.statement(program_block.block)
+
+    @when(AST.DeclarationList)
+    def visit(self, node):
+        for child in node.children:
+            child.accept(self)
+
+    @when(AST.Declaration)
+    def visit(self, node):
+        node.inits.accept(self)
+
+    @when(AST.InitList)
+    def visit(self, node):
+        for child in node.children:
+            child.accept(self)
+
+    @when(AST.Init)
+    def visit(self, node):
+        node.expr.accept(self)
+        self.store(node)
+
+    @when(AST.InstructionList)
+    def visit(self, node):
+        for child in node.children:
+            self.statement(child)
+
+    @when(AST.FunctionExpression)
+    def visit(self, node):
+        enclosing = self.builder
+        self.builder = CodeBuilder(node.name, self.names, node.frame_size, len(node.args))
+        node.body.accept(self)
+        function = self.builder.finish()
+        self.builder = enclosing
+
+        self.builder.emit(LOAD_CONST, self.builder.constant(function))
+        self.builder.emit(STORE_GLOBAL, node.slot)
+
+    @when(AST.CompoundInstruction)
+    def visit(self, node):
+        node.declarations.accept(self)
+        node.instructions.accept(self)
+
+    @when(AST.AssignmentInstruction)
+    def visit(self, node):
+        node.expr.accept(self)
+        self.store(node)
+
+    @when(AST.PrintInstruction)
+    def visit(self, node):
+        node.expr.accept(self)
+        self.builder.emit(PRINT)
+
+    @when(AST.LabeledInstruction)
+    def visit(self, node):
+        self.statement(node.instr)
+
+    @when(AST.ChoiceInstruction)
+    def visit(self, node):
+        builder = self.builder
+        node.condition.accept(self)
+        skip_action = builder.emit(POP_JUMP_IF_FALSE)
+        self.statement(node.action)
+        if node.alternateAction:
+            skip_alternative = builder.emit(JUMP)
+            builder.patch(skip_action, builder.position())
+            self.statement(node.alternateAction)
+            builder.patch(skip_alternative, builder.position())
+        else:
+            builder.patch(skip_action, builder.position())
+
+    @when(AST.WhileInstruction)
+    def visit(self, node):
+        builder = self.builder
+        loop = Loop()
+        builder.loops.append(loop)
+
+        start = builder.position()
+        node.condition.accept(self)
+        loop.break_jumps.append(builder.emit(POP_JUMP_IF_FALSE))
+        self.statement(node.instruction)
+        builder.emit(JUMP, start)
+
+        builder.loops.pop()
+        self.patch_loop(loop, start, builder.position())
+
+    @when(AST.RepeatInstruction)
+    def visit(self, node):
+        builder = self.builder
+        loop = Loop()
+        builder.loops.append(loop)
+
+        start = builder.position()
+        node.instructions.accept(self)
+        condition = builder.position()
+        node.condition.accept(self)
+        builder.emit(POP_JUMP_IF_FALSE, start)
+
+        builder.loops.pop()
+        self.patch_loop(loop, condition, builder.position())
+
+    def patch_loop(self, loop, continue_target, break_target):
+        for jump in loop.continue_jumps:
+            self.builder.patch(jump, continue_target)
+        for jump in loop.break_jumps:
+            self.builder.patch(jump, break_target)
+
+    @when(AST.BreakInstruction)
+    def visit(self, node):
+        self.builder.loops[-1].break_jumps.append(self.builder.emit(JUMP))
+
+    @when(AST.ContinueInstruction)
+    def visit(self, node):
+        self.builder.loops[-1].continue_jumps.append(self.builder.emit(JUMP))
+
+    @when(AST.ReturnInstruction)
+    def visit(self, node):
+        node.expression.accept(self)
+        self.builder.emit(RETURN_VALUE)
+
+    @when(AST.BinExpr)
+    def visit(self, node):
+        # a left-nested chain is as deep as it is long, so operands are
+        # scheduled on an explicit stack; ints stand for pending operators
+        pending = [node]
+        while pending:
+            item = pending.pop()
+            if item.__class__ is int:
+                self.builder.emit(BINARY_OP, item)
+            elif item.__class__ is AST.BinExpr:
+                pending.append(OPERATOR_INDEX[item.op])
+                pending.append(item.right)
+                pending.append(item.left)
+            elif item.__class__ is AST.GroupedExpression:
+                pending.append(item.interior)
+            else:
+                item.accept(self)
+
+    @when(AST.GroupedExpression)
+    def visit(self, node):
+        node.interior.accept(self)
+
+    @when(AST.InvocationExpression)
+    def visit(self, node):
+        for expression in node.args.children:
+            expression.accept(self)
+        self.builder.emit(CALL, node.slot)
+
+    @when(AST.Variable)
+    def visit(self, node):
+        self.load(node)
+
+    @when(AST.Const)
+    def visit(self, node):
+        self.builder.emit(LOAD_CONST, self.builder.constant(node.value))
@@ -0,0 +1,15 @@
+
+class Completion(object):
+    """Abrupt completion of a statement, returned to the enclosing loop or call
+    instead of being raised."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return "<{0}>".format(self.name)
+
+
+BREAK = Completion("break")
+CONTINUE = Completion("continue")
+RETURN = Completion("return")  # the value itself is kept by the executing engine
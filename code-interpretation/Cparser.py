@@ -1,8 +1,10 @@
 #!/usr/bin/python
 import re
 
+import paths  # puts ../shared on sys.path
 from scanner import Scanner
 import AST
+from Operators import resolve_operator
 
 
 class Cparser(object):
@@ -177,9 +179,9 @@ class Cparser(object):
                  | FLOAT
                  | STRING"""
         if re.match(r"\d+(\.\d*)|\.\d+", p[1]):
-            p[0] = AST.Float(p.lineno(1), p[1])
+            p[0] = AST.Float(p.lineno(1), float(p[1]))
         elif re.match(r"\d+", p[1]):
-            p[0] = AST.Integer(p.lineno(1), p[1])
+            p[0] = AST.Integer(p.lineno(1), int(p[1]))
         else:
             p[0] = AST.String(p.lineno(1), p[1][1:-1])  # remove double quotes ""
 
@@ -225,6 +227,7 @@ class Cparser(object):
             op = p[2]
             right = p[3]
             p[0] = AST.BinExpr(p.lineno(2), left, op, right)
+            p[0].operator = resolve_operator(op)
 
     def p_expr_list(self, p):
         """expr_list : expr_list ',' expression
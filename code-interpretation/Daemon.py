@@ -0,0 +1,82 @@
+"""Long-running server keeping the parser, checker and engines warm.
+
+Requests arrive on a Unix domain socket, one JSON object per connection:
+
+    {"command": "run", "arguments": [...], "cwd": "...", "source": "..."}
+
+command is parse, check, translate or run, arguments are those of main.py,
+resolved against cwd, and source, when given, replaces the contents of the
+named file. The reply is {"status": ..., "stdout": ..., "stderr": ...}: what
+main.py would have printed and its exit status. A program may print bytes
+that are not UTF-8, so every byte printed is sent as the character of the
+same code, as latin-1 decodes them. Requests are served one at a time, by
+a Session. Start the daemon with
+
+    python Daemon.py [--socket PATH]
+
+and send requests with client.py.
+"""
+import argparse
+import json
+import os
+import signal
+import SocketServer
+import sys
+import tempfile
+
+SOCKET_VARIABLE = "CPARSER_SOCKET"
+
+
+def socket_path():
+    """Returns the socket path from CPARSER_SOCKET, by default a per-user file in the temporary directory."""
+    return os.environ.get(SOCKET_VARIABLE) or os.path.join(tempfile.gettempdir(),
+                                                           "cparser-{0}.sock".format(os.getuid()))
+
+
+class RequestHandler(SocketServer.StreamRequestHandler):
+
+    def handle(self):
+        request = json.loads(self.rfile.read())
+        self.wfile.write(json.dumps(self.server.session.handle(request), encoding='latin-1'))
+
+
+class DaemonServer(SocketServer.UnixStreamServer):
+
+    def __init__(self, path, session):
+        if os.path.exists(path):
+            os.remove(path)
+        SocketServer.UnixStreamServer.__init__(self, path, RequestHandler)
+        # requests read and write files as the daemon's user
+        os.chmod(path, 0600)
+        self.session = session
+
+    def handle_error(self, request, client_address):
+        # an exit requested while serving must not be reported and swallowed
+        if issubclass(sys.exc_info()[0], (SystemExit, KeyboardInterrupt)):
+            raise
+        SocketServer.UnixStreamServer.handle_error(self, request, client_address)
+
+
+def serve(path, session):
+    server = DaemonServer(path, session)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    # only here, so that client.py reads the socket path without loading the parser
+    from Session import Session
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--socket", default=socket_path(), help="path of the Unix domain socket to listen on")
+    args = arg_parser.parse_args()
+
+    # a plain kill still removes the socket
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        serve(args.socket, Session())
+    except KeyboardInterrupt:
+        pass
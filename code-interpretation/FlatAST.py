@@ -0,0 +1,336 @@
+from array import array
+import AST
+
+# Node kinds in kind-code order with their constructor fields; 'line' is passed
+# first whenever the class has one. NodeLists keep a variable number of children.
+LAYOUT = (
+    (AST.Program, ('program_blocks',)),
+    (AST.ProgramBlockList, None),
+    (AST.ProgramBlock, ('block',)),
+    (AST.DeclarationList, None),
+    (AST.Declaration, ('type', 'inits')),
+    (AST.InitList, None),
+    (AST.Init, ('name', 'expr')),
+    (AST.InstructionList, None),
+    (AST.PrintInstruction, ('expr',)),
+    (AST.LabeledInstruction, ('id', 'instr')),
+    (AST.AssignmentInstruction, ('id', 'expr')),
+    (AST.CompoundInstruction, ('declarations', 'instructions')),
+    (AST.ChoiceInstruction, ('condition', 'action', 'alternateAction')),
+    (AST.WhileInstruction, ('condition', 'instruction')),
+    (AST.RepeatInstruction, ('instructions', 'condition')),
+    (AST.ReturnInstruction, ('expression',)),
+    (AST.ContinueInstruction, ()),
+    (AST.BreakInstruction, ()),
+    (AST.Integer, ('value',)),
+    (AST.Float, ('value',)),
+    (AST.String, ('value',)),
+    (AST.Variable, ('name',)),
+    (AST.BinExpr, ('left', 'op', 'right')),
+    (AST.GroupedExpression, ('interior',)),
+    (AST.ExpressionList, None),
+    (AST.InvocationExpression, ('name', 'args')),
+    (AST.FunctionExpression, ('retType', 'name', 'args', 'body')),
+    (AST.ArgumentList, None),
+    (AST.Argument, ('type', 'name')),
+)
+
+# Fields holding nodes (possibly None); every other field is a plain value
+NODE_FIELDS = frozenset(['program_blocks', 'block', 'inits', 'expr', 'instr', 'declarations', 'instructions',
+                         'condition', 'action', 'alternateAction', 'instruction', 'expression', 'left', 'right',
+                         'interior', 'args', 'body'])
+
+
+def slot_names(cls):
+    return [name for base in reversed(cls.__mro__) for name in base.__dict__.get('__slots__', ())]
+
+
+def annotations(cls, fields):
+    """Returns the fields of cls set after construction: BinExpr.operator and what Resolver fills in."""
+    return tuple(name for name in slot_names(cls) if name not in fields and name not in ('line', 'children'))
+
+
+KINDS = tuple(cls for cls, fields in LAYOUT)
+KIND_CODES = dict((cls, code) for code, cls in enumerate(KINDS))
+CHILD_FIELDS = tuple(None if fields is None else tuple(field for field in fields if field in NODE_FIELDS)
+                     for cls, fields in LAYOUT)
+# constructor values, then the annotations
+VALUE_FIELDS = tuple(() if fields is None else
+                     tuple(field for field in fields if field not in NODE_FIELDS) + annotations(cls, fields)
+                     for cls, fields in LAYOUT)
+HAS_LINE = tuple('line' in slot_names(cls) for cls in KINDS)
+
+NO_NODE = -1
+NO_LINE = -1
+
+
+class FlatAST(object):
+    """Struct-of-arrays encoding of an AST.
+
+    Per node the typed arrays hold its kind code, source line, the range of
+    its child indices in edges and the start of its values, which are
+    interned in a shared pool. Values are the fields that are not nodes, the
+    annotations the Resolver fills in included.
+
+    node(index) returns a view of a node: an instance of a subclass of its
+    AST class, of the same name, holding only the FlatAST and the index and
+    reading and writing its fields in the arrays. The visitors dispatch on a
+    view as on the node, so the TypeChecker, Resolver, Optimizer and
+    Interpreter run over the encoding without rebuilding the object tree,
+    and only the views being visited exist at any time. A node assigned to a
+    field that is not a view of the same FlatAST, as a constant the Optimizer
+    folded, is encoded at the end of the arrays.
+    """
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.lines = array('i')
+        self.first_edge = array('i')
+        self.edge_count = array('i')
+        self.first_value = array('i')
+        self.edges = array('i')
+        self.value_refs = array('i')
+        self.pool = []
+        self.pool_index = {}
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def intern(self, value):
+        # repr keeps -0.0 apart from 0.0, which it equals
+        key = (float, repr(value)) if value.__class__ is float else (value.__class__, value)
+        try:
+            ref = self.pool_index.get(key)
+        except TypeError:
+            # a list such as Program.global_names, kept as it is
+            key = (value.__class__, id(value))
+            ref = self.pool_index.get(key)
+        if ref is None:
+            ref = self.pool_index[key] = len(self.pool)
+            self.pool.append(value)
+        return ref
+
+    def add(self, node):
+        code = KIND_CODES[node.__class__]
+        index = len(self.kinds)
+        self.kinds.append(code)
+        self.lines.append(node.line if HAS_LINE[code] else NO_LINE)
+
+        self.first_value.append(len(self.value_refs))
+        for field in VALUE_FIELDS[code]:
+            self.value_refs.append(self.intern(getattr(node, field)))
+
+        fields = CHILD_FIELDS[code]
+        children = node.children if fields is None else [getattr(node, field) for field in fields]
+        self.first_edge.append(len(self.edges))
+        self.edge_count.append(len(children))
+        self.edges.extend([NO_NODE] * len(children))
+        return index, children
+
+    def add_tree(self, root):
+        """Encodes the tree under root at the end of the arrays iteratively, so deep trees do not recurse.
+
+        Returns the index of root.
+        """
+        pending = [(root, NO_NODE)]
+        first = len(self.kinds)
+        while pending:
+            node, edge = pending.pop()
+            index, children = self.add(node)
+            if edge != NO_NODE:
+                self.edges[edge] = index
+
+            start = self.first_edge[index]
+            for offset in range(len(children) - 1, -1, -1):
+                if children[offset] is not None:
+                    pending.append((children[offset], start + offset))
+        return first
+
+    def index_of(self, node):
+        """Returns the index of node, encoding it first unless it is a view of this FlatAST."""
+        if node is None:
+            return NO_NODE
+        if getattr(node, 'flat', None) is self:
+            return node.index
+        return self.add_tree(node)
+
+    def node(self, index):
+        return VIEWS[self.kinds[index]](self, index)
+
+    def root(self):
+        return self.node(0)
+
+    def kind_of(self, index):
+        return KINDS[self.kinds[index]]
+
+    def line_of(self, index):
+        line = self.lines[index]
+        return None if line == NO_LINE else line
+
+    def children_of(self, index):
+        start = self.first_edge[index]
+        return self.edges[start:start + self.edge_count[index]].tolist()
+
+    def set_children(self, index, children):
+        edges = [self.index_of(child) for child in children]
+        if len(edges) != self.edge_count[index]:
+            self.first_edge[index] = len(self.edges)
+            self.edge_count[index] = len(edges)
+            self.edges.extend(edges)
+        else:
+            start = self.first_edge[index]
+            self.edges[start:start + len(edges)] = array('i', edges)
+
+    def values_of(self, index):
+        start = self.first_value[index]
+        count = len(VALUE_FIELDS[self.kinds[index]])
+        return [self.pool[ref] for ref in self.value_refs[start:start + count]]
+
+    def count(self, kind):
+        return self.kinds.count(KIND_CODES[kind])
+
+    def nbytes(self):
+        arrays = (self.kinds, self.lines, self.first_edge, self.edge_count, self.first_value, self.edges,
+                  self.value_refs)
+        return sum(len(values) * values.itemsize for values in arrays)
+
+    def decode(self, root=0):
+        """Rebuilds the AST.Node subtree rooted at root.
+
+        The subtree's indices are collected in preorder, then the nodes are
+        built backwards, so that every child exists before its parent.
+        """
+        order = []
+        pending = [root]
+        while pending:
+            index = pending.pop()
+            order.append(index)
+            pending.extend(child for child in self.children_of(index) if child != NO_NODE)
+
+        nodes = {}
+        for index in reversed(order):
+            code = self.kinds[index]
+            cls = KINDS[code]
+            children = [nodes[child] if child != NO_NODE else None for child in self.children_of(index)]
+
+            if LAYOUT[code][1] is None:
+                node = cls()
+                node.children = children
+            else:
+                values = dict(zip(VALUE_FIELDS[code], self.values_of(index)))
+                arguments = [self.line_of(index)] if HAS_LINE[code] else []
+                children = iter(children)
+                for field in LAYOUT[code][1]:
+                    arguments.append(next(children) if field in NODE_FIELDS else values.pop(field))
+                node = cls(*arguments)
+                for field, value in values.items():
+                    setattr(node, field, value)
+            nodes[index] = node
+        return nodes[root]
+
+
+def encode(root):
+    flat = FlatAST()
+    flat.add_tree(root)
+    return flat
+
+
+def flatten(root):
+    """Returns the view of the root of the encoded tree under root; a view is returned as it is."""
+    if isinstance(root, View):
+        return root
+    return encode(root).root()
+
+
+class View(object):
+    """Methods of the views of the nodes of a FlatAST."""
+
+    __slots__ = ()
+
+    def __init__(self, flat, index):
+        self.flat = flat
+        self.index = index
+
+    def __eq__(self, other):
+        return isinstance(other, View) and self.flat is other.flat and self.index == other.index
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return self.index
+
+    def __repr__(self):
+        return "<{0} {1}>".format(self.__class__.__name__, self.index)
+
+
+class ListView(View):
+    """Methods of the views of the NodeLists."""
+
+    __slots__ = ()
+
+    @property
+    def children(self):
+        flat = self.flat
+        return [flat.node(child) for child in flat.children_of(self.index)]
+
+    @children.setter
+    def children(self, children):
+        self.flat.set_children(self.index, children)
+
+    def append(self, child):
+        self.children = self.children + [child]
+
+    def __len__(self):
+        return self.flat.edge_count[self.index]
+
+    def __iter__(self):
+        return iter(self.children)
+
+
+def line_field():
+    def get(self):
+        return self.flat.line_of(self.index)
+    return property(get)
+
+
+def node_field(offset):
+    def get(self):
+        flat = self.flat
+        child = flat.edges[flat.first_edge[self.index] + offset]
+        return None if child == NO_NODE else flat.node(child)
+
+    def set(self, node):
+        flat = self.flat
+        flat.edges[flat.first_edge[self.index] + offset] = flat.index_of(node)
+    return property(get, set)
+
+
+def value_field(offset):
+    def get(self):
+        flat = self.flat
+        return flat.pool[flat.value_refs[flat.first_value[self.index] + offset]]
+
+    def set(self, value):
+        flat = self.flat
+        flat.value_refs[flat.first_value[self.index] + offset] = flat.intern(value)
+    return property(get, set)
+
+
+def view_class(code):
+    cls, fields = LAYOUT[code]
+    namespace = {'__slots__': ('flat', 'index')}
+    if fields is None:
+        return type(cls.__name__, (ListView, cls), namespace)
+
+    if HAS_LINE[code]:
+        namespace['line'] = line_field()
+    for offset, field in enumerate(CHILD_FIELDS[code]):
+        namespace[field] = node_field(offset)
+    for offset, field in enumerate(VALUE_FIELDS[code]):
+        namespace[field] = value_field(offset)
+    return type(cls.__name__, (View, cls), namespace)
+
+
+VIEWS = tuple(view_class(code) for code in range(len(LAYOUT)))
+KIND_CODES.update((view, code) for code, view in enumerate(VIEWS))
@@ -1,20 +1,36 @@
-from operator import lshift, rshift, or_, and_, xor
 import AST
 import SymbolTable
 from Memory import *
-from Exceptions import  *
+from Resolver import Resolver
+from Purity import Purity
+from Cache import LRUCache, argument_key, MISSING
+from Completion import *
+from LoopCompiler import LoopCompiler
+from Output import stdout_output
 from visit import *
 import sys
 
 sys.setrecursionlimit(10000)
 
+# passes after which a While or Repeat loop is compiled, see LoopCompiler
+HOT_LOOP_ITERATIONS = 100
+
 
 class Interpreter(object):
 
-    def __init__(self):
+    def __init__(self, output=None, memo_size=None):
+        self.output = output if output is not None else stdout_output()
         self.function_memory = MemoryStack()
         self.global_memory = MemoryStack()
-        self.is_scope_local = False
+        self.return_value = None
+        # pure AST.FunctionExpression -> LRUCache of its results, see --memoize
+        self.memo_size = memo_size
+        self.caches = {}
+        # None leaves every loop to the visits, as --stats and --profile need
+        self.loop_threshold = HOT_LOOP_ITERATIONS
+        # loop node -> its compiled function, None when it could not be compiled
+        self.compiled_loops = {}
+        self.visit = bind_dispatch(Interpreter.visit, self)
 
     @on('node')
     def visit(self, node):
@@ -22,8 +38,60 @@ class Interpreter(object):
 
     @when(AST.Program)
     def visit(self, program):
+        Resolver().resolve(program)
+        self.global_memory = MemoryStack(Memory("global", program.global_size))
+        self.function_memory = MemoryStack(Memory("default", program.frame_size))
+        if self.memo_size:
+            for function in Purity().analyze(program):
+                self.caches[function] = LRUCache(self.memo_size)
         program.program_blocks.accept(self)
 
+    def call_memoized(self, function, memory, nargs, cache):
+        key = argument_key(memory.slots[:nargs])
+        result = MISSING if key is None else cache.get(key, MISSING)
+        if result is MISSING:
+            self.function_memory.push(memory)
+            completion = function.body.accept(self)
+            self.function_memory.pop()
+
+            result = self.return_value if completion is RETURN else None
+            if key is not None:
+                cache.put(key, result)
+        return result
+
+    def call(self, function, arguments):
+        """Calls function with the evaluated arguments, as compiled loops do; returns its value."""
+        memory = Memory(function.name, function.frame_size)
+        memory.slots[:len(arguments)] = arguments
+
+        cache = self.caches.get(function)
+        if cache is not None:
+            return self.call_memoized(function, memory, len(arguments), cache)
+
+        self.function_memory.push(memory)
+        completion = function.body.accept(self)
+        self.function_memory.pop()
+
+        if completion is RETURN:
+            return self.return_value
+
+    def compiled_loop(self, node):
+        if node not in self.compiled_loops:
+            self.compiled_loops[node] = LoopCompiler().compile(node)
+        return self.compiled_loops[node]
+
+    def run_compiled(self, node):
+        """Runs the rest of loop node compiled; returns its completion, or False when it cannot be compiled."""
+        loop = self.compiled_loop(node)
+        if loop is None:
+            return False
+        return loop(self, self.global_memory.slots, self.function_memory.slots)
+
+    def report_memoization(self, stream):
+        for function, cache in sorted(self.caches.items(), key=lambda item: item[0].name):
+            stream.write("memoized {0}: {1} hits, {2} misses, {3} cached\n".format(
+                function.name, cache.hits, cache.misses, len(cache)))
+
     @when(AST.ProgramBlock)
     def visit(self, program_block):
         program_block.block.accept(self)
@@ -41,7 +109,10 @@ class Interpreter(object):
     @when(AST.InstructionList)
     def visit(self, node):
         for child in node.children:
-            child.accept(self)
+            completion = child.accept(self)
+            # expression statements hand back plain values
+            if completion is not None and completion.__class__ is Completion:
+                return completion
 
     @when(AST.ProgramBlockList)
     def visit(self, node):
@@ -62,31 +133,7 @@ class Interpreter(object):
     def visit(self, node):
         r1 = node.left.accept(self)
         r2 = node.right.accept(self)
-        operators = {
-            '+': lambda a, b: a + b,
-            '-': lambda a, b: a - b,
-            '/': lambda a, b: a / b,
-            '*': lambda a, b: a * b,
-            '>': lambda a, b: a > b,
-            '>=': lambda a, b: a >= b,
-            '<': lambda a, b: a < b,
-            '<=': lambda a, b: a <= b,
-            '==': lambda a, b: a == b,
-            '%': lambda a, b: a % b,
-            '!=': lambda a, b: a != b,
-            '&&': lambda a, b: a and b,
-            '||': lambda a, b: a or b,
-            '<<': lshift,
-            '>>': rshift,
-            '|': or_,
-            '&': and_,
-            '^': xor,
-        }
-
-        if node.op in operators:
-            return operators[node.op](r1, r2)
-        else:
-            print("Binary operator {} is not defined".format(node.op))
+        return node.operator(r1, r2)
 
     @when(AST.GroupedExpression)
     def visit(self, node):
@@ -94,7 +141,7 @@ class Interpreter(object):
 
     @when(AST.FunctionExpression)
     def visit(self, node):
-        self.global_memory.insert(node.name, node)
+        self.global_memory.slots[node.slot] = node
 
     @when(AST.Declaration)
     def visit(self, node):
@@ -103,42 +150,55 @@ class Interpreter(object):
     @when(AST.AssignmentInstruction)
     def visit(self, node):
         expression = node.expr.accept(self)
-        if self.is_scope_local:
-            if not self.function_memory.set(node.id, expression):
-                self.global_memory.set(node.id, expression)
-        else:
-            self.global_memory.set(node.id, expression)
+        memory = self.global_memory if node.is_global else self.function_memory
+        memory.slots[node.slot] = expression
         return expression
 
     @when(AST.Init)
     def visit(self, node):
         expression = node.expr.accept(self)
-        memory = self.function_memory if self.is_scope_local else self.global_memory
-        memory.insert(node.name, expression)
+        memory = self.global_memory if node.is_global else self.function_memory
+        memory.slots[node.slot] = expression
         return expression
 
+    # Both loops count their passes and, once they reach loop_threshold, hand
+    # the rest of the loop to its compiled function, which later entries run
+    # from the start.
     @when(AST.WhileInstruction)
     def visit(self, node):
+        if self.compiled_loops.get(node) is not None:
+            return self.run_compiled(node)
+        iterations = 0
         while node.condition.accept(self):
-            try:
-                node.instruction.accept(self)
-            except BreakException:
+            completion = node.instruction.accept(self)
+            if completion is BREAK:
                 break
-            except ContinueException:
-                pass
+            if completion is RETURN:
+                return RETURN
+            iterations += 1
+            if iterations == self.loop_threshold:
+                completion = self.run_compiled(node)
+                if completion is not False:
+                    return completion
 
     @when(AST.RepeatInstruction)
     def visit(self, node):
+        if self.compiled_loops.get(node) is not None:
+            return self.run_compiled(node)
+        iterations = 0
         while True:
-            try:
-                node.instructions.accept(self)
-                if node.condition.accept(self):  # PASCAL STYLE
-                    break
-            except BreakException:
+            completion = node.instructions.accept(self)
+            if completion is BREAK:
                 break
-            except ContinueException:
-                if node.condition.accept(self):  # PASCAL STYLE
-                    break
+            if completion is RETURN:
+                return RETURN
+            if node.condition.accept(self):  # PASCAL STYLE
+                break
+            iterations += 1
+            if iterations == self.loop_threshold:
+                completion = self.run_compiled(node)
+                if completion is not False:
+                    return completion
 
     @when(AST.ChoiceInstruction)
     def visit(self, node):
@@ -149,80 +209,60 @@ class Interpreter(object):
 
     @when(AST.CompoundInstruction)
     def visit(self, node):
-        was_local = self.is_scope_local
-        self.is_scope_local = True
-        self.function_memory.push(Memory('compound'))
-
-        try:
-            node.declarations.accept(self)
-            node.instructions.accept(self)
-        except ReturnValueException as e:
-            self.is_scope_local = was_local
-            self.function_memory.pop()
-            raise e
-
-        self.is_scope_local = was_local
-        self.function_memory.pop()
+        # block locals live in the slots of the enclosing activation
+        node.declarations.accept(self)
+        return node.instructions.accept(self)
 
     @when(AST.InvocationExpression)
     def visit(self, node):
-        was_local = self.is_scope_local
-        function = self.global_memory.get(node.name)
+        function = self.global_memory.slots[node.slot]
 
-        memory = Memory("function")
+        memory = Memory(function.name, function.frame_size)
 
-        for expression, argument in zip(node.args.children, function.args.children):
-            memory[argument.accept(self)] = expression.accept(self)
+        for slot, expression in enumerate(node.args.children):
+            memory.slots[slot] = expression.accept(self)
 
-        self.function_memory.push(memory)
+        cache = self.caches.get(function)
+        if cache is not None:
+            return self.call_memoized(function, memory, len(node.args.children), cache)
 
-        self.is_scope_local = True
+        self.function_memory.push(memory)
+        completion = function.body.accept(self)
+        self.function_memory.pop()
 
-        try:
-            function.body.accept(self)
-        except ReturnValueException as e:
-            return e.value
-        finally:
-            self.function_memory.pop()
-            self.is_scope_local = was_local
+        if completion is RETURN:
+            return self.return_value
 
     @when(AST.Argument)
     def visit(self, node):
         return node.name
 
-    @when(AST.Integer)
-    def visit(self, node):
-        return int(node.value)
-
-    @when(AST.Float)
-    def visit(self, node):
-        return float(node.value)
-
-    @when(AST.String)
+    @when(AST.Const)
     def visit(self, node):
         return node.value
 
     @when(AST.Variable)
     def visit(self, node):
-        if self.is_scope_local:
-            return self.function_memory.get(node.name, self.global_memory.get(node.name))
-        return self.global_memory.get(node.name)
+        if node.is_global:
+            return self.global_memory.slots[node.slot]
+        return self.function_memory.slots[node.slot]
 
     @when(AST.BreakInstruction)
     def visit(self, node):
-        raise BreakException()
+        return BREAK
 
     @when(AST.ContinueInstruction)
     def visit(self, node):
-        raise ContinueException()
+        return CONTINUE
 
     @when(AST.ReturnInstruction)
     def visit(self, node):
-        raise ReturnValueException(node.expression.accept(self))
+        self.return_value = node.expression.accept(self)
+        return RETURN
 
     @when(AST.PrintInstruction)
     def visit(self, node):
-        print node.expr.accept(self)
+        self.output.print_value(node.expr.accept(self))
 
     @when(AST.LabeledInstruction)
     def visit(self, node):
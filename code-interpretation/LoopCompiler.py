@@ -0,0 +1,86 @@
+import AST
+from Completion import RETURN
+from PythonSource import PythonSource, ExpressionTooDeep, NAMESPACE, compile_source, find_nodes
+
+
+class LoopCompiler(PythonSource):
+    """Translates a While or Repeat loop of a resolved AST into a Python function.
+
+    The function, called with the Interpreter and the slots of its global and
+    current function memory, runs the loop from its next test (a While) or its
+    next pass over the body (a Repeat) exactly as the Interpreter would and
+    returns its completion. Variables become Python locals loaded before the
+    loop and stored back when it is left, globals only when the loop calls no
+    function that could read or write them. Calls go back to Interpreter.call.
+    """
+
+    def __init__(self):
+        super(LoopCompiler, self).__init__()
+        # (is_global, slot) -> local name, and the names assigned
+        self.names = {}
+        self.written = set()
+        self.cache_globals = True
+
+    def compile(self, loop):
+        """Returns the function running loop, None when Python cannot compile it."""
+        self.cache_globals = next(find_nodes(loop, AST.InvocationExpression), None) is None
+        try:
+            loop.accept(self)
+        except (ExpressionTooDeep, RuntimeError):
+            # RuntimeError: the interpreter may be deep in recursion already
+            return None
+        body, self.lines = self.lines, []
+
+        self.indent = 1
+        self.emit("_print = interpreter.output.print_value")
+        self.emit("_call = interpreter.call")
+        for (is_global, slot), name in sorted(self.names.items()):
+            self.emit("{0} = {1}[{2}]".format(name, "g" if is_global else "f", slot))
+        self.lines.extend(body)
+        self.store_names()
+
+        lines = []
+        for line in self.lines:
+            if isinstance(line, int):
+                # the names are only all known once the whole loop is translated
+                lines.extend("    " * line + store for store in self.stores())
+            else:
+                lines.append(line)
+        source = "def loop(interpreter, g, f):\n" + "\n".join(lines) + "\n"
+
+        code = compile_source(source, "<loop>")
+        if code is None:
+            return None
+        namespace = dict(NAMESPACE, RETURN=RETURN)
+        exec code in namespace
+        return namespace['loop']
+
+    def store_names(self):
+        """Emits the statements storing the assigned locals back into memory."""
+        self.lines.append(self.indent)
+
+    def stores(self):
+        return ["{0}[{1}] = {2}".format("g" if is_global else "f", slot, name)
+                for (is_global, slot), name in sorted(self.names.items()) if name in self.written]
+
+    def variable(self, node):
+        if node.is_global and not self.cache_globals:
+            return "g[{0}]".format(node.slot)
+        key = (node.is_global, node.slot)
+        name = self.names.get(key)
+        if name is None:
+            name = self.names[key] = "{0}{1}".format("g" if node.is_global else "l", node.slot)
+        return name
+
+    def assign(self, node, expression):
+        self.written.add(self.variable(node))
+        super(LoopCompiler, self).assign(node, expression)
+
+    def invocation(self, node, arguments):
+        return "_call(g[{0}], [{1}])".format(node.slot, ", ".join(arguments))
+
+    def return_statement(self, node):
+        self.emit("_value = {0}".format(self.expression(node.expression)))
+        self.store_names()
+        self.emit("interpreter.return_value = _value")
+        self.emit("return RETURN")
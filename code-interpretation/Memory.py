@@ -1,40 +1,23 @@
+class Memory(object):
+    """Fixed-size storage for one activation, addressed by the slots Resolver assigns."""
 
-FUNCTION_MEMORY_PREFIX = "function"
-
-
-class Memory(dict):
-
-    def __init__(self, name, **kwargs):
-        super(Memory, self).__init__(**kwargs)
+    def __init__(self, name, size=0):
         self.name = name
+        self.slots = [None] * size
 
 
 class MemoryStack(object):
-                                                                             
+
     def __init__(self, memory=None):
         self.stack = [memory if memory else Memory("default")]
-
-    def get(self, name, default=None):
-        for memory in reversed(self.stack):
-            if name in memory:
-                return memory[name]
-            elif memory.name.startswith(FUNCTION_MEMORY_PREFIX):
-                break
-        return default
-
-    def insert(self, name, value):
-        self.stack[-1][name] = value
-
-    def set(self, name, value):
-        for memory in reversed(self.stack):
-            if name in memory:
-                memory[name] = value
-                return True
-            elif memory.name.startswith(FUNCTION_MEMORY_PREFIX):
-                return False
+        # slots of the innermost memory, kept at hand for indexed access
+        self.slots = self.stack[-1].slots
 
     def push(self, memory):
         self.stack.append(memory)
+        self.slots = memory.slots
 
     def pop(self):
-        return self.stack.pop()
+        memory = self.stack.pop()
+        self.slots = self.stack[-1].slots
+        return memory
@@ -0,0 +1,50 @@
+from operator import add, sub, div, mul, gt, ge, lt, le, eq, mod, ne, lshift, rshift, or_, and_, xor
+
+
+def logical_and(a, b):
+    return a and b
+
+
+def logical_or(a, b):
+    return a or b
+
+
+# Both operands are always evaluated before the operator is applied, so the
+# logical operators are plain functions rather than short-circuiting forms.
+BINARY_OPERATORS = {
+    '+': add,
+    '-': sub,
+    '/': div,
+    '*': mul,
+    '>': gt,
+    '>=': ge,
+    '<': lt,
+    '<=': le,
+    '==': eq,
+    '%': mod,
+    '!=': ne,
+    '&&': logical_and,
+    '||': logical_or,
+    '<<': lshift,
+    '>>': rshift,
+    '|': or_,
+    '&': and_,
+    '^': xor,
+}
+
+
+
+def resolve_operator(op):
+    """Returns the function applying op; Cparser sets it on every BinExpr it builds."""
+    operator = BINARY_OPERATORS.get(op)
+    if operator is None:
+        def operator(a, b):
+            print("Binary operator {} is not defined".format(op))
+    return operator
+
+
+OPERATOR_NAMES = sorted(BINARY_OPERATORS)
+
+# Dense table used by the bytecode, indexed by OPERATOR_INDEX[op]
+OPERATOR_TABLE = [BINARY_OPERATORS[op] for op in OPERATOR_NAMES]
+OPERATOR_INDEX = dict((op, index) for index, op in enumerate(OPERATOR_NAMES))
@@ -0,0 +1,175 @@
+#!/usr/bin/python
+import AST
+from Operators import BINARY_OPERATORS
+from TypeChecker import NodeVisitor, Result
+
+CONSTANT_TYPES = AST.ClassTable({AST.Integer: 'int', AST.Float: 'float', AST.String: 'string'})
+CONSTANT_CLASSES = {'int': AST.Integer, 'float': AST.Float, 'string': AST.String}
+
+# Operators whose result is never a bool or None, see Optimizer.simplify
+ARITHMETIC_OPERATORS = ('+', '-', '*', '/', '%', '<<', '>>')
+
+# Folding must not build values far larger than the source text
+MAX_FOLDED_SIZE = 4096
+
+
+class Optimizer(NodeVisitor):
+    """Rewrites the expressions of a checked program before it is run.
+
+    BinExprs over constants are folded for every operator of Types.RESULT_TYPES,
+    with the functions the engines apply at run time; GroupedExpressions are
+    dropped and identities that cannot change a printed value are simplified.
+    Every visit_ method produces the node replacing the visited one.
+    """
+
+    def optimize(self, program):
+        return self.visit(program)
+
+    def generic_visit(self, node, **kwargs):
+        # the NodeLists
+        children = []
+        for child in node.children:
+            children.append((yield child))
+        node.children = children
+        yield Result(node)
+
+    def visit_Program(self, node, **kwargs):
+        node.program_blocks = yield node.program_blocks
+        yield Result(node)
+
+    def visit_ProgramBlock(self, node, **kwargs):
+        node.block = yield node.block
+        yield Result(node)
+
+    def visit_FunctionExpression(self, node, **kwargs):
+        node.body = yield node.body
+        yield Result(node)
+
+    def visit_Argument(self, node, **kwargs):
+        return node
+
+    def visit_CompoundInstruction(self, node, **kwargs):
+        node.declarations = yield node.declarations
+        node.instructions = yield node.instructions
+        yield Result(node)
+
+    def visit_Declaration(self, node, **kwargs):
+        node.inits = yield node.inits
+        yield Result(node)
+
+    def visit_Init(self, node, **kwargs):
+        node.expr = yield node.expr
+        yield Result(node)
+
+    def visit_AssignmentInstruction(self, node, **kwargs):
+        node.expr = yield node.expr
+        yield Result(node)
+
+    def visit_PrintInstruction(self, node, **kwargs):
+        node.expr = yield node.expr
+        yield Result(node)
+
+    def visit_LabeledInstruction(self, node, **kwargs):
+        node.instr = yield node.instr
+        yield Result(node)
+
+    def visit_ChoiceInstruction(self, node, **kwargs):
+        node.condition = yield node.condition
+        node.action = yield node.action
+        if node.alternateAction is not None:
+            node.alternateAction = yield node.alternateAction
+        yield Result(node)
+
+    def visit_WhileInstruction(self, node, **kwargs):
+        node.condition = yield node.condition
+        node.instruction = yield node.instruction
+        yield Result(node)
+
+    def visit_RepeatInstruction(self, node, **kwargs):
+        node.instructions = yield node.instructions
+        node.condition = yield node.condition
+        yield Result(node)
+
+    def visit_ReturnInstruction(self, node, **kwargs):
+        node.expression = yield node.expression
+        yield Result(node)
+
+    def visit_BreakInstruction(self, node, **kwargs):
+        return node
+
+    def visit_ContinueInstruction(self, node, **kwargs):
+        return node
+
+    def visit_InvocationExpression(self, node, **kwargs):
+        node.args = yield node.args
+        yield Result(node)
+
+    def visit_GroupedExpression(self, node, **kwargs):
+        interior = yield node.interior
+        yield Result(interior)
+
+    def visit_Variable(self, node, **kwargs):
+        return node
+
+    def visit_Integer(self, node, **kwargs):
+        return node
+
+    def visit_Float(self, node, **kwargs):
+        return node
+
+    def visit_String(self, node, **kwargs):
+        return node
+
+    def visit_BinExpr(self, node, **kwargs):
+        node.left = yield node.left
+        node.right = yield node.right
+
+        folded = self.fold(node)
+        yield Result(folded if folded is not None else self.simplify(node))
+
+    def fold(self, node):
+        type_left = CONSTANT_TYPES[node.left.__class__]
+        type_right = CONSTANT_TYPES[node.right.__class__]
+        result_type = self.get_type(node.op, type_left, type_right)
+        if result_type is None:
+            return None
+
+        left, right = node.left.value, node.right.value
+        if node.op == '<<' and right > MAX_FOLDED_SIZE:
+            return None
+        if result_type == 'string' and node.op == '*' and len(left) * right > MAX_FOLDED_SIZE:
+            return None
+
+        try:
+            value = BINARY_OPERATORS[node.op](left, right)
+        except (ArithmeticError, ValueError):
+            # left for the run time to report
+            return None
+        return CONSTANT_CLASSES[result_type](node.line, value)
+
+    def simplify(self, node):
+        """Drops an operation that gives back its other operand unchanged.
+
+        The operand must itself be an arithmetic BinExpr: a variable or a call
+        may hold a bool (printed as True, not 1) or None, which x*1 would not.
+        """
+        op, left, right = node.op, node.left, node.right
+
+        if self.is_arithmetic(left) and (is_constant(right, 1) and op in ('*', '/') or
+                                         is_constant(right, 0) and op == '-' or
+                                         is_constant(right, "") and op == '+'):
+            return left
+
+        if self.is_arithmetic(right) and (is_constant(left, 1) and op == '*' or
+                                          is_constant(left, "") and op == '+'):
+            return right
+
+        return node
+
+    def is_arithmetic(self, node):
+        return isinstance(node, AST.BinExpr) and node.op in ARITHMETIC_OPERATORS
+
+
+def is_constant(node, value):
+    # 1.0 would turn an int into a float and True prints differently from 1
+    return isinstance(node, AST.Const) and node.value.__class__ is value.__class__ and node.value == value
@@ -0,0 +1,78 @@
+import atexit
+import sys
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+class Output(object):
+    """Sink for the values printed by PrintInstruction.
+
+    Lines are collected until buffer_size characters are pending and then
+    written to stream in one call; buffer_size=0 writes every line through, and
+    line_buffered also flushes the stream after each line. With flush_on_exit
+    the pending lines are written when the process exits, however it exits.
+    """
+
+    def __init__(self, stream, buffer_size=DEFAULT_BUFFER_SIZE, line_buffered=False, flush_on_exit=False):
+        self.stream = stream
+        self.buffer_size = 0 if line_buffered else buffer_size
+        self.line_buffered = line_buffered
+        self.pending = []
+        self.pending_size = 0
+        if flush_on_exit:
+            atexit.register(self.flush)
+
+    def print_value(self, value):
+        """Prints value as the Python print statement would."""
+        line = "%s\n" % (value,)
+        if not self.buffer_size:
+            self.stream.write(line)
+            if self.line_buffered:
+                self.stream.flush()
+            return
+
+        self.pending.append(line)
+        self.pending_size += len(line)
+        if self.pending_size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.stream.closed:
+            return
+        if self.pending:
+            self.stream.write("".join(self.pending))
+            del self.pending[:]
+            self.pending_size = 0
+        self.stream.flush()
+
+    def close(self):
+        self.flush()
+        if self.stream not in (sys.stdout, sys.stderr):
+            self.stream.close()
+
+
+class ListOutput(object):
+    """Collects the printed values, formatted as print would, in the list lines."""
+
+    def __init__(self, lines=None):
+        self.lines = [] if lines is None else lines
+
+    def print_value(self, value):
+        self.lines.append("%s" % (value,))
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def stdout_output():
+    """Writes every line straight to the current sys.stdout, like the print statement."""
+    return Output(sys.stdout, buffer_size=0)
+
+
+def open_output(filename=None, buffer_size=DEFAULT_BUFFER_SIZE, line_buffered=False, flush_on_exit=True):
+    """Returns an Output on filename, or on stdout when no filename is given, by default flushed at exit."""
+    stream = sys.stdout if filename is None else open(filename, "w")
+    return Output(stream, buffer_size, line_buffered, flush_on_exit)
@@ -0,0 +1,131 @@
+#!/usr/bin/python
+from TypeChecker import NodeVisitor
+
+
+class FunctionEffects(object):
+
+    def __init__(self, node):
+        self.node = node
+        self.has_side_effects = False
+        self.calls = set()
+
+
+class Purity(NodeVisitor):
+    """Finds the functions of a resolved program whose results depend only on their arguments.
+
+    A function is pure when it does not print, define functions, or read or
+    write a global variable, and calls only pure functions. Recursion is
+    allowed: functions start out pure and lose it until nothing changes.
+    """
+
+    def __init__(self):
+        super(Purity, self).__init__()
+
+        self.functions = {}
+        self.current = None
+
+    def analyze(self, program):
+        """Returns the pure AST.FunctionExpression nodes of program."""
+        self.visit(program)
+
+        pure = set(name for name, effects in self.functions.items() if not effects.has_side_effects)
+        changed = True
+        while changed:
+            changed = False
+            for name in list(pure):
+                if not self.functions[name].calls <= pure:
+                    pure.remove(name)
+                    changed = True
+
+        return set(self.functions[name].node for name in pure)
+
+    def impure(self):
+        if self.current is not None:
+            self.current.has_side_effects = True
+
+    def visit_Program(self, node, **kwargs):
+        yield node.program_blocks
+
+    def visit_ProgramBlock(self, node, **kwargs):
+        yield node.block
+
+    def visit_FunctionExpression(self, node, **kwargs):
+        self.impure()
+
+        enclosing = self.current
+        self.current = self.functions[node.name] = FunctionEffects(node)
+        yield node.body
+        self.current = enclosing
+
+    def visit_CompoundInstruction(self, node, **kwargs):
+        yield node.declarations
+        yield node.instructions
+
+    def visit_Declaration(self, node, **kwargs):
+        yield node.inits
+
+    def visit_Init(self, node, **kwargs):
+        yield node.expr
+        if node.is_global:
+            self.impure()
+
+    def visit_AssignmentInstruction(self, node, **kwargs):
+        yield node.expr
+        if node.is_global:
+            self.impure()
+
+    def visit_Variable(self, node, **kwargs):
+        # globals may change between two calls with the same arguments
+        if node.is_global:
+            self.impure()
+
+    def visit_InvocationExpression(self, node, **kwargs):
+        if self.current is not None:
+            self.current.calls.add(node.name)
+        yield node.args
+
+    def visit_PrintInstruction(self, node, **kwargs):
+        self.impure()
+        yield node.expr
+
+    def visit_BinExpr(self, node, **kwargs):
+        yield node.left
+        yield node.right
+
+    def visit_GroupedExpression(self, node, **kwargs):
+        yield node.interior
+
+    def visit_LabeledInstruction(self, node, **kwargs):
+        yield node.instr
+
+    def visit_ChoiceInstruction(self, node, **kwargs):
+        yield node.condition
+        yield node.action
+        if node.alternateAction is not None:
+            yield node.alternateAction
+
+    def visit_WhileInstruction(self, node, **kwargs):
+        yield node.condition
+        yield node.instruction
+
+    def visit_RepeatInstruction(self, node, **kwargs):
+        yield node.instructions
+        yield node.condition
+
+    def visit_ReturnInstruction(self, node, **kwargs):
+        yield node.expression
+
+    def visit_Integer(self, node, **kwargs):
+        pass
+
+    def visit_Float(self, node, **kwargs):
+        pass
+
+    def visit_String(self, node, **kwargs):
+        pass
+
+    def visit_BreakInstruction(self, node, **kwargs):
+        pass
+
+    def visit_ContinueInstruction(self, node, **kwargs):
+        pass
@@ -0,0 +1,54 @@
+import hashlib
+
+from Cache import LRUCache, MISSING
+from Output import stdout_output
+from PythonSource import PythonSource, ExpressionTooDeep, NAMESPACE, compile_source, names
+from Resolver import Resolver
+
+# code objects of the programs compiled last, by the SHA-1 of their source
+CODE_CACHE_SIZE = 64
+code_cache = LRUCache(CODE_CACHE_SIZE)
+
+
+class PythonCompiler(PythonSource):
+    """Translates a checked AST.Program into Python source run by CPython's own VM.
+
+    Globals and functions become module globals, as PythonSource writes them,
+    and the top-level code becomes the function program. The code object
+    compiled from the source is cached by its hash, so a program run again,
+    as the daemon and the batch runner do, is only translated.
+    """
+
+    def __init__(self, output=None):
+        super(PythonCompiler, self).__init__()
+        self.output = output if output is not None else stdout_output()
+
+    def translate(self, program):
+        """Returns the Python source of program, defining a function program that runs it."""
+        Resolver().resolve(program)
+        self.indent = 0
+        self.emit("def program():")
+        self.indent = 1
+        self.frame(range(program.global_size), 0, program.frame_size)
+        if program.global_size:
+            self.emit("{0} = None".format(names("g", range(program.global_size), " = ")))
+        self.indent = 0
+        self.block(program.program_blocks)
+        return "\n".join(self.lines) + "\n"
+
+    def compile(self, program):
+        """Returns a function running program, None when it is nested too deeply for Python to compile."""
+        try:
+            source = self.translate(program)
+        except (ExpressionTooDeep, RuntimeError):
+            return None
+        key = hashlib.sha1(source).hexdigest()
+        code = code_cache.get(key, MISSING)
+        if code is MISSING:
+            code = compile_source(source, "<program>")
+            code_cache.put(key, code)
+        if code is None:
+            return None
+        namespace = dict(NAMESPACE, _print=self.output.print_value)
+        exec code in namespace
+        return namespace['program']
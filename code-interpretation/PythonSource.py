@@ -0,0 +1,276 @@
+import AST
+from Operators import logical_and, logical_or
+from visit import *
+
+# Python precedence of the operators written infix; a comparison is never
+# chained, so one nested in another keeps its parentheses
+COMPARISON = 1
+PRECEDENCE = {
+    '<': COMPARISON, '<=': COMPARISON, '>': COMPARISON, '>=': COMPARISON, '==': COMPARISON, '!=': COMPARISON,
+    '|': 2, '^': 3, '&': 4, '<<': 5, '>>': 5, '+': 6, '-': 6, '*': 7, '/': 7, '%': 7,
+}
+ATOM = 8
+
+# both operands are evaluated, as by the interpreter, so these stay calls
+CALLED_OPERATORS = {'&&': '_and', '||': '_or'}
+
+# names the emitted source may use besides its own
+NAMESPACE = {'_and': logical_and, '_or': logical_or, '_inf': float('inf'), '_nan': float('nan')}
+
+# deepest expression written out; CPython 2 compiles one with a C stack
+# frame per level, crashing on deep enough ones, and operand recurses on it
+MAX_EXPRESSION_DEPTH = 2000
+
+EXPRESSIONS = (AST.Const, AST.Variable, AST.BinExpr, AST.GroupedExpression, AST.InvocationExpression)
+
+# fields holding the children of a node, in constructor order; a NodeList
+# keeps its own
+CHILD_FIELDS = AST.ClassTable({
+    AST.Program: ('program_blocks',),
+    AST.ProgramBlock: ('block',),
+    AST.Declaration: ('inits',),
+    AST.Init: ('expr',),
+    AST.PrintInstruction: ('expr',),
+    AST.LabeledInstruction: ('instr',),
+    AST.AssignmentInstruction: ('expr',),
+    AST.CompoundInstruction: ('declarations', 'instructions'),
+    AST.ChoiceInstruction: ('condition', 'action', 'alternateAction'),
+    AST.WhileInstruction: ('condition', 'instruction'),
+    AST.RepeatInstruction: ('instructions', 'condition'),
+    AST.ReturnInstruction: ('expression',),
+    AST.ContinueInstruction: (),
+    AST.BreakInstruction: (),
+    AST.Integer: (),
+    AST.Float: (),
+    AST.String: (),
+    AST.Variable: (),
+    AST.BinExpr: ('left', 'right'),
+    AST.GroupedExpression: ('interior',),
+    AST.InvocationExpression: ('args',),
+    AST.FunctionExpression: ('args', 'body'),
+    AST.Argument: (),
+})
+
+
+def names(prefix, slots, separator=", "):
+    return separator.join("{0}{1}".format(prefix, slot) for slot in slots)
+
+
+class ExpressionTooDeep(Exception):
+    """Raised for an expression nested deeper than MAX_EXPRESSION_DEPTH."""
+
+
+def child_nodes(node):
+    """Returns the children of node in constructor order, None for absent ones."""
+    fields = CHILD_FIELDS[node.__class__]
+    if fields is None:
+        return node.children
+    return [getattr(node, field) for field in fields]
+
+
+def find_nodes(node, cls):
+    """Yields the nodes of class cls in the tree under node."""
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, cls):
+            yield node
+        pending.extend(child for child in child_nodes(node) if child is not None)
+
+
+def compile_source(source, name):
+    """Returns the code object of source, None when Python cannot compile it."""
+    try:
+        # dont_inherit keeps '/' the classic division of the interpreter
+        return compile(source, name, "exec", 0, True)
+    except (SyntaxError, MemoryError, RuntimeError):
+        # blocks or parentheses nested deeper than Python's parser allows
+        return None
+
+
+class PythonSource(object):
+    """Writes the statements and expressions of a resolved AST as Python source.
+
+    Operators are written inline with the parentheses Python's precedence
+    needs, loops become Python loops and break and continue Python's own, a
+    Repeat testing its condition before it continues. Variables are written
+    as the Python names of their Resolver slots, globals g0, g1... and memory
+    slots l0, l1..., calls call the function's global and every function is a
+    def setting its locals to None on entry, as a new Memory is. LoopCompiler
+    overrides what differs for a loop run inside the Interpreter. An
+    expression deeper than MAX_EXPRESSION_DEPTH raises ExpressionTooDeep.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.indent = 1
+        # condition of every enclosing loop, innermost last, None for a While
+        self.loops = []
+
+    def emit(self, line):
+        self.lines.append("    " * self.indent + line)
+
+    def block(self, node):
+        start = len(self.lines)
+        self.indent += 1
+        self.statement(node)
+        if len(self.lines) == start:
+            self.emit("pass")
+        self.indent -= 1
+
+    def frame(self, global_slots, first, size):
+        """Emits the start of a function assigning the given globals, its locals from slot first on set to None."""
+        if global_slots:
+            self.emit("global " + names("g", global_slots))
+        if first < size:
+            self.emit("{0} = None".format(names("l", range(first, size), " = ")))
+
+    def variable(self, node):
+        """Returns the Python name of the variable node reads or assigns."""
+        return "{0}{1}".format("g" if node.is_global else "l", node.slot)
+
+    def assign(self, node, expression):
+        self.emit("{0} = {1}".format(self.variable(node), self.expression(expression)))
+
+    def invocation(self, node, arguments):
+        """Returns the expression calling the function of node with the sources of its arguments."""
+        return "g{0}({1})".format(node.slot, ", ".join(arguments))
+
+    def return_statement(self, node):
+        self.emit("return {0}".format(self.expression(node.expression)))
+
+    def function(self, node):
+        """Writes the definition of the function of node."""
+        nargs = len(node.args)
+        self.emit("def g{0}({1}):".format(node.slot, names("l", range(nargs))))
+        assigned = set(assignment.slot for assignment in find_nodes(node.body, (AST.Init, AST.AssignmentInstruction))
+                       if assignment.is_global)
+        self.indent += 1
+        self.frame(sorted(assigned), nargs, node.frame_size)
+        self.indent -= 1
+        self.block(node.body)
+
+    def statement(self, node):
+        if isinstance(node, EXPRESSIONS):
+            self.emit(self.expression(node))
+        else:
+            node.accept(self)
+
+    def expression(self, node, depth=0):
+        return self.operand(node, depth)[0]
+
+    def operand(self, node, depth=0):
+        """Returns the source of an expression depth levels down a statement and its Python precedence."""
+        if depth > MAX_EXPRESSION_DEPTH:
+            raise ExpressionTooDeep()
+        depth += 1
+        if isinstance(node, AST.GroupedExpression):
+            return self.operand(node.interior, depth)
+        if isinstance(node, AST.Variable):
+            return self.variable(node), ATOM
+        if isinstance(node, AST.Const):
+            return self.constant(node.value), ATOM
+        if isinstance(node, AST.InvocationExpression):
+            arguments = [self.expression(argument, depth) for argument in node.args.children]
+            return self.invocation(node, arguments), ATOM
+
+        if node.op in CALLED_OPERATORS:
+            return "{0}({1}, {2})".format(CALLED_OPERATORS[node.op], self.expression(node.left, depth),
+                                          self.expression(node.right, depth)), ATOM
+        precedence = PRECEDENCE[node.op]
+        left, left_precedence = self.operand(node.left, depth)
+        right, right_precedence = self.operand(node.right, depth)
+        # left-associative: an equal operator on the right was grouped in the source
+        if left_precedence < precedence or left_precedence == precedence == COMPARISON:
+            left = "(" + left + ")"
+        if right_precedence <= precedence:
+            right = "(" + right + ")"
+        return "{0} {1} {2}".format(left, node.op, right), precedence
+
+    def constant(self, value):
+        if value.__class__ is float and value - value != 0:
+            # inf and nan have no literal
+            if value != value:
+                return "_nan"
+            return "_inf" if value > 0 else "(-_inf)"
+        text = repr(value)
+        return "(" + text + ")" if text.startswith("-") else text
+
+    @on('node')
+    def visit(self, node):
+        for child in child_nodes(node):
+            if child is not None:
+                self.statement(child)
+
+    @when(AST.Declaration)
+    def visit(self, node):
+        node.inits.accept(self)
+
+    @when(AST.Init)
+    def visit(self, node):
+        self.assign(node, node.expr)
+
+    @when(AST.AssignmentInstruction)
+    def visit(self, node):
+        self.assign(node, node.expr)
+
+    @when(AST.PrintInstruction)
+    def visit(self, node):
+        self.emit("_print({0})".format(self.expression(node.expr)))
+
+    @when(AST.LabeledInstruction)
+    def visit(self, node):
+        self.statement(node.instr)
+
+    @when(AST.CompoundInstruction)
+    def visit(self, node):
+        node.declarations.accept(self)
+        node.instructions.accept(self)
+
+    @when(AST.ChoiceInstruction)
+    def visit(self, node):
+        self.emit("if {0}:".format(self.expression(node.condition)))
+        self.block(node.action)
+        if node.alternateAction:
+            self.emit("else:")
+            self.block(node.alternateAction)
+
+    @when(AST.WhileInstruction)
+    def visit(self, node):
+        self.emit("while {0}:".format(self.expression(node.condition)))
+        self.loops.append(None)
+        self.block(node.instruction)
+        self.loops.pop()
+
+    @when(AST.RepeatInstruction)
+    def visit(self, node):
+        condition = self.expression(node.condition)
+        self.emit("while True:")
+        self.loops.append(condition)
+        self.block(node.instructions)
+        self.loops.pop()
+        self.indent += 1
+        self.emit("if {0}:".format(condition))
+        self.emit("    break")
+        self.indent -= 1
+
+    @when(AST.BreakInstruction)
+    def visit(self, node):
+        self.emit("break")
+
+    @when(AST.ContinueInstruction)
+    def visit(self, node):
+        condition = self.loops[-1]
+        if condition is not None:
+            # a Repeat tests its condition before the next pass
+            self.emit("if {0}:".format(condition))
+            self.emit("    break")
+        self.emit("continue")
+
+    @when(AST.ReturnInstruction)
+    def visit(self, node):
+        self.return_statement(node)
+
+    @when(AST.FunctionExpression)
+    def visit(self, node):
+        self.function(node)
@@ -0,0 +1,172 @@
+#!/usr/bin/python
+from SymbolTable import SymbolTable, SlotSymbol
+from TypeChecker import NodeVisitor
+
+
+class Frame(object):
+    """Slot allocator for one activation: a function call or the top level.
+
+    Block scopes are flattened into the activation; a slot is reused once the
+    block that declared it is closed.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.max_size = 0
+
+    def allocate(self):
+        slot = self.size
+        self.size += 1
+        self.max_size = max(self.max_size, self.size)
+        return slot
+
+
+class Resolver(NodeVisitor):
+    """Binds every name of a checked program to a global index or a frame slot.
+
+    Annotates Variable, Init and AssignmentInstruction nodes with is_global and
+    slot, InvocationExpression and FunctionExpression with the global slot of the
+    function (plus frame_size for the latter), and the Program with global_size,
+    global_names and the frame_size of its top-level compound instructions.
+    """
+
+    def __init__(self):
+        super(Resolver, self).__init__()
+
+        self.table = SymbolTable(None, 'root')
+        self.global_names = []
+        self.frame = Frame()
+
+    def resolve(self, program):
+        self.visit(program)
+        return program
+
+    def declare_global(self, name):
+        symbol = SlotSymbol(name, True, len(self.global_names))
+        self.global_names.append(name)
+        self.table.put(name, symbol)
+        return symbol
+
+    def declare(self, name):
+        if self.table.parent is None:
+            return self.declare_global(name)
+
+        symbol = SlotSymbol(name, False, self.frame.allocate())
+        self.table.put(name, symbol)
+        return symbol
+
+    def lookup(self, name):
+        symbol = self.table.get(name)
+        if symbol is None:
+            # unknown names read as None, just like a missing global did
+            root = self.table
+            while root.parent is not None:
+                root = root.parent
+            symbol = SlotSymbol(name, True, len(self.global_names))
+            self.global_names.append(name)
+            root.put(name, symbol)
+        return symbol
+
+    def bind(self, node, symbol):
+        node.is_global = symbol.is_global
+        node.slot = symbol.slot
+
+    def visit_Program(self, node, **kwargs):
+        yield node.program_blocks
+        node.global_size = len(self.global_names)
+        node.global_names = self.global_names
+        node.frame_size = self.frame.max_size
+
+    def visit_ProgramBlock(self, node, **kwargs):
+        yield node.block
+
+    def visit_FunctionExpression(self, node, **kwargs):
+        node.slot = self.declare_global(node.name).slot
+
+        enclosing = self.frame
+        self.frame = Frame()
+        self.table = self.table.push_scope(node.name)
+
+        yield node.args
+        yield node.body
+        node.frame_size = self.frame.max_size
+
+        self.table = self.table.pop_scope()
+        self.frame = enclosing
+
+    def visit_Argument(self, node, **kwargs):
+        self.declare(node.name)
+
+    def visit_CompoundInstruction(self, node, **kwargs):
+        self.table = self.table.push_scope("inner_scope")
+        size = self.frame.size
+
+        yield node.declarations
+        yield node.instructions
+
+        self.frame.size = size
+        self.table = self.table.pop_scope()
+
+    def visit_Declaration(self, node, **kwargs):
+        yield node.inits
+
+    def visit_Init(self, node, **kwargs):
+        # the initializer still sees an outer variable of the same name
+        yield node.expr
+        self.bind(node, self.declare(node.name))
+
+    def visit_AssignmentInstruction(self, node, **kwargs):
+        yield node.expr
+        self.bind(node, self.lookup(node.id))
+
+    def visit_Variable(self, node, **kwargs):
+        self.bind(node, self.lookup(node.name))
+
+    def visit_InvocationExpression(self, node, **kwargs):
+        node.slot = self.lookup(node.name).slot
+        yield node.args
+
+    def visit_BinExpr(self, node, **kwargs):
+        yield node.left
+        yield node.right
+
+    def visit_GroupedExpression(self, node, **kwargs):
+        yield node.interior
+
+    def visit_PrintInstruction(self, node, **kwargs):
+        yield node.expr
+
+    def visit_LabeledInstruction(self, node, **kwargs):
+        yield node.instr
+
+    def visit_ChoiceInstruction(self, node, **kwargs):
+        yield node.condition
+        yield node.action
+        if node.alternateAction is not None:
+            yield node.alternateAction
+
+    def visit_WhileInstruction(self, node, **kwargs):
+        yield node.condition
+        yield node.instruction
+
+    def visit_RepeatInstruction(self, node, **kwargs):
+        yield node.instructions
+        yield node.condition
+
+    def visit_ReturnInstruction(self, node, **kwargs):
+        yield node.expression
+
+    def visit_Integer(self, node, **kwargs):
+        pass
+
+    def visit_Float(self, node, **kwargs):
+        pass
+
+    def visit_String(self, node, **kwargs):
+        pass
+
+    def visit_BreakInstruction(self, node, **kwargs):
+        pass
+
+    def visit_ContinueInstruction(self, node, **kwargs):
+        pass
@@ -0,0 +1,105 @@
+"""Session serving the requests of Daemon.py, batch.py and client.py.
+
+A request names a command, parse, check, translate or run, with the
+arguments of main.py; the reply holds what main.py would have printed and
+its exit status.
+"""
+import os
+import sys
+import traceback
+from StringIO import StringIO
+
+import paths  # puts ../shared on sys.path
+from TableCache import build_parser
+from Cparser import Cparser
+from TypeChecker import TypeChecker
+from TreePrinter import TreePrinter
+from Instrumentation import Stats, phase
+from main import argument_parser, parse_arguments, run_program
+
+COMMANDS = ('parse', 'check', 'translate', 'run')
+
+
+class Session(object):
+    """Parser built once and reused for every request."""
+
+    def __init__(self):
+        self.cparser = Cparser()
+        self.parser = build_parser(self.cparser)
+        self.arg_parser = argument_parser()
+
+    def parse(self, stats=None):
+        """Parses the input the scanner was given, timing it into stats if given."""
+        if stats is None:
+            return self.parser.parse(lexer=self.cparser.scanner)
+        return stats.parse(self.parser, self.cparser.scanner)
+
+    def handle(self, request):
+        """Serves one request, returning its reply."""
+        return self.capture(self.dispatch, request)
+
+    def capture(self, function, *arguments):
+        """Calls function, returning its status with what it printed as a reply."""
+        stdout, stderr = StringIO(), StringIO()
+        streams = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = stdout, stderr
+        try:
+            status = function(*arguments)
+        except SystemExit as exit:
+            # argparse rejecting the arguments
+            status = exit.code
+        except Exception:
+            traceback.print_exc()
+            status = 1
+        finally:
+            sys.stdout, sys.stderr = streams
+        return {'status': status, 'stdout': stdout.getvalue(), 'stderr': stderr.getvalue()}
+
+    def dispatch(self, request):
+        command = request.get('command', 'run')
+        if command not in COMMANDS:
+            sys.stderr.write("Unknown command {0}, expected one of {1}\n".format(command, ", ".join(COMMANDS)))
+            return 2
+
+        args = parse_arguments(self.arg_parser, request.get('arguments', []))
+        return self.execute(command, args, request.get('cwd', os.getcwd()), request.get('source'))
+
+    def execute(self, command, args, directory, text=None):
+        """Runs command on text, or on the file args.filename, with paths relative to directory."""
+        for name in ('output', 'profile_file', 'collapsed'):
+            if getattr(args, name) is not None:
+                setattr(args, name, os.path.join(directory, getattr(args, name)))
+
+        stats = Stats() if args.stats else None
+        scanner = self.cparser.scanner
+        if text is None:
+            try:
+                file = open(os.path.join(directory, args.filename), "r")
+            except IOError:
+                print("Cannot open {0} file".format(args.filename))
+                return 0
+            with file:
+                scanner.input_source(file, args.stream)
+                try:
+                    ast = self.parse(stats)
+                finally:
+                    scanner.close()
+        else:
+            scanner.input(text.encode('utf-8') if isinstance(text, unicode) else text)
+            ast = self.parse(stats)
+
+        status = 0
+        if command == 'run':
+            status = run_program(ast, args, flush_on_exit=False, stats=stats)
+        elif command == 'translate' and ast:
+            sys.stdout.write(ast.printTree())
+        elif command == 'check' and ast:
+            type_checker = TypeChecker()
+            if stats is not None:
+                stats.count_lookups(type_checker)
+            with phase(stats, 'check'):
+                type_checker.visit(ast)
+
+        if stats is not None:
+            stats.write(args.stats_file and os.path.join(directory, args.stats_file))
+        return status
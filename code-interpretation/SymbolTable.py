@@ -15,29 +15,62 @@ class FunctionSymbol(Symbol):
         self.args = args
 
 
+class SlotSymbol(Symbol):
+    def __init__(self, name, is_global, slot):
+        self.name = name
+        self.is_global = is_global
+        self.slot = slot
+
+
 class SymbolTable(object):
+    """One scope of a chain of nested scopes.
+
+    The root table of a chain keeps a stack per name of the open scopes
+    binding it, innermost last, which the scopes pushed from it share: get is
+    a single lookup however deep the chain is, and tables built apart never
+    see each other's names. Lookups answer for the scope they are made on,
+    passing over the scopes still open inside it. A scope must be popped
+    before its parent binds names again.
+    """
+
     def __init__(self, parent, name):
         self.parent = parent
         self.name = name
         self.symbols = {}
+        if parent is None:
+            self.depth = 0
+            self.bindings = {}
+        else:
+            self.depth = parent.depth + 1
+            self.bindings = parent.bindings
+
+    def visible(self, scopes):
+        """Returns how many of the scopes binding a name are this one or enclose it."""
+        position = len(scopes)
+        while position and scopes[position - 1].depth > self.depth:
+            position -= 1
+        return position
 
     def put(self, name, symbol):
+        if name not in self.symbols:
+            scopes = self.bindings.setdefault(name, [])
+            # an outer scope may still bind a name shadowed further in
+            scopes.insert(self.visible(scopes), self)
         self.symbols[name] = symbol
 
-    def has_scope_name(self, name):
-        if self.name == name:
-            return True
-
-        if self.parent:
-            return self.parent.has_scope_name(name)
-
-        return False
-
     def get(self, name):
-        return self.symbols.get(name, self.parent.get(name) if self.parent else None)
+        scopes = self.bindings.get(name)
+        if not scopes:
+            return None
+        position = self.visible(scopes)
+        if not position:
+            return None
+        return scopes[position - 1].symbols[name]
 
     def push_scope(self, name):
-        return SymbolTable(self, name)
+        return self.__class__(self, name)
 
     def pop_scope(self):
+        for name in self.symbols:
+            self.bindings[name].pop()
         return self.parent
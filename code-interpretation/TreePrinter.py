@@ -18,6 +18,10 @@ class TreePrinter:
     def printTree(self, indent=0):
         return "| " * indent + str(self.value) + "\n"
 
+    @addToClass(AST.Variable)
+    def printTree(self, indent=0):
+        return "| " * indent + str(self.name) + "\n"
+
     @addToClass(AST.ExpressionList)
     def printTree(self, indent=0):
         return "".join(x.printTree(indent+1) for x in self.children)
@@ -55,7 +59,7 @@ class TreePrinter:
 
     @addToClass(AST.DeclarationList)
     def printTree(self, indent=0):
-        return "".join(x.printTree(indent) for x in self.declarations)
+        return "".join(x.printTree(indent) for x in self.children)
 
     @addToClass(AST.Declaration)
     def printTree(self, indent=0):
@@ -0,0 +1,108 @@
+from Compiler import *
+from Operators import OPERATOR_TABLE
+from Output import stdout_output
+
+
+# Value slots all active calls may hold together, see VirtualMachine
+DEFAULT_STACK_BUDGET = 4 * 1024 * 1024
+
+
+class StackOverflow(RuntimeError):
+    pass
+
+
+class VirtualMachine(object):
+    """Stack machine running the CodeObjects produced by Compiler.
+
+    Globals live in a list indexed like the shared name pool, locals in a flat
+    list per call. Calls do not recurse in Python: the caller's state is kept
+    on an explicit call stack, so user-level recursion is only bounded by
+    stack_budget, the number of value slots the active calls may hold (each
+    call costs its locals plus one for the saved caller).
+    """
+
+    def __init__(self, output=None, stack_budget=DEFAULT_STACK_BUDGET):
+        self.output = output if output is not None else stdout_output()
+        self.stack_budget = stack_budget
+        self.globals = []
+
+    def run(self, program):
+        self.globals = [None] * len(program.names)
+        return self.execute(program)
+
+    def execute(self, function):
+        code = function.code
+        constants = function.constants
+        frame = [None] * function.nlocals
+        global_memory = self.globals
+        operators = OPERATOR_TABLE
+        print_value = self.output.print_value
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        pc = 0
+
+        # suspended callers as (function, pc, frame, stack)
+        calls = []
+        budget = self.stack_budget - function.nlocals - 1
+
+        while True:
+            opcode = code[pc]
+            arg = code[pc + 1]
+            pc += 2
+
+            if opcode == LOAD_LOCAL:
+                push(frame[arg])
+            elif opcode == LOAD_CONST:
+                push(constants[arg])
+            elif opcode == BINARY_OP:
+                right = pop()
+                stack[-1] = operators[arg](stack[-1], right)
+            elif opcode == POP_JUMP_IF_FALSE:
+                if not pop():
+                    pc = arg
+            elif opcode == STORE_LOCAL:
+                frame[arg] = pop()
+            elif opcode == LOAD_GLOBAL:
+                push(global_memory[arg])
+            elif opcode == JUMP:
+                pc = arg
+            elif opcode == STORE_GLOBAL:
+                global_memory[arg] = pop()
+            elif opcode == CALL:
+                callee = global_memory[arg]
+                budget -= callee.nlocals + 1
+                if budget < 0:
+                    raise StackOverflow("Call of {0} exceeds the stack budget of {1} slots at depth {2}".format(
+                        callee.name, self.stack_budget, len(calls) + 1))
+
+                callee_frame = [None] * callee.nlocals
+                nargs = callee.nargs
+                if nargs:
+                    callee_frame[:nargs] = stack[-nargs:]
+                    del stack[-nargs:]
+
+                calls.append((function, pc, frame, stack))
+                function, pc, frame, stack = callee, 0, callee_frame, []
+                code = function.code
+                constants = function.constants
+                push = stack.append
+                pop = stack.pop
+            elif opcode == RETURN_VALUE:
+                value = pop()
+                if not calls:
+                    return value
+
+                budget += function.nlocals + 1
+                function, pc, frame, stack = calls.pop()
+                code = function.code
+                constants = function.constants
+                push = stack.append
+                pop = stack.pop
+                push(value)
+            elif opcode == PRINT:
+                print_value(pop())
+            elif opcode == POP_TOP:
+                pop()
+            else:
+                raise RuntimeError("Unknown opcode {0} at {1} in {2}".format(opcode, pc - 2, function.name))
@@ -0,0 +1,120 @@
+"""Checks or runs many source files across a pool of worker processes.
+
+    python batch.py [--command run] [--jobs N] [--order input] [--manifest FILE]
+                    [--pattern GLOB] [main.py options] SOURCE...
+
+A SOURCE is a file, a glob or a directory searched recursively for files
+matching --pattern; a manifest lists one path per line, relative to the
+manifest. Every worker builds the parser once and serves its files as the
+daemon serves requests. For each file, what main.py would print follows a
+header with its exit status and the time the worker spent on it; results
+stream back in input order or, with --order completion, as they finish.
+"""
+import argparse
+import fnmatch
+import glob
+import multiprocessing
+import os
+import sys
+import time
+
+from Session import Session, COMMANDS
+from main import add_run_arguments, parse_arguments
+
+# the worker's Session and the command and options every file is served with
+worker = None
+
+
+def start_worker(command, args):
+    global worker
+    worker = (Session(), command, args)
+
+
+def serve_file(path):
+    session, command, args = worker
+    start = time.time()
+    reply = session.capture(session.execute, command, argparse.Namespace(filename=path, **vars(args)), os.getcwd())
+    return path, reply, time.time() - start
+
+
+def collect(sources, manifest=None, pattern="*"):
+    """Returns the files named by sources and the manifest, in order and without repeats."""
+    names = []
+    if manifest is not None:
+        directory = os.path.dirname(manifest)
+        with open(manifest, "r") as lines:
+            for line in lines:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    names.append(os.path.join(directory, line))
+    names.extend(sources)
+
+    paths = []
+    for name in names:
+        if os.path.isdir(name):
+            for directory, subdirectories, files in os.walk(name):
+                subdirectories.sort()
+                paths.extend(os.path.join(directory, file) for file in sorted(fnmatch.filter(files, pattern)))
+        elif glob.has_magic(name):
+            paths.extend(sorted(glob.glob(name)))
+        else:
+            paths.append(name)
+
+    seen = set()
+    return [path for path in paths if not (path in seen or seen.add(path))]
+
+
+def report(path, reply, seconds, stream=sys.stdout):
+    stream.write("==> {0} [status {1}, {2:.3f}s]\n".format(path, reply['status'], seconds))
+    stream.write(reply['stdout'])
+    if reply['stderr']:
+        stream.write(reply['stderr'])
+        if not reply['stderr'].endswith("\n"):
+            stream.write("\n")
+    stream.flush()
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("sources", nargs="*", metavar="SOURCE")
+    arg_parser.add_argument("--command", choices=COMMANDS, default="run")
+    arg_parser.add_argument("--jobs", type=int, default=multiprocessing.cpu_count(),
+                            help="worker processes, by default one per CPU")
+    arg_parser.add_argument("--order", choices=("input", "completion"), default="input",
+                            help="report the files in the order given or as they finish")
+    arg_parser.add_argument("--manifest", metavar="FILE", help="file listing one source path per line")
+    arg_parser.add_argument("--pattern", default="*", help="files to take from a SOURCE directory")
+    add_run_arguments(arg_parser)
+    args = parse_arguments(arg_parser)
+    if args.output is not None:
+        arg_parser.error("--output is not supported, the output of every file is reported separately")
+    if args.stats_file is not None:
+        arg_parser.error("--stats-file is not supported, use --stats to report every file on its own")
+    if args.profile_file is not None or args.collapsed is not None:
+        arg_parser.error("--profile-file and --collapsed are not supported, every profile is reported with its file")
+
+    paths = collect(args.sources, args.manifest, args.pattern)
+    run_args = argparse.Namespace(**dict((name, value) for name, value in vars(args).items()
+                                         if name not in ("sources", "command", "jobs", "order", "manifest",
+                                                         "pattern")))
+
+    start = time.time()
+    pool = multiprocessing.Pool(max(1, args.jobs), start_worker, (args.command, run_args))
+    try:
+        results = pool.imap if args.order == "input" else pool.imap_unordered
+        failed = 0
+        busy = 0.0
+        for path, reply, seconds in results(serve_file, paths):
+            report(path, reply, seconds)
+            failed += reply['status'] != 0
+            busy += seconds
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+    sys.stderr.write("{0} files, {1} failed, {2:.3f}s in workers, {3:.3f}s elapsed\n".format(
+        len(paths), failed, busy, time.time() - start))
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,65 @@
+"""Measures the memory taken by the AST of a large synthetic program.
+
+Reports the object tree (nodes, child lists and instance dicts, if any) and
+the same tree encoded by FlatAST, and times the TypeChecker and the
+Interpreter on both layouts. Run from the code-interpretation directory:
+
+    python benchmarks/bench_ast_memory.py [--lines 100000]
+"""
+import argparse
+import resource
+import sys
+import time
+
+from common import parse, check, best_of
+from programs import generate
+from FlatAST import encode
+from Interpreter import Interpreter
+from PythonSource import child_nodes
+from TypeChecker import TypeChecker
+
+
+def tree_size(root):
+    """Returns the node count and the bytes held by the nodes and their containers."""
+    count, size = 0, 0
+    pending = [root]
+    while pending:
+        node = pending.pop()
+        count += 1
+        size += sys.getsizeof(node)
+        if hasattr(node, '__dict__'):
+            size += sys.getsizeof(node.__dict__)
+        children = child_nodes(node)
+        if isinstance(children, list):
+            size += sys.getsizeof(children)
+        pending.extend(child for child in children if child is not None)
+    return count, size
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--lines", type=int, default=100000)
+    args = arg_parser.parse_args()
+
+    source = generate(args.lines)
+    start = time.time()
+    ast = check(parse(source))
+    print("parse+check {0:>10.2f}s".format(time.time() - start))
+
+    nodes, size = tree_size(ast)
+    print("nodes       {0:>10}".format(nodes))
+    print("tree        {0:>10.1f} MB  {1:>6.1f} B/node".format(size / 1e6, float(size) / nodes))
+
+    start = time.time()
+    flat = encode(ast)
+    print("flat encode {0:>10.2f}s".format(time.time() - start))
+    pool = sum(sys.getsizeof(value) for value in flat.pool) + sys.getsizeof(flat.pool)
+    print("flat        {0:>10.1f} MB  {1:>6.1f} B/node, pool of {2} values {3:.1f} MB".format(
+        flat.nbytes() / 1e6, float(flat.nbytes()) / nodes, len(flat.pool), pool / 1e6))
+
+    for layout, root in (("tree", ast), ("flat", flat.root())):
+        print("check {0}  {1:>10.2f}s".format(layout, best_of(lambda: TypeChecker().visit(root), 1)))
+        print("run {0}    {1:>10.2f}s".format(layout, best_of(lambda: root.accept(Interpreter()), 1)))
+
+    # kilobytes on Linux
+    print("max rss     {0:>10.1f} MB".format(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3))
@@ -0,0 +1,80 @@
+"""Requests per second of the daemon against starting main.py for every program.
+
+The daemon is started on a temporary socket; each request then runs the
+program through client.py (a fresh, parser-free process) or straight through
+the socket from this process, which leaves only the serving time. Run from the
+code-interpretation directory:
+
+    python benchmarks/bench_daemon.py [--requests 20] [--mode interpreter]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import common  # puts code-interpretation on sys.path
+from bench_example import FUNCTIONS
+from client import send
+from Daemon import SOCKET_VARIABLE
+
+PROGRAM = FUNCTIONS + """
+print fib(12);
+print fact2(10);
+"""
+
+
+def rate(function, requests):
+    start = time.time()
+    for _ in range(requests):
+        function()
+    return requests / (time.time() - start)
+
+
+def wait_for(path, process, timeout=30.0):
+    deadline = time.time() + timeout
+    while not os.path.exists(path):
+        if process.poll() is not None or time.time() > deadline:
+            raise RuntimeError("daemon did not start")
+        time.sleep(0.05)
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--requests", type=int, default=20)
+    arg_parser.add_argument("--mode", default="interpreter")
+    args = arg_parser.parse_args()
+
+    workspace = tempfile.mkdtemp()
+    try:
+        program = os.path.join(workspace, "program.txt")
+        with open(program, "w") as program_file:
+            program_file.write(PROGRAM)
+        path = os.path.join(workspace, "daemon.sock")
+        environment = dict(os.environ)
+        environment[SOCKET_VARIABLE] = path
+        arguments = ["--mode", args.mode, program]
+
+        with open(os.devnull, "w") as devnull:
+            def command_line(script):
+                subprocess.check_call([sys.executable, script] + arguments, env=environment, stdout=devnull)
+
+            daemon = subprocess.Popen([sys.executable, "Daemon.py"], env=environment)
+            try:
+                wait_for(path, daemon)
+                request = {'command': 'run', 'arguments': arguments, 'cwd': os.getcwd()}
+                results = [
+                    ("main.py", rate(lambda: command_line("main.py"), args.requests)),
+                    ("client.py", rate(lambda: command_line("client.py"), args.requests)),
+                    ("socket", rate(lambda: send(path, request), args.requests)),
+                ]
+            finally:
+                daemon.terminate()
+                daemon.wait()
+
+        for name, requests_per_second in results:
+            print("{0:<12} {1:>8.1f} requests/s".format(name, requests_per_second))
+    finally:
+        shutil.rmtree(workspace)
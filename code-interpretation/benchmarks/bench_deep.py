@@ -0,0 +1,56 @@
+"""Compares the engines on deep user recursion and long left-nested BinExpr chains.
+
+The interpreter, the closures and the Python source recurse in Python, so
+they hit the recursion limit where the vm, which keeps its calls on an
+explicit stack, keeps going. Run from the code-interpretation directory:
+
+    python benchmarks/bench_deep.py [--repeat 3]
+"""
+import argparse
+
+from common import parse, check, best_of
+from main import MODES
+
+SUM = """
+int sum(int n) {
+    if (n == 0) {
+        return 0;
+    }
+    return n + sum(n - 1);
+}
+print sum(%d);
+"""
+
+CHAIN = """
+int x = 1, i = 0, s = 0;
+while (i < 100) {
+    s = %s;
+    i = i + 1;
+}
+print s;
+"""
+
+DEPTHS = (500, 2000, 100000)
+LENGTHS = (100, 1000, 2500)
+
+
+def timing(mode, ast, repeat):
+    try:
+        return "{0:>8.3f}s".format(best_of(lambda: MODES[mode](ast), repeat))
+    except RuntimeError:
+        return "{0:>9}".format("overflow")
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    workloads = [("sum(%d)" % depth, SUM % depth) for depth in DEPTHS]
+    workloads += [("chain(%d)" % length, CHAIN % " + ".join(["x"] * length)) for length in LENGTHS]
+
+    print("{0:<12}".format("") + "".join("{0:>12}".format(mode) for mode in sorted(MODES)))
+    for name, source in workloads:
+        ast = check(parse(source))
+        print("{0:<12}".format(name) + "".join("{0:>12}".format(timing(mode, ast, args.repeat))
+                                                for mode in sorted(MODES)))
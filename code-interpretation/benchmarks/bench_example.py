@@ -0,0 +1,71 @@
+"""Times the interpreter on the fib, fact2 and loop code from example.txt.
+
+Run from the code-interpretation directory:
+
+    python benchmarks/bench_example.py [--mode interpreter] [--repeat 3]
+"""
+import argparse
+
+from common import parse, check, best_of
+from main import MODES
+
+FUNCTIONS = """
+int fact2(int x) {
+    int c = 1, res = 1;
+
+    repeat
+        res = res * c;
+        c = c + 1;
+    until c > x;
+    return res;
+}
+
+int fib(int nth){
+    if(nth <= 1){
+        return 1;
+    } else {
+        return fib(nth-1) + fib(nth-2);
+    }
+}
+"""
+
+WORKLOADS = [
+    ("fib", FUNCTIONS + "print fib(18);"),
+    ("fact2", FUNCTIONS + """
+int i = 0;
+while (i < 2000) {
+    fact2(20);
+    i = i + 1;
+}
+"""),
+    ("loops", FUNCTIONS + """
+int a = 0, n = 0;
+while (n < 200) {
+    a = 0;
+    while(a < 100 ) {
+        if(a==15)
+            break;
+        a = a + 1;
+    }
+    a = 0;
+    repeat {
+        a = a + 1;
+        if(a%5!=0)
+            continue;
+    } until (a>100);
+    n = n + 1;
+}
+"""),
+]
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--mode", choices=sorted(MODES), default="interpreter")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    for name, source in WORKLOADS:
+        ast = check(parse(source))
+        seconds = best_of(lambda: MODES[args.mode](ast), args.repeat)
+        print("{0:<8} {1:>8.3f}s".format(name, seconds))
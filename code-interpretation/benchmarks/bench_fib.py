@@ -0,0 +1,36 @@
+"""Times recursive fib, where every call ends in a return from nested blocks.
+
+Run from the code-interpretation directory:
+
+    python benchmarks/bench_fib.py [--n 20] [--repeat 3]
+"""
+import argparse
+
+from common import parse, check, best_of
+from main import MODES
+
+FIB = """
+int fib(int n) {
+    if (n <= 1) {
+        return n;
+    } else {
+        while (1) {
+            return fib(n - 1) + fib(n - 2);
+        }
+    }
+    return 0;
+}
+print fib(%d);
+"""
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--n", type=int, default=20)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    ast = check(parse(FIB % args.n))
+    for mode in sorted(MODES):
+        seconds = best_of(lambda: MODES[mode](ast), args.repeat)
+        print("{0:<12} {1:>8.3f}s".format(mode, seconds))
@@ -0,0 +1,97 @@
+"""Peak memory and time of lexing a large source read whole, mapped or in chunks.
+
+For every size a synthetic program is written to a temporary file and lexed
+in a fresh process for each way of reading it: file.read() as before,
+map_file as main.py does, and Scanner.input_file as main.py --stream does. Mapped pages the lexer
+has touched count towards the peak RSS, though the kernel can drop them at
+any time; the private (anonymous) memory left at the end is reported
+separately where /proc gives it. Run from the code-interpretation directory:
+
+    python benchmarks/bench_mmap.py [--sizes 10,100,1000]
+
+with the sizes in MB; lexing runs at a few MB per second, so 1000 takes long.
+"""
+import argparse
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import common  # puts code-interpretation on sys.path
+from programs import CHUNK
+from scanner import Scanner, map_file
+
+METHODS = ('read', 'mmap', 'chunks')
+
+
+def write_program(path, size):
+    """Writes a type-correct program of at least size bytes to path."""
+    written, n = 0, 0
+    with open(path, "w") as file:
+        while written < size:
+            chunk = CHUNK.format(n)
+            file.write(chunk)
+            written += len(chunk)
+            n += 1
+
+
+def private_memory():
+    # kilobytes of anonymous memory, Linux only
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("RssAnon:"):
+                    return int(line.split()[1])
+    except IOError:
+        pass
+    return None
+
+
+def lex(method, path):
+    """Lexes the file at path; returns the token count, seconds, peak and private memory in kB."""
+    scanner = Scanner()
+    scanner.build()
+    start = time.time()
+    with open(path, "r") as file:
+        if method == 'read':
+            scanner.input(file.read())
+        elif method == 'mmap':
+            scanner.input(map_file(file))
+        else:
+            scanner.input_file(file)
+        tokens = 0
+        while scanner.token() is not None:
+            tokens += 1
+        seconds = time.time() - start
+        return tokens, seconds, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, private_memory()
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--sizes", default="10,100,1000", help="comma separated source sizes in MB")
+    arg_parser.add_argument("--lex", nargs=2, metavar=("METHOD", "FILE"), help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.lex:
+        print(" ".join(str(value) for value in lex(*args.lex)))
+        sys.exit(0)
+
+    workspace = tempfile.mkdtemp()
+    try:
+        print("{0:>8} {1:>7} {2:>10} {3:>9} {4:>12} {5:>13}".format(
+            "size", "method", "tokens", "time", "peak rss", "private end"))
+        for size in [int(size) for size in args.sizes.split(",")]:
+            path = os.path.join(workspace, "program.txt")
+            write_program(path, size << 20)
+            for method in METHODS:
+                output = subprocess.check_output([sys.executable, os.path.abspath(__file__), "--lex", method, path])
+                tokens, seconds, peak, private = output.split()
+                private = "{0:.1f} MB".format(int(private) / 1e3) if private != "None" else "-"
+                print("{0:>5} MB {1:>7} {2:>10} {3:>8.2f}s {4:>9.1f} MB {5:>13}".format(
+                    size, method, tokens, float(seconds), int(peak) / 1e3, private))
+                sys.stdout.flush()
+    finally:
+        shutil.rmtree(workspace)
@@ -0,0 +1,54 @@
+"""Times the start of each front end with an empty and with a warm table cache.
+
+Every run is a fresh interpreter process on a one-line program, so the time is
+dominated by building (or loading) the lexer and parser tables. Run from the
+code-interpretation directory:
+
+    python benchmarks/bench_startup.py [--repeat 5]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import common  # puts code-interpretation on sys.path
+from TableCache import DIRECTORY_VARIABLE
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir)
+FRONT_ENDS = ("code-interpretation", "syntax-checker", "translator")
+PROGRAM = "int a = 1;\nprint a;\n"
+
+
+def start(front_end, program, directory):
+    environment = dict(os.environ)
+    environment[DIRECTORY_VARIABLE] = directory
+    begin = time.time()
+    with open(os.devnull, "w") as devnull:
+        subprocess.check_call([sys.executable, "main.py", program], cwd=os.path.join(ROOT, front_end),
+                              env=environment, stdout=devnull, stderr=devnull)
+    return time.time() - begin
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    workspace = tempfile.mkdtemp()
+    try:
+        program = os.path.join(workspace, "program.txt")
+        with open(program, "w") as program_file:
+            program_file.write(PROGRAM)
+
+        for front_end in FRONT_ENDS:
+            cold, warm = [], []
+            for run in range(args.repeat):
+                directory = os.path.join(workspace, "tables{0}".format(run))
+                cold.append(start(front_end, program, directory))
+                warm.append(start(front_end, program, directory))
+            print("{0:<20} cold {1:>7.3f}s  warm {2:>7.3f}s".format(front_end, min(cold), min(warm)))
+    finally:
+        shutil.rmtree(workspace)
@@ -0,0 +1,118 @@
+"""Times the interpreter's BinExprs with generic and with type-specific operators.
+
+Cparser sets every BinExpr to the generic function of its operator
+(operator.add for '+'). The alternative measured here looks the operand types
+the TypeChecker found up in Types.RESULT_TYPES's index and, for int op int and
+float op float, sets the unbound method of the type instead (int.__add__).
+
+Run from the code-interpretation directory:
+
+    python benchmarks/bench_typed_operators.py [--n 20] [--repeat 5]
+
+Python 2.7.18, on the machine the change was made on (--repeat 15; the best
+times moved by up to a third between runs):
+
+    workload        generic      typed
+    fib              0.196s     0.211s
+    int-loop         0.645s     0.668s
+    float-loop       0.421s     0.426s
+
+The typed operators never win beyond that noise and lose on the float loop in
+every run: a slot wrapper such as float.__add__ checks its self argument on
+each call, which the operator module's functions skip by going straight to the
+number protocol. The interpreter therefore keeps the generic operators.
+"""
+import argparse
+
+from common import parse, check, best_of
+from Interpreter import Interpreter
+from Types import type_index, TABLE_SIZE
+from TypeChecker import TypeChecker, Result
+
+FIB = """
+int fib(int n) {
+    if (n <= 1) {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+print fib(%d);
+"""
+
+INT_LOOP = """
+int i = 0, total = 0;
+while (i < %d) {
+    total = total + i * 3 - i / 2;
+    i = i + 1;
+}
+print total;
+"""
+
+FLOAT_LOOP = """
+int i = 0;
+float x = 0.5, total = 0.0;
+while (i < %d) {
+    total = total + x * 1.5 - x / 4.0;
+    i = i + 1;
+}
+print total;
+"""
+
+# operator and operand types -> the type's own implementation
+TYPED_OPERATORS = [None] * TABLE_SIZE
+for type_name, cls in (('int', int), ('float', float)):
+    for op, method in (('+', '__add__'), ('-', '__sub__'), ('*', '__mul__'), ('/', '__div__'),
+                       ('<', '__lt__'), ('>', '__gt__'), ('<=', '__le__'), ('>=', '__ge__'),
+                       ('==', '__eq__'), ('!=', '__ne__')):
+        # int of Python 2 compares through __cmp__, without methods of its own
+        if method in cls.__dict__:
+            TYPED_OPERATORS[type_index(op, type_name, type_name)] = cls.__dict__[method]
+
+
+class OperandTypes(TypeChecker):
+    """TypeChecker recording the operand types of every BinExpr."""
+
+    def __init__(self):
+        super(OperandTypes, self).__init__()
+        self.operands = []
+
+    def visit_BinExpr(self, node, **kwargs):
+        type_left = yield node.left
+        type_right = yield node.right
+        self.operands.append((node, type_left, type_right))
+        yield Result(self.get_type(node.op, type_left, type_right))
+
+
+def interpret(ast):
+    """Runs ast with every loop left to the visits, where the BinExprs are evaluated."""
+    interpreter = Interpreter()
+    interpreter.loop_threshold = None
+    ast.accept(interpreter)
+
+
+def typed(ast):
+    """Sets the BinExprs of ast with int or float operands to the type's operator."""
+    checker = OperandTypes()
+    checker.visit(ast)
+    for node, type_left, type_right in checker.operands:
+        operator = TYPED_OPERATORS[type_index(node.op, type_left, type_right)]
+        if operator is not None:
+            node.operator = operator
+    return ast
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--n", type=int, default=20)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    workloads = (('fib', FIB % args.n), ('int-loop', INT_LOOP % (args.n * 3000)),
+                 ('float-loop', FLOAT_LOOP % (args.n * 2000)))
+    print("{0:<12} {1:>10} {2:>10}".format("workload", "generic", "typed"))
+    for name, source in workloads:
+        generic_ast = check(parse(source))
+        typed_ast = typed(check(parse(source)))
+        print("{0:<12} {1:>9.3f}s {2:>9.3f}s".format(
+            name, best_of(lambda: interpret(generic_ast), args.repeat),
+            best_of(lambda: interpret(typed_ast), args.repeat)))
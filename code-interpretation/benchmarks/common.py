@@ -0,0 +1,47 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import paths  # puts ../shared on sys.path
+from Cparser import Cparser
+from TableCache import build_parser
+from TypeChecker import TypeChecker
+
+
+def parse(text):
+    cparser = Cparser()
+    parser = build_parser(cparser)
+    return parser.parse(text, lexer=cparser.scanner)
+
+
+def check(ast):
+    type_checker = TypeChecker()
+    type_checker.visit(ast)
+    if not type_checker.is_valid:
+        raise ValueError("benchmark program does not type check")
+    return ast
+
+
+@contextmanager
+def silenced():
+    """Sends the interpreted program's output to /dev/null."""
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        yield
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+
+def best_of(function, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.time()
+        with silenced():
+            function()
+        timings.append(time.time() - start)
+    return min(timings)
@@ -0,0 +1,90 @@
+"""Generators of large synthetic programs for the benchmarks."""
+
+CHUNK = """int f{0}(int x) {{
+    int y = x * 2 + {0};
+    while (y > 0) {{
+        y = y - 3;
+        if (y % 7 == 0)
+            break;
+    }}
+    return y;
+}}
+print f{0}({0});
+"""
+
+CHUNK_LINES = CHUNK.count("\n")
+
+
+def generate(lines):
+    """Returns a type-correct program of roughly the given number of lines."""
+    return "".join(CHUNK.format(n) for n in range(max(1, lines // CHUNK_LINES)))
+
+
+def recursion(depth, calls=20):
+    """Returns a program descending depth calls deep, calls times over."""
+    return """int down(int n) {{
+    if (n == 0) {{
+        return 0;
+    }}
+    return 1 + down(n - 1);
+}}
+int i = 0, s = 0;
+while (i < {1}) {{
+    s = s + down({0});
+    i = i + 1;
+}}
+print s;
+""".format(depth, calls)
+
+
+def loop(iterations):
+    """Returns a program running a loop of arithmetic iterations times."""
+    return """int i = 0, s = 0;
+float f = 0.5;
+while (i < {0}) {{
+    s = s + i % 7;
+    if (s > 1000)
+        s = s - 1000;
+    f = f * 0.5 + 1;
+    i = i + 1;
+}}
+print s;
+print f;
+""".format(iterations)
+
+
+def declarations(width):
+    """Returns a program declaring width variables of each type, each in one declaration list."""
+    names = range(width)
+    return "int {0};\nfloat {1};\nstring {2};\nprint i{3} + f{3};\nprint s{3};\n".format(
+        ", ".join("i{0} = {0}".format(n) for n in names),
+        ", ".join("f{0} = i{0} * 0.5".format(n) for n in names),
+        ", ".join("s{0} = \"s{0}\"".format(n) for n in names),
+        width - 1)
+
+
+def nesting(depth, iterations=100):
+    """Returns a program whose loop body is depth blocks nested in each other."""
+    lines = ["int i = 0, s = 0;", "while (i < {0}) {{".format(iterations), "    int x0 = i;"]
+    for n in range(1, depth):
+        lines.append("    " * n + "{{ int x{0} = x{1} + 1;".format(n, n - 1))
+    lines.append("    " * depth + "s = s + x{0};".format(depth - 1))
+    lines.append("    " * depth + "}" * (depth - 1))
+    lines.extend(["    i = i + 1;", "}", "print s;", ""])
+    return "\n".join(lines)
+
+
+def expression(length, iterations=100):
+    """Returns a program evaluating an expression of length operands in a loop."""
+    operators = ("+", "-", "*", "+", "%", "+")
+    terms = ["x"]
+    for n in range(1, length):
+        terms.append(operators[n % len(operators)])
+        terms.append("x" if n % 2 else str(n % 5 + 1))
+    return """int x = 3, i = 0, s = 0;
+while (i < {0}) {{
+    s = {1};
+    i = i + 1;
+}}
+print s;
+""".format(iterations, " ".join(terms))
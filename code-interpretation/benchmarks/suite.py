@@ -0,0 +1,127 @@
+"""Times every stage of the pipeline on synthetic programs and compares against a baseline.
+
+Each workload of programs.py (deep recursion, a long loop, wide declaration
+lists, deeply nested blocks and a long expression chain) is lexed by the
+Scanner, parsed by yacc from the tokens lexed beforehand, checked by the
+TypeChecker and run by the Interpreter, each stage timed on its own. The
+results are written to stdout as JSON; a table, and with --baseline the ratio
+of every stage to a saved run, goes to stderr. Run from the
+code-interpretation directory:
+
+    python benchmarks/suite.py [--repeat 3] [--scale 1.0] [--only NAME] > baseline.json
+    python benchmarks/suite.py --baseline baseline.json [--tolerance 0.1]
+
+The exit status is 1 when a stage is slower than the baseline by more than
+the tolerance.
+"""
+import argparse
+import json
+import platform
+import sys
+
+import common  # puts code-interpretation on sys.path
+import programs
+from common import best_of
+from Cparser import Cparser
+from TableCache import build_parser
+from TypeChecker import TypeChecker
+from main import interpret
+from scanner import TokenReplay
+
+# name, generator and default size
+WORKLOADS = [
+    ("recursion", programs.recursion, 400),
+    ("loop", programs.loop, 20000),
+    ("declarations", programs.declarations, 2000),
+    ("nesting", programs.nesting, 150),
+    ("expression", programs.expression, 1000),
+]
+
+STAGES = ("lex", "parse", "check", "interpret")
+
+# stages faster than this in both runs are within timer noise and never regressions
+NOISE_FLOOR = 0.002
+
+
+def measure(source, repeat):
+    """Returns the token count and the best time of every stage on source."""
+    cparser = Cparser()
+    parser = build_parser(cparser)
+    scanner = cparser.scanner
+
+    def lex():
+        scanner.input(source)
+        return list(iter(scanner.token, None))
+
+    tokens = lex()
+    parse = lambda: parser.parse(lexer=TokenReplay(tokens))
+    ast = common.check(parse())
+    stages = {
+        'lex': lex,
+        'parse': parse,
+        'check': lambda: TypeChecker().visit(ast),
+        'interpret': lambda: interpret(ast),
+    }
+    return len(tokens), dict((stage, best_of(stages[stage], repeat)) for stage in STAGES)
+
+
+def compare(results, baseline, tolerance, stream=sys.stderr):
+    """Writes the ratio of every stage to the baseline; returns the stages slower beyond tolerance."""
+    regressions = []
+    stream.write("{0:<14}".format("") + "".join("{0:>13}".format(stage) for stage in STAGES) + "\n")
+    for name, result in sorted(results['workloads'].items()):
+        previous = baseline.get('workloads', {}).get(name)
+        if previous is None or previous['size'] != result['size']:
+            stream.write("{0:<14} not in the baseline at size {1}\n".format(name, result['size']))
+            continue
+        ratios = []
+        for stage in STAGES:
+            current, before = result['seconds'][stage], previous['seconds'][stage]
+            ratio = current / max(before, 1e-9)
+            mark = " "
+            if max(current, before) < NOISE_FLOOR:
+                mark = "~"
+            elif ratio > 1 + tolerance:
+                mark = "!"
+                regressions.append((name, stage, ratio))
+            elif ratio < 1 - tolerance:
+                mark = "+"
+            ratios.append("{0:>11.2f}x{1}".format(ratio, mark))
+        stream.write("{0:<14}".format(name) + "".join(ratios) + "\n")
+    return regressions
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--scale", type=float, default=1.0, help="factor applied to the size of every workload")
+    arg_parser.add_argument("--only", action="append", choices=[name for name, _, _ in WORKLOADS],
+                            help="run this workload only, may be repeated")
+    arg_parser.add_argument("--baseline", metavar="FILE", help="JSON of an earlier run to compare with")
+    arg_parser.add_argument("--tolerance", type=float, default=0.1,
+                            help="relative slowdown of a stage reported as a regression")
+    args = arg_parser.parse_args()
+
+    results = {'python': platform.python_version(), 'repeat': args.repeat, 'workloads': {}}
+    sys.stderr.write("{0:<14}{1:>8}{2:>9}".format("", "size", "tokens") +
+                     "".join("{0:>13}".format(stage) for stage in STAGES) + "\n")
+    for name, generate, size in WORKLOADS:
+        if args.only and name not in args.only:
+            continue
+        size = max(1, int(size * args.scale))
+        tokens, seconds = measure(generate(size), args.repeat)
+        results['workloads'][name] = {'size': size, 'tokens': tokens, 'seconds': seconds}
+        sys.stderr.write("{0:<14}{1:>8}{2:>9}".format(name, size, tokens) +
+                         "".join("{0:>12.4f}s".format(seconds[stage]) for stage in STAGES) + "\n")
+
+    json.dump(results, sys.stdout, indent=2, sort_keys=True)
+    sys.stdout.write("\n")
+
+    if args.baseline:
+        with open(args.baseline, "r") as baseline_file:
+            baseline = json.load(baseline_file)
+        sys.stderr.write("\nagainst {0} (! slower, + faster by more than {1:.0%}, ~ too fast to tell)\n".format(
+            args.baseline, args.tolerance))
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            sys.exit(1)
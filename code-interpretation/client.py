@@ -0,0 +1,59 @@
+"""Thin command line client of Daemon.py.
+
+    python client.py [--command run] [--socket PATH] [main.py arguments...]
+
+prints what main.py would print with the same arguments, taking only the
+start of a bare interpreter. When no daemon is listening, the request is
+served in this process instead, at the cost of a normal start.
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+
+from Daemon import socket_path
+
+
+def send(path, request):
+    """Sends request to the daemon listening on path and returns its reply."""
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+        connection.sendall(json.dumps(request))
+        connection.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = connection.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        connection.close()
+    return json.loads("".join(chunks))
+
+
+def serve_locally(request):
+    from Session import Session
+    return Session().handle(request)
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(usage="%(prog)s [--command COMMAND] [--socket PATH] [main.py arguments]")
+    arg_parser.add_argument("--command", choices=("parse", "check", "translate", "run"), default="run")
+    arg_parser.add_argument("--socket", default=socket_path())
+    args, arguments = arg_parser.parse_known_args()
+
+    request = {'command': args.command, 'arguments': arguments, 'cwd': os.getcwd()}
+    try:
+        reply = send(args.socket, request)
+    except socket.error:
+        reply = serve_locally(request)
+    except ValueError:
+        # the daemon closed the connection without a whole reply
+        reply = {'status': 1, 'stdout': "", 'stderr': "No reply from the daemon at {0}\n".format(args.socket)}
+
+    for stream, text in ((sys.stdout, reply['stdout']), (sys.stderr, reply['stderr'])):
+        # json hands back the printed bytes as latin-1 characters, a local Session plain strings
+        stream.write(text.encode('latin-1', 'replace') if isinstance(text, unicode) else text)
+    sys.exit(reply['status'])
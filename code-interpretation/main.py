@@ -1,30 +1,225 @@
 import sys
-import ply.yacc as yacc
+import argparse
+import paths  # puts ../shared on sys.path
+from TableCache import build_parser
 from Cparser import Cparser
 from TypeChecker import TypeChecker
+from Optimizer import Optimizer
+from FlatAST import flatten
 from Interpreter import Interpreter
+from Compiler import Compiler
+from VirtualMachine import VirtualMachine, StackOverflow, DEFAULT_STACK_BUDGET
+from ClosureCompiler import ClosureCompiler
+from PythonCompiler import PythonCompiler
+from Output import open_output, DEFAULT_BUFFER_SIZE
+from Instrumentation import Stats, phase
+from Profiler import Profiler, DEFAULT_INTERVAL
+
+
+def interpret(ast, output=None, memo_size=None, stats=None, profiler=None):
+    interpreter = Interpreter(output, memo_size)
+    if stats is not None:
+        stats.instrument(interpreter)
+    if profiler is not None:
+        profiler.attach(interpreter)
+        profiler.start()
+    try:
+        ast.accept(interpreter)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+        if memo_size:
+            interpreter.report_memoization(sys.stderr)
+
+
+def run_bytecode(ast, output=None, stack_budget=DEFAULT_STACK_BUDGET):
+    VirtualMachine(output, stack_budget).run(Compiler().compile(ast))
+
+
+def run_closures(ast, output=None):
+    ClosureCompiler(output).compile(ast)()
+
+
+def run_python(ast, output=None):
+    program = PythonCompiler(output).compile(ast)
+    if program is None:
+        # the vm keeps expressions and calls on its own stacks, so it runs what is too deep for Python
+        sys.stderr.write("Program nested too deeply for Python, running it on the vm instead\n")
+        run_bytecode(ast, output)
+        return
+    program()
+
+
+MODES = {
+    'interpreter': interpret,
+    'vm': run_bytecode,
+    'closures': run_closures,
+    'python': run_python,
+}
+
+
+def argument_parser():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("filename", nargs="?", default="tests/fib.in")
+    add_run_arguments(arg_parser)
+    return arg_parser
+
+
+def add_run_arguments(arg_parser):
+    """Adds the options choosing how a program is read, optimized, run and printed."""
+    arg_parser.add_argument("--stream", action="store_true",
+                            help="lex the source as it is read a chunk at a time instead of mapping it into memory")
+    arg_parser.add_argument("--mode", choices=sorted(MODES), default="interpreter",
+                            help="execution engine: tree-walking interpreter, bytecode vm, compiled closures "
+                                 "or Python source compiled by CPython")
+    arg_parser.add_argument("--no-optimize", dest="optimize", action="store_false",
+                            help="run the checked tree without folding constants")
+    arg_parser.add_argument("--flat-ast", action="store_true",
+                            help="check and interpret the tree encoded in typed arrays by FlatAST instead of as "
+                                 "node objects, which takes less memory (interpreter only)")
+    arg_parser.add_argument("--memoize", action="store_true",
+                            help="cache the results of pure functions (interpreter only)")
+    arg_parser.add_argument("--memo-size", type=int, default=1024,
+                            help="results cached per function with --memoize")
+    arg_parser.add_argument("--output", metavar="FILE",
+                            help="write the printed values to FILE instead of stdout")
+    arg_parser.add_argument("--buffer-size", type=int, default=DEFAULT_BUFFER_SIZE,
+                            help="characters of output collected before a write, 0 writes every line")
+    arg_parser.add_argument("--line-buffered", action="store_true",
+                            help="write and flush the output after every printed line")
+    arg_parser.add_argument("--stack-budget", type=int, default=DEFAULT_STACK_BUDGET,
+                            help="value slots the active calls of the vm may hold, bounding recursion depth")
+    arg_parser.add_argument("--stats", action="store_true",
+                            help="report the time of every phase and counters of the run as JSON on stderr")
+    arg_parser.add_argument("--stats-file", metavar="FILE",
+                            help="write the report of --stats to FILE instead of stderr")
+    arg_parser.add_argument("--profile", choices=("exact", "sampling"),
+                            help="profile the program's functions and lines: count and time every evaluation "
+                                 "and call, or sample the running interpreter (interpreter only)")
+    arg_parser.add_argument("--profile-interval", type=float, default=DEFAULT_INTERVAL * 1e3, metavar="MS",
+                            help="milliseconds of CPU time between samples with --profile sampling")
+    arg_parser.add_argument("--profile-file", metavar="FILE",
+                            help="write the profile to FILE instead of stderr")
+    arg_parser.add_argument("--collapsed", metavar="FILE",
+                            help="with --profile, also write the profiled stacks to FILE in the collapsed "
+                                 "format flame graph tools read")
+
+
+def parse_arguments(arg_parser, arguments=None):
+    args = arg_parser.parse_args(arguments)
+    if args.memoize and args.mode != "interpreter":
+        arg_parser.error("--memoize is only supported by the interpreter")
+    if args.memo_size < 1:
+        arg_parser.error("--memo-size must be at least 1")
+    if args.stats_file is not None:
+        args.stats = True
+    if args.flat_ast:
+        if args.mode != "interpreter":
+            arg_parser.error("--flat-ast is only supported by the interpreter")
+        if args.stats or args.profile is not None:
+            arg_parser.error("--flat-ast cannot be combined with --stats or --profile")
+    if args.profile is None and (args.profile_file is not None or args.collapsed is not None):
+        arg_parser.error("--profile-file and --collapsed need --profile")
+    if args.profile is not None:
+        if args.mode != "interpreter":
+            arg_parser.error("--profile is only supported by the interpreter")
+        if args.stats:
+            arg_parser.error("--profile and --stats cannot be combined")
+        if args.profile_interval <= 0:
+            arg_parser.error("--profile-interval must be positive")
+    return args
+
+
+def write_profile(profiler, args):
+    if args.profile_file is None:
+        profiler.write_report(sys.stderr)
+    else:
+        with open(args.profile_file, "w") as file:
+            profiler.write_report(file)
+    if args.collapsed is not None:
+        with open(args.collapsed, "w") as file:
+            profiler.write_collapsed(file)
+
+
+def run_program(ast, args, flush_on_exit=True, stats=None):
+    """Checks, optimizes and runs a parsed program as args ask; returns the exit status.
+
+    The phases and counters of the run are recorded into stats, if given.
+    """
+    if not ast:
+        sys.stderr.write("Syntax check failed -> no type check & interpretation")
+        return 0
+    if args.flat_ast:
+        ast = flatten(ast)
+
+    typeChecker = TypeChecker()
+    if stats is not None:
+        stats.count_lookups(typeChecker)
+    with phase(stats, 'check'):
+        typeChecker.visit(ast)
+    if not typeChecker.is_valid:
+        sys.stderr.write("Type check failed -> no interpretation")
+        return 0
+
+    if args.optimize:
+        with phase(stats, 'optimize'):
+            ast = Optimizer().optimize(ast)
+    profiler = None
+    if args.profile is not None:
+        profiler = Profiler(args.profile_interval / 1e3 if args.profile == "sampling" else None)
+    output = open_output(args.output, args.buffer_size, args.line_buffered, flush_on_exit)
+    try:
+        with phase(stats, 'run'):
+            if args.mode == "interpreter":
+                interpret(ast, output, args.memo_size if args.memoize else None, stats, profiler)
+            elif args.mode == "vm":
+                run_bytecode(ast, output, args.stack_budget)
+            else:
+                MODES[args.mode](ast, output)
+    except StackOverflow as error:
+        sys.stderr.write("Stack overflow: {0}\n".format(error))
+        return 1
+    except RuntimeError as error:
+        # Python's own recursion limit, which every mode but the vm recurses into
+        if "maximum recursion depth" not in str(error):
+            raise
+        sys.stderr.write("Stack overflow: {0}\n".format(error))
+        return 1
+    finally:
+        output.close()
+        if profiler is not None:
+            write_profile(profiler, args)
+    return 0
+
 
 if __name__ == '__main__':
 
+    args = parse_arguments(argument_parser())
+    stats = Stats() if args.stats else None
+
     try:
-        filename = sys.argv[1] if len(sys.argv) > 1 else "tests/fib.in"
+        filename = args.filename
         file = open(filename, "r")
     except IOError:
         print("Cannot open {0} file".format(filename))
         sys.exit(0)
 
     Cparser = Cparser()
-    parser = yacc.yacc(module=Cparser)
-    text = file.read()
-
-    ast = parser.parse(text, lexer=Cparser.scanner)
-
-    if ast:
-        typeChecker = TypeChecker()
-        typeChecker.visit(ast)
-        if typeChecker.is_valid:
-            ast.accept(Interpreter())
-        else:
-            sys.stderr.write("Type check failed -> no interpretation")
-    else:
-        sys.stderr.write("Syntax check failed -> no type check & interpretation")
+    parser = build_parser(Cparser)
+    scanner = Cparser.scanner
+    with file:
+        scanner.input_source(file, args.stream)
+        try:
+            if stats is None:
+                ast = parser.parse(lexer=scanner)
+            else:
+                ast = stats.parse(parser, scanner)
+        finally:
+            scanner.close()
+    if args.flat_ast and ast:
+        # dropping the object tree once it is encoded
+        ast = flatten(ast)
+    status = run_program(ast, args, stats=stats)
+    if stats is not None:
+        stats.write(args.stats_file)
+    sys.exit(status)
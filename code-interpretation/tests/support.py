@@ -0,0 +1,55 @@
+"""Helpers of the regression checks. Run them from the code-interpretation directory:
+
+    python -m unittest discover tests
+
+Every tests/*.in program comes with tests/*.out, the output the baseline
+tree-walking interpreter printed for it. The checks run the programs through
+main.py and the other entry points and compare what they print with it.
+"""
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+
+TESTS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(TESTS)
+
+sys.path.insert(0, ROOT)
+# the benchmarks' own modules, which some checks reuse
+sys.path.insert(1, os.path.join(ROOT, "benchmarks"))
+
+
+def programs(pattern="*"):
+    """Returns the paths of the regression programs matching pattern."""
+    return sorted(glob.glob(os.path.join(TESTS, pattern + ".in")))
+
+
+def expected(program):
+    """Returns the output of the baseline interpreter for program."""
+    with open(os.path.splitext(program)[0] + ".out", "r") as file:
+        return file.read()
+
+
+def name(program):
+    return os.path.basename(program)
+
+
+def run(script, *arguments, **kwargs):
+    """Runs the Python script of the code-interpretation directory; returns its status, stdout and stderr."""
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, script)] + list(arguments), cwd=ROOT,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stdout, stderr = process.communicate(kwargs.get('input'))
+    return process.returncode, stdout, stderr
+
+
+def run_main(*arguments):
+    return run("main.py", *arguments)
+
+
+def run_source(source, *arguments):
+    """Runs main.py on a file holding source."""
+    with tempfile.NamedTemporaryFile(suffix=".in") as file:
+        file.write(source)
+        file.flush()
+        return run_main(file.name, *arguments)
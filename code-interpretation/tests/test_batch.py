@@ -0,0 +1,50 @@
+import re
+import unittest
+
+import support
+
+HEADER = re.compile(r"^==> (.*) \[status (\d+), [0-9.]+s\]\n", re.MULTILINE)
+
+
+def sections(report):
+    """Returns {path: (status, text)} for the files of a batch.py report."""
+    parts = HEADER.split(report)
+    return dict((path, (int(status), text)) for path, status, text in zip(parts[1::3], parts[2::3], parts[3::3]))
+
+
+class BatchTest(unittest.TestCase):
+    """batch.py prints for every file what main.py would, which is the baseline's output."""
+
+    def check(self, *options):
+        programs = support.programs()
+        status, stdout, stderr = support.run("batch.py", "--jobs", "2", *(options + tuple(programs)))
+        self.assertEqual(status, 0)
+        self.assertTrue(stderr.startswith("{0} files, 0 failed".format(len(programs))), stderr)
+        results = sections(stdout)
+        self.assertEqual(sorted(results), programs)
+        for program in programs:
+            expected = support.expected(program)
+            if support.name(program) == "errors.in":
+                expected += "Type check failed -> no interpretation\n"
+            self.assertEqual(results[program], (0, expected), (support.name(program),) + options)
+        return stdout
+
+    def test_programs(self):
+        report = self.check()
+        # in the order given
+        self.assertEqual(HEADER.findall(report), [(program, "0") for program in support.programs()])
+
+    def test_completion_order(self):
+        self.check("--order", "completion")
+
+    def test_engine_options(self):
+        self.check("--mode", "vm")
+        self.check("--no-optimize")
+
+    def test_directory(self):
+        status, stdout, stderr = support.run("batch.py", "--jobs", "2", "--pattern", "*.in", support.TESTS)
+        self.assertEqual(sorted(sections(stdout)), support.programs())
+
+
+if __name__ == '__main__':
+    unittest.main()
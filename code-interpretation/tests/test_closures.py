@@ -0,0 +1,23 @@
+import unittest
+
+import support
+
+
+class ClosuresTest(unittest.TestCase):
+    """Compiled closures against the baseline's output."""
+
+    def check(self, *options):
+        for program in support.programs():
+            status, stdout, stderr = support.run_main(program, "--mode", "closures", *options)
+            self.assertEqual(stdout, support.expected(program), support.name(program))
+            self.assertEqual(status, 0, support.name(program))
+
+    def test_programs(self):
+        self.check()
+
+    def test_programs_unoptimized(self):
+        self.check("--no-optimize")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+import support
+from client import send
+
+# a string that is not UTF-8, printed back byte for byte
+LATIN_PROGRAM = 'string s = "caf\xe9";\nprint s;\nprint s + "!";\n'
+
+
+class DaemonTest(unittest.TestCase):
+    """Programs run through a daemon and client.py against the baseline's output."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.socket = os.path.join(cls.directory, "daemon.sock")
+        cls.daemon = subprocess.Popen([sys.executable, "Daemon.py", "--socket", cls.socket], cwd=support.ROOT)
+        deadline = time.time() + 30
+        while not os.path.exists(cls.socket):
+            if time.time() > deadline or cls.daemon.poll() is not None:
+                raise RuntimeError("the daemon did not start")
+            time.sleep(0.05)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.daemon.terminate()
+        cls.daemon.wait()
+        shutil.rmtree(cls.directory)
+
+    def client(self, *arguments):
+        return support.run("client.py", "--socket", self.socket, *arguments)
+
+    def test_programs(self):
+        for program in support.programs():
+            status, stdout, stderr = self.client(program)
+            self.assertEqual(stdout, support.expected(program), support.name(program))
+            self.assertEqual(status, 0, support.name(program))
+
+    def test_check_and_parse_commands(self):
+        errors = support.programs("errors")[0]
+        status, stdout, stderr = self.client("--command", "check", errors)
+        self.assertEqual(stdout, support.expected(errors))
+        status, stdout, stderr = self.client("--command", "parse", errors)
+        self.assertEqual((status, stdout, stderr), (0, "", ""))
+
+    def test_bytes_that_are_not_utf8(self):
+        path = os.path.join(self.directory, "latin.in")
+        with open(path, "w") as file:
+            file.write(LATIN_PROGRAM)
+        expected = support.run_main(path)[1]
+        self.assertEqual(expected, "caf\xe9\ncaf\xe9!\n")
+        self.assertEqual(self.client(path)[1], expected)
+
+    def test_source_in_the_request(self):
+        program = support.programs("fib")[0]
+        with open(program, "r") as file:
+            source = file.read()
+        reply = send(self.socket, {'command': 'run', 'arguments': ["unused.in"], 'source': source})
+        self.assertEqual(reply['stdout'], support.expected(program))
+
+    def test_served_locally_without_a_daemon(self):
+        program = support.programs("fib")[0]
+        status, stdout, stderr = support.run("client.py", "--socket", os.path.join(self.directory, "none"), program)
+        self.assertEqual(stdout, support.expected(program))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+import support
+from common import parse, check
+from FlatAST import encode
+from Optimizer import Optimizer
+import TreePrinter
+
+
+def read(program):
+    with open(program, "r") as file:
+        return file.read()
+
+
+class FlatASTTest(unittest.TestCase):
+    """The encoded tree decodes to the parsed one and runs as the baseline did."""
+
+    def test_programs(self):
+        for program in support.programs():
+            status, stdout, stderr = support.run_main(program, "--flat-ast")
+            self.assertEqual(stdout, support.expected(program), support.name(program))
+            self.assertEqual(status, 0, support.name(program))
+
+    def test_round_trip(self):
+        for program in support.programs():
+            tree = parse(read(program))
+            flat = encode(tree)
+            self.assertEqual(flat.root().printTree(), tree.printTree(), support.name(program))
+            self.assertEqual(flat.decode().printTree(), tree.printTree(), support.name(program))
+
+    def test_optimizer_rewrites_the_arrays(self):
+        for program in support.programs("[!e]*"):
+            source = read(program)
+            optimized = Optimizer().optimize(check(parse(source))).printTree()
+            flat = encode(check(parse(source)))
+            self.assertEqual(Optimizer().optimize(flat.root()).printTree(), optimized, support.name(program))
+            self.assertEqual(flat.decode().printTree(), optimized, support.name(program))
+
+    def test_other_engines_are_rejected(self):
+        status, stdout, stderr = support.run_main(support.programs("fib")[0], "--flat-ast", "--mode", "vm")
+        self.assertEqual(status, 2)
+        self.assertIn("--flat-ast is only supported by the interpreter", stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+
+import support
+
+
+class InterpreterTest(unittest.TestCase):
+    """The tree-walking interpreter against the baseline's output."""
+
+    def check(self, *options):
+        for program in support.programs():
+            status, stdout, stderr = support.run_main(program, *options)
+            self.assertEqual(stdout, support.expected(program), support.name(program))
+            self.assertEqual(status, 0, support.name(program))
+
+    def test_programs(self):
+        self.check()
+
+    def test_programs_unoptimized(self):
+        self.check("--no-optimize")
+
+    def test_type_errors_stop_the_run(self):
+        status, stdout, stderr = support.run_main(support.programs("errors")[0])
+        self.assertEqual(stderr, "Type check failed -> no interpretation")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+import support
+from common import parse, check
+from Interpreter import Interpreter
+from Output import ListOutput
+
+
+def run(program, loop_threshold):
+    """Interprets program, compiling its loops after loop_threshold passes; returns the output and the interpreter."""
+    with open(program, "r") as file:
+        ast = check(parse(file.read()))
+    output = ListOutput()
+    interpreter = Interpreter(output)
+    interpreter.loop_threshold = loop_threshold
+    ast.accept(interpreter)
+    return "".join(line + "\n" for line in output.lines), interpreter
+
+
+class HotLoopTest(unittest.TestCase):
+    """Loops handed to LoopCompiler after some passes print what the interpreter alone does.
+
+    The hot_ programs cover break and continue in a repeat, return from a
+    loop, globals changed by calls made in the loop and int and float division.
+    """
+
+    def test_compiled_loops_match_the_baseline(self):
+        for program in support.programs("hot_*"):
+            for loop_threshold in (None, 1, 2, 100):
+                output, interpreter = run(program, loop_threshold)
+                self.assertEqual(output, support.expected(program), (support.name(program), loop_threshold))
+                compiled = [loop for loop, function in interpreter.compiled_loops.items() if function is not None]
+                if loop_threshold is None:
+                    self.assertEqual(compiled, [], support.name(program))
+                else:
+                    self.assertNotEqual(compiled, [], (support.name(program), loop_threshold))
+
+
+if __name__ == '__main__':
+    unittest.main()
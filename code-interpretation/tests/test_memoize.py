@@ -0,0 +1,51 @@
+import unittest
+
+import support
+
+IMPURE = """
+int g = 3;
+int addg(int n) {
+    return n + g;
+}
+int noisy(int n) {
+    print n;
+    return n;
+}
+print addg(1);
+g = 10;
+print addg(1);
+print noisy(7);
+print noisy(7);
+"""
+
+
+class MemoizeTest(unittest.TestCase):
+    """--memoize prints what the baseline did and accounts for every call of a pure function."""
+
+    def test_programs(self):
+        for program in support.programs():
+            status, stdout, stderr = support.run_main(program, "--memoize")
+            self.assertEqual(stdout, support.expected(program), support.name(program))
+            self.assertEqual(status, 0, support.name(program))
+
+    def test_hits_and_misses(self):
+        # fib(i) for i < 20: one miss per argument, then fib(i - 1) and fib(i - 2) hit for i >= 2
+        status, stdout, stderr = support.run_main(support.programs("fib")[0], "--memoize")
+        self.assertEqual(stderr, "memoized fact: 0 hits, 3 misses, 3 cached\n"
+                                 "memoized fib: 36 hits, 20 misses, 20 cached\n")
+
+    def test_memo_size_bounds_the_cache(self):
+        program = support.programs("fib")[0]
+        status, stdout, stderr = support.run_main(program, "--memoize", "--memo-size", "2")
+        self.assertEqual(stdout, support.expected(program))
+        self.assertIn("memoized fact: 0 hits, 3 misses, 2 cached\n", stderr)
+        self.assertTrue(stderr.endswith(" 2 cached\n"), stderr)
+
+    def test_impure_functions_are_called_every_time(self):
+        status, stdout, stderr = support.run_source(IMPURE, "--memoize")
+        self.assertEqual(stdout, "4\n11\n7\n7\n7\n7\n")
+        self.assertEqual(stderr, "")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+import support
+import AST
+from common import parse, check
+from Optimizer import Optimizer
+from PythonSource import find_nodes
+
+
+def printed(source):
+    """Returns the expressions the optimized source prints, in source order."""
+    program = Optimizer().optimize(check(parse(source)))
+    prints = sorted(find_nodes(program, AST.PrintInstruction), key=lambda node: node.line)
+    return [node.expr for node in prints]
+
+
+class OptimizerTest(unittest.TestCase):
+    """Folding and simplification; folding.in checks the printed values against the baseline."""
+
+    def test_constants_are_folded(self):
+        expressions = printed('print 1 + 2 * 3;\nprint (0 - 7) / 2;\nprint "ab" * 3;\nprint 7 / 2.0;\n')
+        self.assertEqual([(node.__class__, node.value) for node in expressions],
+                         [(AST.Integer, 7), (AST.Integer, -4), (AST.String, "ababab"), (AST.Float, 3.5)])
+
+    def test_identities_keep_values_that_could_print_differently(self):
+        source = 'int b = 3 < 4;\nint x = 5;\nprint b * 1;\nprint (x + 2) * 1;\n'
+        kept, simplified = printed(source)
+        self.assertEqual((kept.__class__, kept.op), (AST.BinExpr, '*'))
+        self.assertEqual((simplified.__class__, simplified.op), (AST.BinExpr, '+'))
+
+    def test_folding_program_prints_as_the_baseline(self):
+        program = support.programs("folding")[0]
+        for options in ((), ("--no-optimize",)):
+            status, stdout, stderr = support.run_main(program, *options)
+            self.assertEqual(stdout, support.expected(program), options)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import support
+
+
+class OutputTest(unittest.TestCase):
+    """Buffered and redirected output holds what the baseline printed."""
+
+    def test_buffering_keeps_the_output(self):
+        for options in (("--buffer-size", "0"), ("--buffer-size", "7"), ("--line-buffered",)):
+            for program in support.programs():
+                status, stdout, stderr = support.run_main(program, *options)
+                self.assertEqual(stdout, support.expected(program), (support.name(program),) + options)
+
+    def test_output_file(self):
+        directory = tempfile.mkdtemp()
+        try:
+            # errors.in prints its type errors on stdout and runs nothing
+            for program in support.programs("[!e]*"):
+                path = os.path.join(directory, support.name(program))
+                status, stdout, stderr = support.run_main(program, "--output", path)
+                self.assertEqual(stdout, "", support.name(program))
+                with open(path, "r") as file:
+                    self.assertEqual(file.read(), support.expected(program), support.name(program))
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import re
+import shutil
+import tempfile
+import unittest
+
+import support
+
+FIB = os.path.join(support.TESTS, "fib.in")
+
+# a row of the function table or the call tree: calls, total, self and the indented name
+ROW = re.compile(r"^ +(\d+|-) +\d+\.\d{3}s +\d+\.\d{3}s  ( *)(\S+)$")
+
+
+def sections(report):
+    """Returns the blocks of report's lines, which blank lines separate."""
+    return [block.splitlines() for block in report.strip("\n").split("\n\n")]
+
+
+def rows(lines):
+    """Returns (calls, depth, name) for the rows under the heading in lines[0]."""
+    result = []
+    for line in lines[1:]:
+        match = ROW.match(line)
+        result.append((match.group(1), len(match.group(2)) // 2, match.group(3)))
+    return result
+
+
+class ProfileTest(unittest.TestCase):
+    """--profile prints what the baseline did and counts every call of the program."""
+
+    def test_programs(self):
+        for program in support.programs("[!e]*"):
+            for mode in ("exact", "sampling"):
+                status, stdout, stderr = support.run_main(program, "--profile", mode)
+                self.assertEqual(stdout, support.expected(program), (support.name(program), mode))
+                self.assertEqual(status, 0, (support.name(program), mode))
+                self.assertTrue(stderr.startswith(mode + " profile of a "), (support.name(program), mode))
+
+    def test_exact_counts(self):
+        status, stdout, stderr = support.run_main(FIB, "--profile", "exact")
+        header, functions, lines, tree = sections(stderr)
+        # fib(i) makes 2 * fib(i) - 1 calls, for i < 20
+        self.assertEqual(sorted(rows(functions)), [("1", 0, "<program>"), ("3", 0, "fact"), ("35400", 0, "fib")])
+
+        evaluated = set((line.split()[1], line.split()[2]) for line in lines[1:])
+        self.assertEqual(evaluated, set([("1", "<program>"), ("2", "fib"), ("3", "fib"), ("5", "fib"),
+                                         ("9", "<program>"), ("10", "fact"), ("13", "fact"), ("14", "fact"),
+                                         ("15", "fact"), ("16", "fact"), ("19", "<program>"),
+                                         ("20", "<program>"), ("21", "<program>"), ("22", "<program>"),
+                                         ("24", "<program>"), ("25", "<program>")]))
+
+        # the paths below MIN_SHARE of the run are left out, so only the shallow calls are counted here
+        calls = rows(tree)
+        self.assertEqual(calls[0], ("1", 0, "<program>"))
+        self.assertEqual(calls[1:5], [("20", 1, "fib"), ("36", 2, "fib"), ("66", 3, "fib"), ("120", 4, "fib")])
+
+    def test_profile_and_collapsed_files(self):
+        directory = tempfile.mkdtemp()
+        try:
+            profile = os.path.join(directory, "profile.txt")
+            collapsed = os.path.join(directory, "collapsed.txt")
+            status, stdout, stderr = support.run_main(FIB, "--profile", "exact", "--profile-file", profile,
+                                                      "--collapsed", collapsed)
+            self.assertEqual(stdout, support.expected(FIB))
+            self.assertEqual(stderr, "")
+            with open(profile, "r") as file:
+                self.assertTrue(file.read().startswith("exact profile of a "))
+            with open(collapsed, "r") as file:
+                stacks = [line.rsplit(" ", 1)[0] for line in file.read().splitlines()]
+            # the deepest call is fib(19) down to fib(1) or fib(0), 19 calls of fib
+            self.assertEqual(sorted(stacks), sorted(["<program>", "<program>;fact"] +
+                                                    [";".join(["<program>"] + ["fib"] * depth)
+                                                     for depth in range(1, 20)]))
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+import support
+
+DEEP = """
+int depth(int n) {
+    if (n == 0) {
+        return 0;
+    }
+    return depth(n - 1) + 1;
+}
+print depth(50);
+print depth(200000);
+"""
+
+
+class PythonModeTest(unittest.TestCase):
+    """--mode python against the baseline's output."""
+
+    def test_programs(self):
+        for program in support.programs():
+            status, stdout, stderr = support.run_main(program, "--mode", "python")
+            self.assertEqual(stdout, support.expected(program), support.name(program))
+            self.assertEqual(status, 0, support.name(program))
+
+    def test_deep_recursion_is_a_stack_overflow(self):
+        for mode in ("python", "interpreter"):
+            status, stdout, stderr = support.run_source(DEEP, "--mode", mode)
+            self.assertEqual(stdout, "50\n", mode)
+            self.assertEqual(stderr, "Stack overflow: maximum recursion depth exceeded\n", mode)
+            self.assertEqual(status, 1, mode)
+
+
+if __name__ == '__main__':
+    unittest.main()
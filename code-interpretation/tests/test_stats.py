@@ -0,0 +1,51 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import support
+
+PHASES = ["lex", "parse", "check", "optimize", "run"]
+
+
+class StatsTest(unittest.TestCase):
+    """--stats prints what the baseline did and reports the run as JSON on stderr."""
+
+    def test_programs(self):
+        # errors.in is not run, so its report follows the TypeChecker's message on stderr
+        for program in support.programs("[!e]*"):
+            status, stdout, stderr = support.run_main(program, "--stats")
+            self.assertEqual(stdout, support.expected(program), support.name(program))
+            self.assertEqual(status, 0, support.name(program))
+            report = json.loads(stderr)
+            self.assertEqual([phase["phase"] for phase in report["phases"]], PHASES, support.name(program))
+            self.assertEqual(report["nodes"]["Program"], 1, support.name(program))
+            self.assertEqual(sum(report["nodes"].values()), report["node_count"], support.name(program))
+
+    def test_fib_counts(self):
+        status, stdout, stderr = support.run_main(os.path.join(support.TESTS, "fib.in"), "--stats")
+        report = json.loads(stderr)
+        # fib(i) makes 2 * fib(i) - 1 calls, for i < 20; fact is called 3 times
+        self.assertEqual(report["calls_by_function"], {"fib": 35400, "fact": 3})
+        self.assertEqual(report["calls"], 35403)
+        self.assertEqual(report["evaluations"]["InvocationExpression"], 35403)
+        self.assertEqual(report["evaluations"]["PrintInstruction"], 22)
+        self.assertEqual(report["evaluations"]["Program"], 1)
+
+    def test_stats_file(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "stats.json")
+            program = os.path.join(support.TESTS, "fib.in")
+            status, stdout, stderr = support.run_main(program, "--stats-file", path)
+            self.assertEqual(stdout, support.expected(program))
+            self.assertEqual(stderr, "")
+            with open(path, "r") as file:
+                self.assertEqual(json.load(file)["calls"], 35403)
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import sys
+import unittest
+from StringIO import StringIO
+
+import support
+import paths  # puts ../shared on sys.path
+from scanner import Scanner
+
+# comments, strings and illegal characters around which a chunk may end
+TRICKY = '''int a = 1; /* open
+ comment */ b = a / *c;
+ x = "str /* not" ;
+ # line /* c
+ y = 2 @ 3;
+ z = /*/ a */ 4;
+ w = 1/2;/* unclosed
+ q = 5;
+'''
+
+
+def tokens(scanner):
+    """Returns the tokens left in scanner with their columns, and what it printed about illegal characters."""
+    stdout, sys.stdout = sys.stdout, StringIO()
+    try:
+        found = [(token.type, token.value, token.lineno, token.lexpos, scanner.find_tok_column(token))
+                 for token in iter(scanner.token, None)]
+        return found, sys.stdout.getvalue()
+    finally:
+        sys.stdout = stdout
+
+
+class StreamTest(unittest.TestCase):
+    """Sources lexed a chunk at a time give the tokens and the output of the whole text."""
+
+    def test_programs(self):
+        for program in support.programs():
+            status, stdout, stderr = support.run_main(program, "--stream")
+            self.assertEqual(stdout, support.expected(program), support.name(program))
+            self.assertEqual(status, 0, support.name(program))
+
+    def test_chunk_boundaries(self):
+        scanner = Scanner()
+        scanner.build()
+        sources = [TRICKY]
+        for program in support.programs():
+            with open(program, "r") as file:
+                sources.append(file.read())
+        for source in sources:
+            scanner.lexer.lineno = 1
+            scanner.input(source)
+            whole = tokens(scanner)
+            for size in (1, 2, 3, 7, 64):
+                scanner.lexer.lineno = 1
+                scanner.input_chunks(source[start:start + size] for start in range(0, len(source), size))
+                self.assertEqual(tokens(scanner), whole, (source[:20], size))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from StringIO import StringIO
+
+import support
+import programs
+import suite
+from common import check, parse
+
+
+class SuiteTest(unittest.TestCase):
+    """The workloads and baseline comparison of benchmarks/suite.py."""
+
+    def test_workloads_type_check(self):
+        for name, generate, size in suite.WORKLOADS:
+            check(parse(generate(max(1, size // 100))))
+
+    def test_generated_program_type_checks(self):
+        check(parse(programs.generate(200)))
+
+    def test_compare_reports_slower_stages(self):
+        def results(seconds):
+            return {'workloads': {'loop': {'size': 10, 'seconds': dict.fromkeys(suite.STAGES, seconds)}}}
+
+        regressions = suite.compare(results(0.5), results(0.1), 0.1, StringIO())
+        self.assertEqual(sorted(stage for name, stage, ratio in regressions), sorted(suite.STAGES))
+        self.assertEqual(suite.compare(results(0.105), results(0.1), 0.1, StringIO()), [])
+        # both too fast to tell apart
+        self.assertEqual(suite.compare(results(0.001), results(0.0001), 0.1, StringIO()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
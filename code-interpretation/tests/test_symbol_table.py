@@ -0,0 +1,39 @@
+import unittest
+
+import support
+from SymbolTable import SymbolTable, VariableSymbol
+
+
+class SymbolTableTest(unittest.TestCase):
+
+    def test_inner_scopes_shadow_and_unshadow(self):
+        root = SymbolTable(None, 'root')
+        root.put('x', VariableSymbol('x', 'int'))
+        inner = root.push_scope('f')
+        inner.put('x', VariableSymbol('x', 'float'))
+        self.assertEqual(inner.get('x').type, 'float')
+        self.assertIs(inner.pop_scope(), root)
+        self.assertEqual(root.get('x').type, 'int')
+
+    def test_lookups_answer_for_their_own_scope(self):
+        root = SymbolTable(None, 'root')
+        root.put('x', VariableSymbol('x', 'int'))
+        inner = root.push_scope('f')
+        inner.put('x', VariableSymbol('x', 'float'))
+        inner.put('y', VariableSymbol('y', 'string'))
+        self.assertEqual(root.get('x').type, 'int')
+        self.assertIsNone(root.get('y'))
+
+    def test_tables_built_apart_do_not_interfere(self):
+        checker, interpreter = SymbolTable(None, 'root'), SymbolTable(None, 'root')
+        checker.put('x', VariableSymbol('x', 'int'))
+        scope = interpreter.push_scope('f')
+        scope.put('x', VariableSymbol('x', 'float'))
+        self.assertEqual(checker.get('x').type, 'int')
+        self.assertIsNone(interpreter.get('x'))
+        scope.pop_scope()
+        self.assertEqual(checker.get('x').type, 'int')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+import support
+
+DEPTH = 20000
+
+
+def nested(operand):
+    """Returns a program printing operand plus 1, DEPTH times over, every sum in parentheses."""
+    return "print " + "(" * DEPTH + operand + " + 1)" * DEPTH + ";\n"
+
+
+class DeepProgramTest(unittest.TestCase):
+    """The passes over the tree check and run programs nested deeper than Python's recursion limit."""
+
+    def test_deep_expression(self):
+        for options in ((), ("--no-optimize",)):
+            status, stdout, stderr = support.run_source(nested("1"), "--mode", "vm", *options)
+            self.assertEqual((status, stdout), (0, "{0}\n".format(DEPTH + 1)), options)
+
+    def test_errors_in_a_deep_expression(self):
+        status, stdout, stderr = support.run_source(nested('"a" - 1'))
+        lines = stdout.splitlines()
+        self.assertEqual(lines[0], "Error: Illegal operation, string - int: line 1")
+        # every enclosing sum adds a None operand
+        self.assertEqual(lines[1:], ["Error: Illegal operation, None + int: line 1"] * DEPTH)
+        self.assertEqual(stderr, "Type check failed -> no interpretation")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+import support
+
+DEEP = """
+int depth(int n) {
+    if (n == 0) {
+        return 0;
+    }
+    return depth(n - 1) + 1;
+}
+print depth(50);
+print depth(200000);
+"""
+
+
+class VirtualMachineTest(unittest.TestCase):
+    """The bytecode vm against the baseline's output."""
+
+    def check(self, *options):
+        for program in support.programs():
+            status, stdout, stderr = support.run_main(program, "--mode", "vm", *options)
+            self.assertEqual(stdout, support.expected(program), support.name(program))
+            self.assertEqual(status, 0, support.name(program))
+
+    def test_programs(self):
+        self.check()
+
+    def test_programs_unoptimized(self):
+        self.check("--no-optimize")
+
+    def test_recursion_beyond_the_python_stack(self):
+        status, stdout, stderr = support.run_source(DEEP, "--mode", "vm")
+        self.assertEqual((status, stdout, stderr), (0, "50\n200000\n", ""))
+
+    def test_stack_budget(self):
+        status, stdout, stderr = support.run_source(DEEP, "--mode", "vm", "--stack-budget", "1000")
+        self.assertEqual(stdout, "50\n")
+        self.assertTrue(stderr.startswith("Stack overflow: Call of depth exceeds the stack budget of 1000 slots"),
+                        stderr)
+        self.assertEqual(status, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
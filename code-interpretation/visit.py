@@ -3,7 +3,7 @@
 
 import inspect
 
-__all__ = ['on', 'when']
+__all__ = ['on', 'when', 'bind_dispatch']
 
 def on(param_name):
   def f(fn):
@@ -37,18 +37,61 @@ class Dispatcher(object):
     top_level = frame.f_locals == frame.f_globals  # seem redundant
     self.param_index = inspect.getargspec(fn).args.index(param_name)
     self.param_name = param_name
+    self.default = fn
     self.targets = {}
+    self.cache = {}
 
   def __call__(self, *args, **kw):
     typ = args[self.param_index].__class__
-    d = self.targets.get(typ)
-    if d is not None:
-      return d(*args, **kw)
+    d = self.cache.get(typ)
+    if d is None:
+      d = self.resolve(typ)
+    return d(*args, **kw)
+
+  def resolve(self, typ):
+    # the most specific target along the MRO wins; classes without any
+    # target fall back to the function decorated with @on
+    for cls in inspect.getmro(typ):
+      target = self.targets.get(cls)
+      if target is not None:
+        break
     else:
-      issub = issubclass
-      t = self.targets
-      ks = t.iterkeys()
-      return [ t[k](*args, **kw) for k in ks if issub(typ, k) ]
+      target = self.default
+    self.cache[typ] = target
+    return target
 
   def add_target(self, typ, target):
     self.targets[typ] = target
+    self.cache.clear()
+
+
+class MethodTable(dict):
+  """Maps concrete classes to the dispatcher's targets bound to one instance."""
+
+  def __init__(self, dispatcher, instance):
+    super(MethodTable, self).__init__()
+    self.dispatcher = dispatcher
+    self.instance = instance
+
+  def bind(self, typ):
+    method = self.dispatcher.resolve(typ).__get__(self.instance, self.instance.__class__)
+    self[typ] = method
+    return method
+
+  __missing__ = bind
+
+
+def bind_dispatch(method, instance):
+  """Returns a one-argument visit function for instance that looks handlers up in
+  a per-class table of bound methods instead of going through Dispatcher.__call__.
+
+  Assign it to instance.visit in __init__ so that node.accept(instance) uses it.
+  """
+  table = MethodTable(method.dispatcher, instance)
+  for typ in method.dispatcher.targets:
+    table.bind(typ)
+
+  def visit(node):
+    return table[node.__class__](node)
+  visit.table = table
+  return visit
@@ -0,0 +1,94 @@
+"""Versioned on-disk cache of the PLY lexer and LALR parser tables.
+
+Tables are named after a hash of the rules they were built from, so an edited
+grammar never picks up stale tables. The code-interpretation, syntax-checker
+and translator front ends share this module and the directory, which can be
+moved with the CPARSER_TABLE_DIR environment variable.
+"""
+import hashlib
+import os
+import sys
+import ply
+import ply.lex as lex
+import ply.yacc as yacc
+
+# Bump when the layout of the cached files changes
+CACHE_VERSION = 1
+
+DIRECTORY_VARIABLE = "CPARSER_TABLE_DIR"
+
+
+def table_directory():
+    """Returns the cache directory, creating it if needed, or None if it cannot be used."""
+    directory = os.environ.get(DIRECTORY_VARIABLE)
+    if not directory:
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        directory = os.path.join(cache_home, "cparser-tables")
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+    except OSError:
+        return None
+    return directory
+
+
+def rules_hash(obj, prefix, attributes):
+    """Hashes the rules named prefix* of obj (regexes or docstrings) and the given attributes."""
+    digest = hashlib.sha1()
+    digest.update(repr((CACHE_VERSION, ply.__version__)))
+    for name in attributes:
+        digest.update(repr((name, getattr(obj, name, None))))
+    for name in sorted(dir(obj)):
+        if name.startswith(prefix):
+            rule = getattr(obj, name)
+            digest.update(repr((name, rule if isinstance(rule, basestring) else rule.__doc__)))
+    return digest.hexdigest()[:16]
+
+
+def build_lexer(scanner):
+    """Builds the lexer of scanner, reading its tables from the cache when possible."""
+    directory = table_directory()
+    if directory is None:
+        return lex.lex(object=scanner)
+
+    lextab = "lextab_" + rules_hash(scanner, "t_", ("tokens", "literals", "states"))
+    # lex imports the table as a module
+    sys.path.insert(0, directory)
+    try:
+        return lex.lex(object=scanner, optimize=1, lextab=lextab, outputdir=directory)
+    finally:
+        sys.path.remove(directory)
+
+
+def build_parser(module):
+    """Builds the LALR parser of module, reading its tables from the cache when possible."""
+    directory = table_directory()
+    if directory is None:
+        return yacc.yacc(module=module, debug=False, write_tables=False)
+
+    parsetab = "parsetab_" + rules_hash(module, "p_", ("tokens", "precedence", "start")) + ".pickle"
+    picklefile = os.path.join(directory, parsetab)
+    if os.path.exists(picklefile):
+        try:
+            return yacc.yacc(module=module, debug=False, picklefile=picklefile)
+        except Exception:
+            # a table left partly written by an older version or a killed
+            # run fails to unpickle in any number of ways; build it again
+            remove(picklefile)
+
+    # yacc writes the table in place, so it is written under a name of this
+    # process and renamed, for other processes to see it whole or not at all
+    partial = "{0}.{1}.tmp".format(picklefile, os.getpid())
+    parser = yacc.yacc(module=module, debug=False, picklefile=partial)
+    try:
+        os.rename(partial, picklefile)
+    except OSError:
+        remove(partial)
+    return parser
+
+
+def remove(filename):
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
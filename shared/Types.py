@@ -0,0 +1,69 @@
+"""Dense table of the result types of the binary operators.
+
+Type names and operators are interned to small integers, code 0 standing for
+anything else (an unknown operator, a failed subexpression's None), so the
+result type of any (op, left, right) is a single list index.
+
+The TypeCheckers of code-interpretation and syntax-checker decide legality
+with it. The engines do not choose operator implementations from it: once a
+program checks, every BinExpr applies the generic function Cparser set, and
+code-interpretation/benchmarks/bench_typed_operators.py shows that the int
+and float methods the index could select are no faster.
+"""
+
+TYPES = ('int', 'float', 'string')
+
+OPERATORS = ('+', '-', '*', '/', '%', '<', '>', '<<', '>>', '|', '&', '^', '<=', '>=', '==', '!=')
+
+
+class Codes(dict):
+    """Interning table; anything not interned has code 0, without being added."""
+
+    def __missing__(self, key):
+        return 0
+
+
+TYPE_CODES = Codes((name, code) for code, name in enumerate(TYPES, 1))
+# the type of a failed subexpression, common enough to skip __missing__
+TYPE_CODES[None] = 0
+OPERATOR_CODES = Codes((op, code) for code, op in enumerate(OPERATORS, 1))
+
+TYPE_COUNT = len(TYPES) + 1
+TABLE_SIZE = (len(OPERATORS) + 1) * TYPE_COUNT * TYPE_COUNT
+
+
+def type_index(op, type_left, type_right):
+    """Returns the position of (op, type_left, type_right) in tables of TABLE_SIZE entries."""
+    return (OPERATOR_CODES[op] * TYPE_COUNT + TYPE_CODES[type_left]) * TYPE_COUNT + TYPE_CODES[type_right]
+
+
+RESULT_TYPES = [None] * TABLE_SIZE
+
+
+def allow(operators, type_left, type_right, result_type):
+    for op in operators:
+        RESULT_TYPES[type_index(op, type_left, type_right)] = result_type
+
+
+allow(OPERATORS, 'int', 'int', 'int')
+
+allow(['+', '-', '*', '/'], 'int', 'float', 'float')
+allow(['+', '-', '*', '/'], 'float', 'int', 'float')
+allow(['+', '-', '*', '/'], 'float', 'float', 'float')
+
+allow(['<', '>', '<=', '>=', '==', '!='], 'int', 'float', 'int')
+allow(['<', '>', '<=', '>=', '==', '!='], 'float', 'int', 'int')
+allow(['<', '>', '<=', '>=', '==', '!='], 'float', 'float', 'int')
+
+allow(['+'], 'string', 'string', 'string')
+allow(['*'], 'string', 'int', 'string')
+
+allow(['<', '>', '<=', '>=', '==', '!='], 'string', 'string', 'int')
+
+
+def result_type(op, type_left, type_right, results=RESULT_TYPES, operators=OPERATOR_CODES, types=TYPE_CODES):
+    """Returns the type of type_left op type_right, or None if the operation is illegal.
+
+    The tables are bound as defaults since the checker calls this for every BinExpr.
+    """
+    return results[(operators[op] * TYPE_COUNT + types[type_left]) * TYPE_COUNT + types[type_right]]
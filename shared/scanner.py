@@ -0,0 +1,212 @@
+
+import mmap
+from array import array
+from bisect import bisect_left
+from TableCache import build_lexer
+
+# characters read at a time by input_file
+CHUNK_SIZE = 1 << 20
+
+
+def map_file(file):
+  """Returns the contents of file as a read-only memory map the lexer scans in place.
+
+  Empty files, pipes and other files that cannot be mapped are read instead.
+  """
+  try:
+    return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+  except (ValueError, EnvironmentError):
+    return file.read()
+
+
+class TokenReplay(object):
+  """Lexer handing the parser tokens lexed beforehand."""
+
+  def __init__(self, tokens):
+    self.tokens = iter(tokens)
+
+  def token(self):
+    return next(self.tokens, None)
+
+
+class Scanner(object):
+  """Lexer producing the tokens of a text given whole or in chunks.
+
+  A whole text, a string or a memory map, is lexed in place. Chunks are
+  lexed a run of complete lines at a time, so only the current chunk and an
+  unfinished line (or an unclosed block comment) are held, and the tokens
+  are generated as the parser asks for them. The positions of the newlines
+  are kept to find the column of a token, indexed as the chunks are lexed
+  or, for a whole text, as far as a column is asked for.
+  """
+
+
+  def find_tok_column(self, token):
+      if self.text is not None and self.indexed < token.lexpos:
+        self.index_newlines(self.text, 0, token.lexpos)
+      index = bisect_left(self.newlines, token.lexpos)
+      last_cr = self.newlines[index - 1] if index else 0
+      return token.lexpos - last_cr
+
+
+  def build(self):
+      self.lexer = build_lexer(self)
+      self.input_chunks([])
+
+  def input(self, text):
+      self.text = text
+      self.newlines = array('l')
+      self.indexed = 0
+      self.lexer.input(text)
+      self.lexer.lineno = 1
+      self.stream = iter(self.lexer.token, None)
+
+  def input_source(self, file, stream=False):
+      """Lexes file mapped into memory or, with stream, read a chunk at a time; see close."""
+      if stream:
+        self.input_file(file)
+      else:
+        self.input(map_file(file))
+
+  def close(self):
+      """Closes the memory map being lexed, if any; the tokens lexed from it stay valid."""
+      if isinstance(self.text, mmap.mmap):
+        self.text.close()
+
+  def input_file(self, file, chunk_size=CHUNK_SIZE):
+      self.input_chunks(iter(lambda: file.read(chunk_size), ''))
+
+  def input_chunks(self, chunks):
+      self.text = None
+      self.newlines = array('l')
+      self.indexed = 0
+      self.stream = self.lex_chunks(chunks)
+
+  def token(self):
+      return next(self.stream, None)
+
+  def lex_chunks(self, chunks):
+      lexer = self.lexer
+      lineno = 1
+      offset = 0      # position of pending in the whole text
+      pending = ''
+      chunks = iter(chunks)
+      final = False
+      while not final:
+        chunk = next(chunks, None)
+        final = chunk is None
+        if not final:
+          pending += chunk
+          # only the newline of a comment may be inside a token
+          end = pending.rfind('\n') + 1
+          if not end:
+            continue
+        else:
+          end = len(pending)
+
+        self.index_newlines(pending, offset, end)
+        lexer.input(pending[:end])
+        lexer.lineno = lineno
+        resume = end
+        token = lexer.token()
+        while token is not None:
+          following = lexer.token()
+          # '/' then '*': a block comment whose end has not been read yet
+          if (token.type == '/' and following is not None and following.type == '*' and
+              following.lexpos == token.lexpos + 1 and not final):
+            resume = token.lexpos
+            break
+          token.lexpos += offset
+          yield token
+          token = following
+        lineno = token.lineno if token is not None else lexer.lineno
+
+        pending = pending[resume:]
+        offset += resume
+
+  def index_newlines(self, text, offset, end):
+      """Indexes the newlines before end in text, which starts at offset in the whole text."""
+      position = text.find('\n', max(self.indexed - offset, 0), end)
+      while position >= 0:
+        self.newlines.append(offset + position)
+        position = text.find('\n', position + 1, end)
+      self.indexed = max(self.indexed, offset + end)
+
+
+
+  literals = "{}()<>=;:,+-*/%&|^"
+
+
+  reserved = {
+   'break'   : 'BREAK',
+   'continue': 'CONTINUE',
+   'if'      : 'IF',
+   'else'    : 'ELSE',
+   'print'   : 'PRINT',
+   'repeat'  : 'REPEAT',
+   'return'  : 'RETURN',
+   'while'   : 'WHILE',
+   'until'   : 'UNTIL',
+  }
+
+
+  tokens = [ "AND", "EQ", "FLOAT", "GE", "ID", "INTEGER", "LE", "NEQ", "OR",
+             "SHL", "SHR", "STRING", "TYPE",  ] + list(reserved.values())
+           
+
+  t_ignore = ' \t\f'
+
+  def t_newline(self,t):
+      r'\n+'
+      t.lexer.lineno += len(t.value)
+
+  def t_newline2(self,t):
+      r'(\r\n)+'
+      t.lexer.lineno += len(t.value) / 2
+
+
+  def t_error(self,t):
+      print("Illegal character '{0}' ({1}) in line {2}".format(t.value[0], hex(ord(t.value[0])), t.lexer.lineno))
+      t.lexer.skip(1)
+
+
+  def t_LINE_COMMENT(self,t):
+      r'\#.*'
+      pass
+
+  def t_BLOCK_COMMENT(self,t):
+      r'/\*(.|\n)*?\*/'
+      t.lexer.lineno += t.value.count('\n')
+      
+
+  def t_FLOAT(self,t):
+      r"\d+(\.\d*)|\.\d+"
+      return t
+
+  def t_INTEGER(self,t):
+      r"\d+"
+      return t
+  
+  def t_STRING(self,t):
+      r'\"([^\\\n]|(\\.))*?\"'
+      return t
+
+
+  t_EQ = r"=="
+  t_NEQ = r"!="
+  t_LE = r"<="
+  t_GE = r">="
+  t_OR = r"\|\|"
+  t_AND = r"&&"
+  t_SHL = r"<<"
+  t_SHR = r">>"
+
+
+  def t_TYPE(self,t):
+      r"\b(int|float|string)\b"
+      return t
+  
+  def t_ID(self,t):
+      r"[a-zA-Z_]\w*"
+      t.type = Scanner.reserved.get(t.value, 'ID')
+      return t
@@ -1,11 +1,14 @@
 
 class Node(object):
+    __slots__ = ()
 
     def __str__(self):
         return self.printTree()
 
 
 class NodeList(Node):
+    __slots__ = ('children',)
+
     def __init__(self):
         super(NodeList, self).__init__()
 
@@ -22,51 +25,63 @@ class NodeList(Node):
 
 
 class Const(Node):
+    __slots__ = ('line', 'value')
+
     def __init__(self, line, value):
         self.line = line
         self.value = value
 
 
 class Integer(Const):
-    pass
+    __slots__ = ()
 
 
 class Float(Const):
-    pass
+    __slots__ = ()
 
 
 class String(Const):
-    pass
+    __slots__ = ()
 
 
 class Variable(Node):
+    __slots__ = ('line', 'name')
+
     def __init__(self, line, name):
         self.line = line
         self.name = name
 
 
 class BinExpr(Node):
+    __slots__ = ('line', 'left', 'op', 'right')
+
     def __init__(self, line, left, op, right):
         self.line = line
         self.left = left
         self.op = op
         self.right = right
 
-        # if you want to use somewhere generic_visit method instead of visit_XXX in visitor
-        # definition of children field is required in each class from AST
-        self.children = (left, right)
+    # if you want to use somewhere generic_visit method instead of visit_XXX in visitor
+    # definition of children field is required in each class from AST
+    @property
+    def children(self):
+        return self.left, self.right
 
 
 class ExpressionList(NodeList):
-    pass
+    __slots__ = ()
 
 
 class GroupedExpression(Node):
+    __slots__ = ('interior',)
+
     def __init__(self, interior):
         self.interior = interior
 
 
 class FunctionExpression(Node):
+    __slots__ = ('line', 'retType', 'name', 'args', 'body')
+
     def __init__(self, line, retType, name, args, body):
         self.line = line
         self.retType = retType
@@ -76,16 +91,20 @@ class FunctionExpression(Node):
 
 
 class DeclarationList(NodeList):
-    pass
+    __slots__ = ()
 
 
 class Declaration(Node):
+    __slots__ = ('type', 'inits')
+
     def __init__(self, type, inits):
         self.type = type
         self.inits = inits
 
 
 class InvocationExpression(Node):
+    __slots__ = ('line', 'name', 'args')
+
     def __init__(self, line, name, args):
         self.line = line
         self.name = name
@@ -93,6 +112,8 @@ class InvocationExpression(Node):
 
 
 class Argument(Node):
+    __slots__ = ('line', 'type', 'name')
+
     def __init__(self, line, type, name):
         self.line = line
         self.type = type
@@ -100,14 +121,16 @@ class Argument(Node):
 
 
 class ArgumentList(NodeList):
-    pass
+    __slots__ = ()
 
 
 class InitList(NodeList):
-    pass
+    __slots__ = ()
 
 
 class Init(Node):
+    __slots__ = ('name', 'expr', 'line')
+
     def __init__(self, line, name, expr):
         self.name = name
         self.expr = expr
@@ -115,22 +138,28 @@ class Init(Node):
 
 
 class InstructionList(NodeList):
-    pass
+    __slots__ = ()
 
 
 class PrintInstruction(Node):
+    __slots__ = ('line', 'expr')
+
     def __init__(self, line, expr):
         self.line = line
         self.expr = expr
 
 
 class LabeledInstruction(Node):
+    __slots__ = ('id', 'instr')
+
     def __init__(self, id, instr):
         self.id = id
         self.instr = instr
 
 
 class AssignmentInstruction(Node):
+    __slots__ = ('line', 'id', 'expr')
+
     def __init__(self, line, id, expr):
         self.line = line
         self.id = id
@@ -138,12 +167,16 @@ class AssignmentInstruction(Node):
 
 
 class CompoundInstruction(Node):
+    __slots__ = ('declarations', 'instructions')
+
     def __init__(self, declarations, instructions):
         self.declarations = declarations
         self.instructions = instructions
 
 
 class ChoiceInstruction(Node):
+    __slots__ = ('condition', 'action', 'alternateAction')
+
     def __init__(self, condition, action, alternateAction=None):
         self.condition = condition
         self.action = action
@@ -151,42 +184,56 @@ class ChoiceInstruction(Node):
 
 
 class RepeatInstruction(Node):
+    __slots__ = ('instructions', 'condition')
+
     def __init__(self, instructions, condition):
         self.instructions = instructions
         self.condition = condition
 
 
 class WhileInstruction(Node):
+    __slots__ = ('condition', 'instruction')
+
     def __init__(self, condition, instruction):
         self.condition = condition
         self.instruction = instruction
 
 
 class ReturnInstruction(Node):
+    __slots__ = ('line', 'expression')
+
     def __init__(self, line, expression):
         self.line = line
         self.expression = expression
 
 
 class BreakInstruction(Node):
+    __slots__ = ('line',)
+
     def __init__(self, line):
         self.line = line
 
 
 class ContinueInstruction(Node):
+    __slots__ = ('line',)
+
     def __init__(self, line):
         self.line = line
 
 
 class Program(Node):
+    __slots__ = ('program_blocks',)
+
     def __init__(self, program_blocks):
         self.program_blocks = program_blocks
 
 
 class ProgramBlockList(NodeList):
-    pass
+    __slots__ = ()
 
 
 class ProgramBlock(Node):
+    __slots__ = ('block',)
+
     def __init__(self, block):
         self.block = block
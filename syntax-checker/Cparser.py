@@ -1,6 +1,7 @@
 #!/usr/bin/python
 import re
 
+import paths  # puts ../shared on sys.path
 from scanner import Scanner
 import AST
 
@@ -0,0 +1,426 @@
+"""Incremental checking of a source file that is edited between checks.
+
+IncrementalChecker.update keeps the tokens, the top-level blocks with their
+parsed program_blocks and the diagnostics of the previous text. Only the
+tokens around the edited region are lexed again, only the top-level blocks
+made of new tokens are parsed again, and a block is type checked again only
+if it was re-parsed, moved to other lines while having messages, or reads a
+global name or function whose declaration changed. The diagnostics are those main.py
+prints, except that syntax errors are recovered from per block and a block
+with syntax errors is not type checked, its tree having holes.
+"""
+import sys
+
+import AST
+import paths  # puts ../shared on sys.path
+from Cparser import Cparser
+from scanner import Scanner, TokenReplay
+from SymbolTable import SymbolTable, FunctionSymbol
+from TableCache import build_parser
+from TypeChecker import TypeChecker
+
+
+class IllegalCharacter(object):
+    """Character skipped by the lexer, kept to be reported with every check."""
+
+    def __init__(self, lexpos, lineno, char):
+        self.lexpos = lexpos
+        self.lineno = lineno
+        self.char = char
+
+    def message(self):
+        return "Illegal character '{0}' ({1}) in line {2}".format(self.char, hex(ord(self.char)), self.lineno)
+
+
+class RecordingScanner(Scanner):
+
+    def build(self):
+        self.errors = []
+        Scanner.build(self)
+
+    def t_error(self, t):
+        self.errors.append(IllegalCharacter(t.lexpos, t.lexer.lineno, t.value[0]))
+        t.lexer.skip(1)
+
+
+class BlockParser(Cparser):
+    """Parser of the tokens of one top-level block, keeping its syntax errors."""
+
+    def __init__(self):
+        self.errors = []
+
+    def p_error(self, p):
+        self.errors.append(p)
+
+
+class RootSymbols(dict):
+    """Symbols of the root scope; reading one through get is recorded."""
+
+    def __init__(self, table):
+        super(RootSymbols, self).__init__()
+        self.table = table
+
+    def get(self, name, default=None):
+        self.table.record(name)
+        return dict.get(self, name, default)
+
+
+class TrackingTable(SymbolTable):
+    """SymbolTable recording the global names a block reads and defines.
+
+    reads maps every name looked up before the block defined it to the
+    signature of its global symbol at the time; writes lists the symbols the
+    block put into the root scope, in order.
+    """
+
+    def __init__(self, parent, name):
+        super(TrackingTable, self).__init__(parent, name)
+        if parent is None:
+            self.root = self
+            self.symbols = RootSymbols(self)
+            self.begin_block()
+        else:
+            self.root = parent.root
+
+    def begin_block(self):
+        self.reads = {}
+        self.writes = []
+        self.written = set()
+
+    def record(self, name):
+        if name not in self.reads and name not in self.written:
+            self.reads[name] = signature(dict.get(self.symbols, name))
+
+    def put(self, name, symbol):
+        if self.parent is None:
+            self.writes.append((name, symbol))
+            self.written.add(name)
+        super(TrackingTable, self).put(name, symbol)
+
+    def get(self, name):
+        self.root.record(name)
+        return super(TrackingTable, self).get(name)
+
+    def push_scope(self, name):
+        return TrackingTable(self, name)
+
+
+def signature(symbol):
+    """Returns what the checking of other blocks can observe of a global symbol."""
+    if symbol is None:
+        return None
+    if isinstance(symbol, FunctionSymbol):
+        return 'function', symbol.type, tuple(arg.type for arg in symbol.args or ())
+    return 'variable', symbol.type
+
+
+class Capture(object):
+    """Stands in for sys.stdout to collect what the TypeChecker prints."""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, text):
+        self.parts.append(text)
+
+    def lines(self):
+        return "".join(self.parts).splitlines()
+
+
+class Block(object):
+    """Tokens start:end of one top-level block with its parse and check results."""
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+        self.nodes = None
+        self.syntax_errors = []
+        self.parsed_line = None
+        self.checked_nodes = None
+        self.checked_line = None
+        self.reads = {}
+        self.writes = []
+        self.messages = []
+
+
+def common_prefix_length(a, b):
+    """Length of the longest common prefix of a and b, compared in slices."""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def common_suffix_length(a, b, limit):
+    """Length of the longest common suffix of a and b, at most limit."""
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle:len(a) - low] == b[len(b) - middle:len(b) - low]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def first_token_at(tokens, position):
+    """Index of the first token starting at or after position."""
+    low, high = 0, len(tokens)
+    while low < high:
+        middle = (low + high) // 2
+        if tokens[middle].lexpos < position:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def block_end(tokens, start):
+    """Index one past the last token of the top-level block starting at start.
+
+    A block ends with a ';' or '}' outside any braces and repeat ... until,
+    unless an else follows it.
+    """
+    depth = repeats = 0
+    index, count = start, len(tokens)
+    while index < count:
+        kind = tokens[index].type
+        index += 1
+        if kind == '{':
+            depth += 1
+            continue
+        if kind == '}':
+            depth = max(depth - 1, 0)
+        elif kind == 'REPEAT':
+            repeats += 1
+            continue
+        elif kind == 'UNTIL':
+            repeats = max(repeats - 1, 0)
+            continue
+        elif kind != ';':
+            continue
+
+        if depth == 0 and repeats == 0 and (index == count or tokens[index].type != 'ELSE'):
+            return index
+    return count
+
+
+def shift_lines(node, offset):
+    """Adds offset to the line of every node under node."""
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, AST.NodeList):
+            pending.extend(node.children)
+            continue
+        for cls in node.__class__.__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                value = getattr(node, name, None)
+                if name == 'line' and value is not None:
+                    node.line = value + offset
+                elif isinstance(value, AST.Node):
+                    pending.append(value)
+
+
+class IncrementalChecker(object):
+    """Re-checks successive versions of one source text.
+
+    After every update, relexed, reparsed and rechecked count the tokens and
+    blocks that could not be reused.
+    """
+
+    def __init__(self):
+        self.scanner = RecordingScanner()
+        self.scanner.build()
+        self.block_parser = BlockParser()
+        self.parser = build_parser(self.block_parser)
+
+        self.text = ""
+        self.tokens = []
+        self.blocks = []
+        self.relexed = self.reparsed = self.rechecked = 0
+
+    def update(self, text):
+        """Checks text, reusing what it shares with the previous one; returns the diagnostics."""
+        keep, added, resume = self.relex(text)
+        self.split(keep, added, resume)
+        self.parse()
+        syntax_messages = self.syntax_messages()
+        return syntax_messages + self.check()
+
+    def relex(self, text):
+        """Lexes text again from the last token before the edit until the tokens fall back in step.
+
+        Returns the number of tokens kept in front, the number of new ones and
+        the index of the first old token reused after them.
+        """
+        old, tokens = self.text, self.tokens
+        prefix = common_prefix_length(old, text)
+        suffix = common_suffix_length(old, text, min(len(old), len(text)) - prefix)
+        old_end, new_end = len(old) - suffix, len(text) - suffix
+        delta = len(text) - len(old)
+
+        # A failed match may have looked past the token it fell back to: a
+        # string up to the end of its line, a block comment to the end of the
+        # text. Lexing resumes after the last token ending before both.
+        safe = text.rfind('\n', 0, prefix) + 1
+        opening = text.find('/*', max(text.rfind('*/', 0, prefix) - 1, 0), prefix)
+        if opening >= 0:
+            safe = min(safe, opening)
+        keep = first_token_at(tokens, safe)
+        while keep and tokens[keep - 1].lexpos + len(tokens[keep - 1].value) >= safe:
+            keep -= 1
+        restart = tokens[keep - 1].lexpos + len(tokens[keep - 1].value) if keep else 0
+
+        errors = self.scanner.errors
+        self.scanner.errors = [error for error in errors if error.lexpos < restart]
+        self.scanner.input(text)
+        lexer = self.scanner.lexer
+        lexer.lexpos = restart
+        lexer.lineno = 1 + text.count('\n', 0, restart)
+
+        resume = first_token_at(tokens, old_end)
+        added = []
+        tail = []
+        while True:
+            token = lexer.token()
+            if token is None:
+                resume = len(tokens)
+                break
+            if token.lexpos >= new_end:
+                while resume < len(tokens) and tokens[resume].lexpos + delta < token.lexpos:
+                    resume += 1
+                if resume < len(tokens):
+                    same = tokens[resume]
+                    if (same.lexpos + delta == token.lexpos and same.type == token.type and
+                            same.value == token.value):
+                        tail = tokens[resume:]
+                        break
+            added.append(token)
+
+        if tail:
+            lines = token.lineno - tail[0].lineno
+            synced = tail[0].lexpos
+            for token in tail:
+                token.lexpos += delta
+                token.lineno += lines
+            for error in errors:
+                if error.lexpos >= synced:
+                    error.lexpos += delta
+                    error.lineno += lines
+                    self.scanner.errors.append(error)
+
+        self.text = text
+        self.tokens = tokens[:keep] + added + tail
+        self.relexed = len(added)
+        return keep, len(added), resume
+
+    def split(self, keep, added, resume):
+        """Splits the tokens into top-level blocks, reusing the blocks of unchanged tokens."""
+        tokens, old_blocks = self.tokens, self.blocks
+        shift = keep + added - resume
+
+        blocks = []
+        index = 0
+        # the end of a block depends on the token after it
+        while index < len(old_blocks) and old_blocks[index].end < keep:
+            blocks.append(old_blocks[index])
+            index += 1
+        position = blocks[-1].end if blocks else 0
+
+        while position < len(tokens):
+            while index < len(old_blocks) and old_blocks[index].start + shift < position:
+                index += 1
+            if (index < len(old_blocks) and old_blocks[index].start >= resume and
+                    old_blocks[index].start + shift == position):
+                for block in old_blocks[index:]:
+                    block.start += shift
+                    block.end += shift
+                    blocks.append(block)
+                break
+
+            end = block_end(tokens, position)
+            blocks.append(Block(position, end))
+            position = end
+
+        self.blocks = blocks
+
+    def parse(self):
+        self.reparsed = 0
+        for block in self.blocks:
+            line = self.tokens[block.start].lineno
+            if block.nodes is not None:
+                if block.parsed_line != line:
+                    for node in block.nodes:
+                        shift_lines(node, line - block.parsed_line)
+                    block.parsed_line = line
+                continue
+
+            self.block_parser.errors = []
+            program = self.parser.parse(lexer=TokenReplay(self.tokens[block.start:block.end]))
+            block.nodes = program.program_blocks.children if program is not None else []
+            block.syntax_errors = self.block_parser.errors
+            block.parsed_line = line
+            self.reparsed += 1
+
+    def syntax_messages(self):
+        messages = []
+        errors = iter(self.scanner.errors)
+        error = next(errors, None)
+        for block in self.blocks:
+            last = self.tokens[block.end - 1].lexpos
+            while error is not None and error.lexpos < last:
+                messages.append(error.message())
+                error = next(errors, None)
+
+            for token in block.syntax_errors:
+                if token is None:
+                    messages.append('End of input')
+                else:
+                    messages.append("Syntax error at line {0}, column {1}: LexToken({2}, '{3}')".format(
+                        token.lineno, self.scanner.find_tok_column(token), token.type, token.value))
+
+        while error is not None:
+            messages.append(error.message())
+            error = next(errors, None)
+        return messages
+
+    def check(self):
+        """Type checks the blocks in order, reusing the messages of those whose inputs are unchanged."""
+        root = TrackingTable(None, 'root')
+        checker = TypeChecker()
+        checker.table = root
+
+        self.rechecked = 0
+        messages = []
+        for block in self.blocks:
+            line = self.tokens[block.start].lineno
+            # messages name lines, so only a block without any may move
+            if (block.checked_nodes is block.nodes and (block.checked_line == line or not block.messages) and
+                    all(signature(dict.get(root.symbols, name)) == read for name, read in block.reads.iteritems())):
+                for name, symbol in block.writes:
+                    SymbolTable.put(root, name, symbol)
+            else:
+                root.begin_block()
+                capture = Capture()
+                if not block.syntax_errors:
+                    stdout, sys.stdout = sys.stdout, capture
+                    try:
+                        for node in block.nodes:
+                            checker.visit(node)
+                    finally:
+                        sys.stdout = stdout
+
+                block.checked_nodes = block.nodes
+                block.checked_line = line
+                block.reads = root.reads
+                block.writes = root.writes
+                block.messages = capture.lines()
+                self.rechecked += 1
+
+            messages.extend(block.messages)
+        return messages
@@ -0,0 +1,126 @@
+"""Counters and per-phase timings of one check, reported by main.py --stats.
+
+Nothing here is used unless --stats is given: a run without it builds none
+of these objects and goes through the plain scanner and table. With it, the
+source is lexed completely before it is parsed so that the two phases are
+timed apart, and the type checker starts from a CountingSymbolTable.
+"""
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+import AST
+import paths  # puts ../shared on sys.path
+from SymbolTable import SymbolTable
+from scanner import TokenReplay
+
+
+class CountingSymbolTable(SymbolTable):
+    """SymbolTable counting the lookups made in all the scopes of its chain."""
+
+    def __init__(self, parent, name):
+        super(CountingSymbolTable, self).__init__(parent, name)
+        self.lookups = parent.lookups if parent is not None else [0]
+
+    def get(self, name):
+        self.lookups[0] += 1
+        return super(CountingSymbolTable, self).get(name)
+
+
+# class -> names of the fields that may hold child nodes
+NODE_FIELDS = {}
+
+
+def node_fields(cls):
+    fields = NODE_FIELDS.get(cls)
+    if fields is None:
+        fields = NODE_FIELDS[cls] = [field for base in cls.__mro__ for field in base.__dict__.get('__slots__', ())]
+    return fields
+
+
+def count_nodes(root):
+    """Returns the number of nodes of every class in the tree under root."""
+    counts = {}
+    pending = [root]
+    while pending:
+        node = pending.pop()
+        name = node.__class__.__name__
+        counts[name] = counts.get(name, 0) + 1
+        for field in node_fields(node.__class__):
+            value = getattr(node, field, None)
+            if isinstance(value, AST.Node):
+                pending.append(value)
+            elif isinstance(value, list):
+                pending.extend(child for child in value if isinstance(child, AST.Node))
+    return counts
+
+
+class NotTimed(object):
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NOT_TIMED = NotTimed()
+
+
+def phase(stats, name):
+    """Returns a context timing the phase name into stats, doing nothing when stats is None."""
+    return stats.phase(name) if stats is not None else NOT_TIMED
+
+
+class Stats(object):
+    """Timings and counters of one run, reported as a JSON object."""
+
+    def __init__(self):
+        self.phases = []
+        self.counters = {}
+        self.lookups = None
+
+    @contextmanager
+    def phase(self, name):
+        wall, cpu = time.time(), time.clock()
+        try:
+            yield
+        finally:
+            self.phases.append({'phase': name, 'wall': time.time() - wall, 'cpu': time.clock() - cpu})
+
+    def parse(self, parser, scanner, text=None):
+        """Lexes and then parses text, by default the input scanner was given, timing each; returns the AST."""
+        with self.phase('lex'):
+            if text is not None:
+                scanner.input(text)
+            tokens = list(iter(scanner.token, None))
+        self.counters['tokens'] = len(tokens)
+        with self.phase('parse'):
+            ast = parser.parse(lexer=TokenReplay(tokens))
+        if ast:
+            nodes = count_nodes(ast)
+            self.counters['nodes'] = nodes
+            self.counters['node_count'] = sum(nodes.values())
+        return ast
+
+    def count_lookups(self, type_checker):
+        """Has type_checker, before it visits anything, count its symbol lookups."""
+        type_checker.table = CountingSymbolTable(None, 'root')
+        self.lookups = type_checker.table.lookups
+
+    def report(self):
+        report = {'phases': self.phases}
+        report.update(self.counters)
+        if self.lookups is not None:
+            report['symbol_lookups'] = self.lookups[0]
+        return report
+
+    def write(self, filename=None):
+        """Writes the report to filename, by default to stderr."""
+        text = json.dumps(self.report(), indent=2, sort_keys=True) + "\n"
+        if filename is None or filename == "-":
+            sys.stderr.write(text)
+        else:
+            with open(filename, "w") as file:
+                file.write(text)
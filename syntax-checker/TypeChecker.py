@@ -1,81 +1,110 @@
 #!/usr/bin/python
-from collections import defaultdict
+from types import GeneratorType
 from SymbolTable import SymbolTable, FunctionSymbol, VariableSymbol
+import paths  # puts ../shared on sys.path
+from Types import result_type
 
 import AST
 
 
-class NodeVisitor(object):
+class Visit(object):
+    """Request to visit node with keyword arguments, yielded by a visit_ generator."""
 
-    def __init__(self):
-        self.ttype = self.init_ttype()
+    def __init__(self, node, **kwargs):
+        self.node = node
+        self.kwargs = kwargs
 
-    def init_ttype(self):
-        ttype = defaultdict(lambda: defaultdict(dict))
 
-        for op in ['+', '-', '*', '/', '%', '<', '>', '<<', '>>', '|', '&', '^', '<=', '>=', '==', '!=']:
-            ttype[op]['int']['int'] = 'int'
+class Result(object):
+    """Value of a visit_ generator, yielded as its last step."""
 
-        for op in ['+', '-', '*', '/']:
-            ttype[op]['int']['float'] = 'float'
-            ttype[op]['float']['int'] = 'float'
-            ttype[op]['float']['float'] = 'float'
+    def __init__(self, value):
+        self.value = value
 
-        for op in ['<', '>', '<=', '>=', '==', '!=']:
-            ttype[op]['int']['float'] = 'int'
-            ttype[op]['float']['int'] = 'int'
-            ttype[op]['float']['float'] = 'int'
 
-        ttype['+']['string']['string'] = 'string'
-        ttype['*']['string']['int'] = 'string'
+class NodeVisitor(object):
+    """Visits trees of any depth without recursing in Python.
 
-        for op in ['<', '>', '<=', '>=', '==', '!=']:
-            ttype[op]['string']['string'] = 'int'
+    A visit_ method either returns its value directly or is a generator: it
+    yields a child (or a Visit) to have it visited and receives the child's
+    value back, then yields a Result, or simply ends to produce None. The
+    generators are driven from an explicit stack by visit. The method for a
+    node class is looked up once per visitor class.
+    """
 
-        return ttype
+    # visitor class -> {node class: visit_ function}
+    methods = {}
 
     def visit(self, node, **kwargs):
-        method = 'visit_' + node.__class__.__name__
-        visitor = getattr(self, method, self.generic_visit)
-        return visitor(node, **kwargs)
+        methods = NodeVisitor.methods.get(self.__class__)
+        if methods is None:
+            methods = NodeVisitor.methods[self.__class__] = {}
+
+        value = self.call(methods, node, kwargs)
+        if value.__class__ is not GeneratorType:
+            return value
+
+        pending = [value]
+        value = None
+        while pending:
+            try:
+                request = pending[-1].send(value)
+            except StopIteration:
+                pending.pop()
+                value = None
+                continue
+
+            cls = request.__class__
+            if cls is Result:
+                # dropping the generator finishes it
+                pending.pop()
+                value = request.value
+                continue
+
+            if cls is Visit:
+                value = self.call(methods, request.node, request.kwargs)
+            else:
+                method = methods.get(cls)
+                if method is None:
+                    method = self.find_method(methods, cls)
+                value = method(self, request)
+
+            if value.__class__ is GeneratorType:
+                pending.append(value)
+                value = None
+        return value
+
+    def call(self, methods, node, kwargs):
+        method = methods.get(node.__class__)
+        if method is None:
+            method = self.find_method(methods, node.__class__)
+        return method(self, node, **kwargs)
+
+    def find_method(self, methods, cls):
+        method = getattr(self.__class__, 'visit_' + cls.__name__, self.__class__.generic_visit)
+        methods[cls] = method = method.__func__
+        return method
 
     def generic_visit(self, node, **kwargs):        # Called if no explicit visitor function exists for a node.
-        if isinstance(node, list):
-            for elem in node:
-                self.visit(elem, **kwargs)
-        else:
-            for child in node.children:
-                if isinstance(child, list):
-                    for item in child:
-                        if isinstance(item, AST.Node):
-                            self.visit(item, **kwargs)
-                elif isinstance(child, AST.Node):
-                    self.visit(child, **kwargs)
-
-    def get_type(self, operator, type_left, type_right):
-        if operator not in self.ttype:
-            return None
+        children = node if isinstance(node, list) else node.children
+        for child in children:
+            if isinstance(child, list):
+                for item in child:
+                    if isinstance(item, AST.Node):
+                        yield Visit(item, **kwargs)
+            elif isinstance(child, AST.Node):
+                yield Visit(child, **kwargs) if kwargs else child
 
-        if type_left not in self.ttype[operator]:
-            return None
-
-        if type_right not in self.ttype[operator][type_left]:
-            return None
-
-        return self.ttype[operator][type_left][type_right]
+    get_type = staticmethod(result_type)
 
 
 class TypeChecker(NodeVisitor):
 
-    WHILE_SCOPE = 'while_instruction'
-    REPEAT_SCOPE = 'repeat_instruction'
-
-    LOOP_SCOPES = (WHILE_SCOPE, REPEAT_SCOPE)
-
     def __init__(self):
         super(TypeChecker, self).__init__()
 
         self.table = SymbolTable(None, 'root')
+        self.loop_depth = 0
         self.current_function = None
         self.current_type = None
         self.returned_type = None
@@ -90,8 +119,8 @@ class TypeChecker(NodeVisitor):
         return 'string'
 
     def visit_BinExpr(self, node, **kwargs):
-        type_left = self.visit(node.left)
-        type_right = self.visit(node.right)
+        type_left = yield node.left
+        type_right = yield node.right
         operator = node.op
 
         result_type = self.get_type(operator, type_left, type_right)
@@ -100,9 +129,9 @@ class TypeChecker(NodeVisitor):
             print "Error: Illegal operation, {} {} {}: line {}".format(
                 type_left, node.op, type_right, node.line
             )
-            return None
+            return
 
-        return result_type
+        yield Result(result_type)
 
     def visit_Variable(self, node, **kwargs):
         symbol = self.table.get(node.name)
@@ -120,20 +149,21 @@ class TypeChecker(NodeVisitor):
 
     def visit_AssignmentInstruction(self, node, **kwargs):
         symbol = self.table.get(node.id)
-        expression_type = self.visit(node.expr)
+        expression_type = yield node.expr
 
         if symbol is None:
             print "Error: Variable '{}' undefined in current scope: line {}".format(
                 node.id, node.line
             )
         elif symbol.type == "float" and expression_type == "int":
-            return symbol.type
+            yield Result(symbol.type)
         elif expression_type and expression_type != symbol.type:
             print "Error: Illegal assignment of {} to {}: line {}.".format(expression_type, symbol.type, node.line)
-            return symbol.type
+            yield Result(symbol.type)
 
     def visit_GroupedExpression(self, node, **kwargs):
-        return self.visit(node.interior)
+        interior_type = yield node.interior
+        yield Result(interior_type)
 
     def visit_FunctionExpression(self, node, **kwargs):
         if self.table.symbols.get(node.name):
@@ -147,8 +177,8 @@ class TypeChecker(NodeVisitor):
             self.returned_type = None
 
             if node.args is not None:
-                self.visit(node.args)
-            self.visit(node.body, after_fun_def=True)
+                yield node.args
+            yield Visit(node.body, after_fun_def=True)
 
             self.current_function = None
             self.table = self.table.pop_scope()
@@ -164,15 +194,15 @@ class TypeChecker(NodeVisitor):
             self.table = self.table.push_scope("inner_scope")
 
         if node.declarations is not None:
-            self.visit(node.declarations)
-        self.visit(node.instructions)
+            yield node.declarations
+        yield node.instructions
 
         if not after_fun_def:
             self.table = self.table.pop_scope()
 
     def visit_ArgumentList(self, node, **kwargs):
         for arg in node.children:
-            self.visit(arg)
+            yield arg
 
     def visit_Argument(self, node, **kwargs):
         if self.table.symbols.get(node.name) is not None:
@@ -192,45 +222,47 @@ class TypeChecker(NodeVisitor):
                 )
 
             else:
-                types = [self.visit(x) for x in node.args.children]
+                types = []
+                for x in node.args.children:
+                    types.append((yield x))
 
                 for actual, expected in zip(types, function_symbol.args):
                     if actual != expected.type and not (actual == "int" and expected.type == "float"):
                         print "Error: Improper type of args in {} call: line {}".format(node.name, node.line)
                         break
 
-            return function_symbol.type
+            yield Result(function_symbol.type)
 
     def visit_ChoiceInstruction(self, node, **kwargs):
-        self.visit(node.condition)
-        self.visit(node.action)
+        yield node.condition
+        yield node.action
 
         if node.alternateAction is not None:
-            self.visit(node.alternateAction)
+            yield node.alternateAction
 
     def visit_WhileInstruction(self, node, **kwargs):
-        self.visit(node.condition)
+        yield node.condition
 
-        self.table = self.table.push_scope(self.WHILE_SCOPE)
-        self.visit(node.instruction)
-        self.table = self.table.pop_scope()
+        self.loop_depth += 1
+        yield node.instruction
+        self.loop_depth -= 1
 
     def visit_RepeatInstruction(self, node, **kwargs):
-        self.visit(node.condition)
+        yield node.condition
 
-        self.table = self.table.push_scope(self.REPEAT_SCOPE)
-        self.visit(node.instructions)
-        self.table = self.table.pop_scope()
+        self.loop_depth += 1
+        yield node.instructions
+        self.loop_depth -= 1
 
     def visit_ReturnInstruction(self, node, **kwargs):
         if self.current_function is None:
             print "Error: return instruction outside a function: line {}".format(node.line)
-            return None
+            return
 
-        expression_type = self.visit(node.expression)
+        expression_type = yield node.expression
 
         if self.current_function.type == 'float' and expression_type == 'int':
-            return self.current_function.type
+            yield Result(self.current_function.type)
 
         if expression_type and expression_type != self.current_function.type:
             print "Error: Improper returned type, expected {}, got {}: line {}".format(
@@ -238,28 +270,28 @@ class TypeChecker(NodeVisitor):
             )
 
         self.returned_type = expression_type
-        return expression_type
+        yield Result(expression_type)
 
     def visit_Declaration(self, node, **kwargs):
         self.current_type = node.type
-        self.visit(node.inits)
+        yield node.inits
         self.current_type = None
 
     def visit_ContinueInstruction(self, node, **kwargs):
-        if not any(self.table.has_scope_name(name) for name in self.LOOP_SCOPES):
+        if not self.loop_depth:
             print "Error: continue instruction outside a loop: line {}".format(node.line)
 
     def visit_BreakInstruction(self, node, **kwargs):
-        if not any(self.table.has_scope_name(name) for name in self.LOOP_SCOPES):
+        if not self.loop_depth:
             print "Error: break instruction outside a loop: line {}".format(node.line)
 
     def visit_Init(self, node, **kwargs):
-        expression_type = self.visit(node.expr)
+        expression_type = yield node.expr
 
         definition = self.table.get(node.name)
         if definition is not None and isinstance(definition, FunctionSymbol):
             print "Error: Function identifier '{0}' used as a variable: line {1}".format(node.name, node.line)
-            return None
+            return
 
         if (expression_type == self.current_type or
                 (expression_type == "int" and self.current_type == "float") or
@@ -273,17 +305,17 @@ class TypeChecker(NodeVisitor):
             print "Error: Assignment of {} to {}: line {}".format(expression_type, self.current_type, node.line)
 
     def visit_PrintInstruction(self, node, **kwargs):
-        self.visit(node.expr)
+        yield node.expr
 
     def visit_LabeledInstruction(self, node, **kwargs):
-        self.visit(node.instr)
+        yield node.instr
 
     def visit_Program(self, node, **kwargs):
-        self.visit(node.program_blocks)
+        yield node.program_blocks
 
     def visit_ProgramBlockList(self, node, **kwargs):
         for program_block in node.children:
-            self.visit(program_block)
+            yield program_block
 
     def visit_ProgramBlock(self, node, **kwargs):
-        self.visit(node.block)
+        yield node.block
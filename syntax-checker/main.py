@@ -1,23 +1,86 @@
 
 import sys
-import ply.yacc as yacc
+import argparse
+import os
+import time
+import paths  # puts ../shared on sys.path
+from TableCache import build_parser
 from Cparser import Cparser
 from TreePrinter import TreePrinter
 from TypeChecker import TypeChecker
+from Instrumentation import Stats, phase
+
+
+def watch(filename, interval):
+    """Checks filename incrementally every time it is modified, until interrupted."""
+    from Incremental import IncrementalChecker
+
+    checker = IncrementalChecker()
+    modified = None
+    while True:
+        try:
+            stamp = os.stat(filename).st_mtime
+        except OSError:
+            stamp = None
+        if stamp is not None and stamp != modified:
+            modified = stamp
+            with open(filename, "r") as file:
+                text = file.read()
+            for message in checker.update(text):
+                print message
+            print "-- {0} blocks, {1} re-parsed, {2} re-checked".format(
+                len(checker.blocks), checker.reparsed, checker.rechecked)
+            sys.stdout.flush()
+        time.sleep(interval)
+
 
 if __name__ == '__main__':
 
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("filename", nargs="?", default="example.txt")
+    arg_parser.add_argument("--watch", action="store_true",
+                            help="keep running and re-check the file incrementally whenever it changes")
+    arg_parser.add_argument("--interval", type=float, default=0.2,
+                            help="seconds between checks of the file's modification time with --watch")
+    arg_parser.add_argument("--stats", action="store_true",
+                            help="report the time of every phase and counters of the run as JSON on stderr")
+    arg_parser.add_argument("--stream", action="store_true",
+                            help="lex the source as it is read a chunk at a time instead of mapping it into memory")
+    arg_parser.add_argument("--stats-file", metavar="FILE",
+                            help="write the report of --stats to FILE instead of stderr")
+    args = arg_parser.parse_args()
+    stats = Stats() if args.stats or args.stats_file is not None else None
+
+    if args.watch:
+        try:
+            watch(args.filename, args.interval)
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+
     try:
-        filename = sys.argv[1] if len(sys.argv) > 1 else "example.txt"
+        filename = args.filename
         file = open(filename, "r")
     except IOError:
         print("Cannot open {0} file".format(filename))
         sys.exit(0)
 
     Cparser = Cparser()
-    parser = yacc.yacc(module=Cparser)
-    text = file.read()
-
-    ast = parser.parse(text, lexer=Cparser.scanner)
+    parser = build_parser(Cparser)
+    scanner = Cparser.scanner
+    with file:
+        scanner.input_source(file, args.stream)
+        try:
+            if stats is None:
+                ast = parser.parse(lexer=scanner)
+            else:
+                ast = stats.parse(parser, scanner)
+        finally:
+            scanner.close()
     typeChecker = TypeChecker()
-    typeChecker.visit(ast)
+    if stats is not None:
+        stats.count_lookups(typeChecker)
+    with phase(stats, 'check'):
+        typeChecker.visit(ast)
+    if stats is not None:
+        stats.write(args.stats_file)
@@ -0,0 +1,11 @@
+"""Puts ../shared, the modules every front end uses, on sys.path.
+
+Import it before any of them, as the modules of this directory do.
+"""
+import os
+import sys
+
+SHARED = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "shared")
+
+if SHARED not in sys.path:
+    sys.path.append(SHARED)
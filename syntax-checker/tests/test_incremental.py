@@ -0,0 +1,126 @@
+"""Checks of the incremental checker. Run them from the syntax-checker directory:
+
+    python -m unittest discover tests
+
+Every tests/*.in program comes with tests/*.out, what the baseline main.py
+printed for it.
+"""
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+TESTS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(TESTS)
+
+sys.path.insert(0, ROOT)
+
+from Incremental import IncrementalChecker
+
+# text inserted by the random edits
+PIECES = ['x', ' ', '\n', ';', '1', '}', '{', 'int q = 2;\n', 'a', '"', '/*', '*/', 'else', 'print 1;\n', '@']
+
+
+def read(name):
+    with open(os.path.join(TESTS, name), "r") as file:
+        return file.read()
+
+
+def edit(text, generator):
+    """Returns text with a random insertion, deletion or duplication."""
+    choice = generator.random()
+    position = generator.randint(0, len(text))
+    if choice < 0.5:
+        return text[:position] + generator.choice(PIECES) + text[position:]
+    if choice < 0.8:
+        return text[:position] + text[position + generator.randint(1, 5):]
+    return text[:position] + text[position:position + 3] + text[position:]
+
+
+def is_syntax_message(message):
+    return message.startswith(("Syntax error", "Illegal character"))
+
+
+class IncrementalTest(unittest.TestCase):
+
+    def test_first_check_prints_what_the_baseline_did(self):
+        for name in ("example", "types"):
+            messages = IncrementalChecker().update(read(name + ".in"))
+            self.assertEqual(messages, read(name + ".out").splitlines(), name)
+
+    def test_syntax_errors_are_reported_as_by_the_baseline(self):
+        # blocks after a syntax error are still checked, where main.py stops at the first one
+        messages = IncrementalChecker().update(read("syntax.in"))
+        expected = [line for line in read("syntax.out").splitlines() if is_syntax_message(line)]
+        self.assertEqual([message for message in messages if is_syntax_message(message)], expected)
+
+    def test_edits_match_a_fresh_check(self):
+        generator = random.Random(16)
+        for name in ("example", "types", "syntax"):
+            text = read(name + ".in")
+            checker = IncrementalChecker()
+            checker.update(text)
+            for step in range(60):
+                text = edit(text, generator)
+                fresh = IncrementalChecker()
+                self.assertEqual(checker.update(text), fresh.update(text), (name, step))
+                self.assertEqual([(token.type, token.value, token.lineno, token.lexpos) for token in checker.tokens],
+                                 [(token.type, token.value, token.lineno, token.lexpos) for token in fresh.tokens],
+                                 (name, step))
+
+    def test_an_edit_reparses_its_block_and_the_one_before(self):
+        text = read("types.in")
+        checker = IncrementalChecker()
+        checker.update(text)
+        messages = checker.update(text.replace("print h(1.5);", "print h(2.5);"))
+        self.assertEqual(messages, read("types.out").splitlines())
+        # where the block before ends depends on the token after it
+        self.assertEqual((checker.reparsed, checker.rechecked), (2, 2))
+
+
+class WatchTest(unittest.TestCase):
+    """main.py --watch reports every version of the file it watches."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "watched.in")
+        shutil.copy(os.path.join(TESTS, "types.in"), self.path)
+        self.process = subprocess.Popen([sys.executable, "main.py", "--watch", "--interval", "0.02", self.path],
+                                        cwd=ROOT, stdout=subprocess.PIPE)
+
+    def tearDown(self):
+        self.process.terminate()
+        self.process.wait()
+        shutil.rmtree(self.directory)
+
+    def report(self):
+        """Returns the messages and the summary line of the next check."""
+        messages = []
+        line = self.process.stdout.readline()
+        while line and not line.startswith("-- "):
+            messages.append(line.rstrip("\n"))
+            line = self.process.stdout.readline()
+        return messages, line.rstrip("\n")
+
+    def test_watch(self):
+        messages, summary = self.report()
+        self.assertEqual(messages, read("types.out").splitlines())
+        self.assertEqual(summary, "-- 9 blocks, 9 re-parsed, 9 re-checked")
+
+        with open(self.path, "a") as file:
+            file.write("print zz;\n")
+        # a modification time the first version cannot have
+        stamp = os.stat(self.path).st_mtime + 10
+        os.utime(self.path, (stamp, stamp))
+
+        messages, summary = self.report()
+        self.assertEqual(messages, read("types.out").splitlines() +
+                         ["Error: Usage of undeclared variable 'zz': line 10"])
+        self.assertEqual(summary, "-- 10 blocks, 2 re-parsed, 2 re-checked")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from test_incremental import ROOT, TESTS, read
+
+
+def run_main(*arguments):
+    process = subprocess.Popen([sys.executable, "main.py"] + list(arguments), cwd=ROOT,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stdout = process.communicate()[0]
+    return stdout
+
+
+class MainTest(unittest.TestCase):
+    """main.py prints the baseline's diagnostics, from the mapped file or from chunks of it."""
+
+    def test_programs(self):
+        for name in ("example", "types", "syntax"):
+            for options in ((), ("--stream",)):
+                stdout = run_main(os.path.join(TESTS, name + ".in"), *options)
+                self.assertEqual(stdout, read(name + ".out"), (name,) + options)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 
 class Node(object):
+    __slots__ = ('children',)
 
     def accept(self, visitor):
         return visitor.visit(self)
@@ -12,6 +13,8 @@ class Node(object):
 
 
 class NodeList(Node):
+    __slots__ = ()
+
     def __init__(self):
         self.children = []
 
@@ -20,47 +23,57 @@ class NodeList(Node):
 
 
 class Const(Node):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
 
 class Integer(Const):
-    pass
+    __slots__ = ()
 
 
 class Float(Const):
-    pass
+    __slots__ = ()
 
 
 class String(Const):
-    pass
+    __slots__ = ()
 
 
 class Variable(Node):
-    pass
+    __slots__ = ()
 
 
 class BinExpr(Node):
+    __slots__ = ('left', 'op', 'right')
+
     def __init__(self, left, op, right):
         self.left = left
         self.op = op
         self.right = right
 
-        # if you want to use somewhere generic_visit method instead of visit_XXX in visitor
-        # definition of children field is required in each class from AST
-        self.children = (left, right)
+    # if you want to use somewhere generic_visit method instead of visit_XXX in visitor
+    # definition of children field is required in each class from AST
+    @property
+    def children(self):
+        return self.left, self.right
 
 
 class ExpressionList(NodeList):
-    pass
+    __slots__ = ()
 
 
 class GroupedExpression(Node):
+    __slots__ = ('interior',)
+
     def __init__(self, interior):
         self.interior = interior
 
 
 class FunctionExpression(Node):
+    __slots__ = ('retType', 'name', 'args', 'body')
+
     def __init__(self, retType, name, args, body):
         self.retType = retType
         self.name = name
@@ -69,6 +82,8 @@ class FunctionExpression(Node):
 
 
 class DeclarationList(Node):
+    __slots__ = ('declarations',)
+
     def __init__(self):
         self.declarations = []
 
@@ -77,65 +92,83 @@ class DeclarationList(Node):
 
 
 class Declaration(Node):
+    __slots__ = ('type', 'inits')
+
     def __init__(self, type, inits):
         self.type = type
         self.inits = inits
 
 
 class InvocationExpression(Node):
+    __slots__ = ('name', 'args')
+
     def __init__(self, name, args):
         self.name = name
         self.args = args
 
 
 class Argument(Node):
+    __slots__ = ('type', 'name')
+
     def __init__(self, type, name):
         self.type = type
         self.name = name
 
 
 class ArgumentList(NodeList):
-    pass
+    __slots__ = ()
 
 
 class InitList(NodeList):
-    pass
+    __slots__ = ()
 
 
 class Init(Node):
+    __slots__ = ('name', 'expr')
+
     def __init__(self, name, expr):
         self.name = name
         self.expr = expr
 
 
 class InstructionList(NodeList):
-    pass
+    __slots__ = ()
 
 
 class PrintInstruction(Node):
+    __slots__ = ('expr',)
+
     def __init__(self, expr):
         self.expr = expr
 
 
 class LabeledInstruction(Node):
+    __slots__ = ('id', 'instr')
+
     def __init__(self, id, instr):
         self.id = id
         self.instr = instr
 
 
 class AssignmentInstruction(Node):
+    __slots__ = ('id', 'expr')
+
     def __init__(self, id, expr):
         self.id = id
         self.expr = expr
 
 
 class CompoundInstruction(Node):
+    __slots__ = ('declarations', 'instructions')
+
     def __init__(self, declarations, instructions):
         self.declarations = declarations
         self.instructions = instructions
 
 
 class ChoiceInstruction(Node):
+    __slots__ = ('condition', 'action', 'alternateAction')
+
     def __init__(self, condition, action, alternateAction=None):
         self.condition = condition
         self.action = action
@@ -143,40 +176,50 @@ class ChoiceInstruction(Node):
 
 
 class RepeatInstruction(Node):
+    __slots__ = ('instructions', 'condition')
+
     def __init__(self, instructions, condition):
         self.instructions = instructions
         self.condition = condition
 
 
 class WhileInstruction(Node):
+    __slots__ = ('condition', 'instruction')
+
     def __init__(self, condition, instruction):
         self.condition = condition
         self.instruction = instruction
 
 
 class ReturnInstruction(Node):
+    __slots__ = ('expression',)
+
     def __init__(self, expression):
         self.expression = expression
 
 
 class BreakInstruction(Node):
-    pass
+    __slots__ = ()
 
 
 class ContinueInstruction(Node):
-    pass
+    __slots__ = ()
 
 
 class Program(Node):
+    __slots__ = ('program_blocks',)
+
     def __init__(self, program_blocks):
         self.program_blocks = program_blocks
 
 
 class ProgramBlockList(NodeList):
-    pass
+    __slots__ = ()
 
 
 class ProgramBlock(Node):
+    __slots__ = ('block',)
+
     def __init__(self, block):
         self.block = block
 
@@ -1,5 +1,6 @@
 #!/usr/bin/python
 
+import paths  # puts ../shared on sys.path
 from scanner import Scanner
 import AST
 
@@ -1,18 +1,40 @@
 
 import sys
-import ply.yacc as yacc
+import argparse
+import paths  # puts ../shared on sys.path
+from TableCache import build_parser
 from Cparser import Cparser
 from TreePrinter import TreePrinter
+from Instrumentation import Stats
 
 if __name__ == '__main__':
 
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("filename", nargs="?", default="example.txt")
+    arg_parser.add_argument("--stats", action="store_true",
+                            help="report the time of every phase and counters of the parse as JSON on stderr")
+    arg_parser.add_argument("--stats-file", metavar="FILE",
+                            help="write the report of --stats to FILE instead of stderr")
+    arg_parser.add_argument("--stream", action="store_true",
+                            help="lex the source as it is read a chunk at a time instead of mapping it into memory")
+    args = arg_parser.parse_args()
+
     try:
-        filename = sys.argv[1] if len(sys.argv) > 1 else "example.txt"
+        filename = args.filename
         file = open(filename, "r")
     except IOError:
         print("Cannot open {0} file".format(filename))
         sys.exit(0)
 
     Cparser = Cparser()
-    parser = yacc.yacc(module=Cparser)
-    text = file.read()
+    parser = build_parser(Cparser)
+    scanner = Cparser.scanner
+    with file:
+        scanner.input_source(file, args.stream)
+        try:
+            if args.stats or args.stats_file is not None:
+                stats = Stats()
+                stats.parse(parser, scanner)
+                stats.write(args.stats_file)
+        finally:
+            scanner.close()